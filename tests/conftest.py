@@ -2,15 +2,30 @@ from datetime import date, time
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.test import APIClient, APIRequestFactory
 
 from tickets.authentication import OpenIDAuthentication
 from tickets.core.models import Ticket
+from tickets.pooling import registry
 
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_backends():
+    yield
+    registry.reset()
+
+
 @pytest.fixture
 def api_factory():
     return APIRequestFactory()
@@ -31,7 +31,9 @@ def test_reminder_sent_when_trip_matches(
         minute=0, second=0, microsecond=0
     ).time()
 
-    mock_backend.get_trip.return_value = raw_trip
+    mock_backend.get_trips.return_value = {
+        (paid_ticket.trip_id, paid_ticket.origin, paid_ticket.destination): raw_trip
+    }
 
     service = TripReminderService(email_service=mock_email_service)
     service.backend = mock_backend
@@ -55,7 +57,7 @@ def test_reminder_sent_when_trip_matches(
 def test_reminder_skips_ticket_without_trip_info(user, paid_ticket, mock_email_service):
     # Arrange
     mock_backend = MagicMock()
-    mock_backend.get_trip.return_value = None
+    mock_backend.get_trips.return_value = {}
 
     service = TripReminderService(email_service=mock_email_service)
     service.backend = mock_backend
@@ -76,7 +78,9 @@ def test_reminder_skips_if_hour_does_not_match(
     )
 
     mock_backend = MagicMock()
-    mock_backend.get_trip.return_value = raw_trip
+    mock_backend.get_trips.return_value = {
+        (paid_ticket.trip_id, paid_ticket.origin, paid_ticket.destination): raw_trip
+    }
 
     service = TripReminderService(email_service=mock_email_service)
     service.backend = mock_backend
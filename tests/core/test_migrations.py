@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+BEFORE = [("core", "0014_ticket_can_cancel_ticket_can_confirm")]
+CONSTRAINT = [("core", "0015_ticket_unique_live_seat_per_trip")]
+
+
+@pytest.fixture
+def migrate():
+    def run(targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    yield run
+
+    executor = MigrationExecutor(connection)
+    executor.migrate(executor.loader.graph.leaf_nodes())
+
+
+@pytest.mark.django_db(transaction=True)
+class TestUniqueLiveSeatMigration:
+    def create(self, apps, user_id, **data):
+        Ticket = apps.get_model("core", "Ticket")
+        return Ticket.objects.create(
+            user_id=user_id, trip_id=1, price=10, origin="A", destination="B", **data
+        )
+
+    def test_expires_reservations_booked_over_a_live_seat(self, migrate, user):
+        apps = migrate(BEFORE)
+        lapsed = timezone.now() - timedelta(hours=1)
+        paid = self.create(
+            apps, user.pk, seat_number=1, status="paid", reserved_until=lapsed
+        )
+        rebooked = self.create(apps, user.pk, seat_number=1, status="reserved")
+        first = self.create(apps, user.pk, seat_number=2, status="reserved")
+        second = self.create(apps, user.pk, seat_number=2, status="reserved")
+
+        apps = migrate(CONSTRAINT)
+
+        Ticket = apps.get_model("core", "Ticket")
+        statuses = dict(Ticket.objects.values_list("pk", "status"))
+        assert statuses == {
+            paid.pk: "paid",
+            rebooked.pk: "expired",
+            first.pk: "reserved",
+            second.pk: "expired",
+        }
+
+    def test_refuses_to_pick_between_two_sold_tickets(self, migrate, user):
+        apps = migrate(BEFORE)
+        self.create(apps, user.pk, seat_number=1, status="paid")
+        self.create(apps, user.pk, seat_number=1, status="used")
+
+        with pytest.raises(RuntimeError, match="resolve them before migrating"):
+            migrate(CONSTRAINT)
+
+        apps.get_model("core", "Ticket").objects.all().delete()
@@ -0,0 +1,150 @@
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from django.db import transaction
+from django.utils import timezone
+
+from tickets.core.exceptions import SeatAlreadyTakenError
+from tickets.core.models import PaymentOutbox, Ticket
+from tickets.core.services.payment_service import PaymentDispatchService
+from tickets.core.tasks import dispatch_payments
+from tickets.depot.exceptions import DepotServiceError
+from tickets.treasury.exceptions import TreasuryServiceError
+
+
+@pytest.fixture
+def reservation(user, trip):
+    return Ticket.objects.create_ticket(
+        trip_id=trip["id"],
+        seat_number=3,
+        user=user,
+        price=trip["price"],
+        origin=trip["origin"],
+        destination=trip["destination"],
+    )
+
+
+@pytest.fixture
+def treasury():
+    backend = MagicMock()
+    backend.pay_ticket.return_value = {"invoice_id": "INV-1"}
+    return backend
+
+
+@pytest.fixture
+def depot(raw_trip):
+    backend = MagicMock()
+    backend.get_trips.side_effect = lambda keys: {key: raw_trip for key in keys}
+    return backend
+
+
+@pytest.fixture
+def service(treasury, depot):
+    return PaymentDispatchService(backend=treasury, depot=depot, max_workers=2)
+
+
+@pytest.mark.django_db
+class TestOutboxWrites:
+    def test_reservation_enqueues_payment(self, reservation):
+        entry = PaymentOutbox.objects.get(ticket=reservation)
+
+        assert entry.status == PaymentOutbox.Status.PENDING
+        assert entry.idempotency_key == f"ticket-{reservation.pk}"
+        assert reservation.can_cancel and reservation.can_confirm
+
+    def test_bulk_reservation_enqueues_each_ticket(self, user):
+        tickets = Ticket.objects.create_tickets(1, [1, 2, 3], user=user)
+
+        assert PaymentOutbox.objects.filter(ticket__in=tickets).count() == 3
+
+    def test_lost_seat_writes_no_outbox_row(self, reservation, user):
+        with transaction.atomic(), pytest.raises(SeatAlreadyTakenError):
+            Ticket.objects.create_ticket(
+                trip_id=reservation.trip_id,
+                seat_number=reservation.seat_number,
+                user=user,
+            )
+
+        assert PaymentOutbox.objects.count() == 1
+
+
+@pytest.mark.django_db
+class TestPaymentDispatchService:
+    def test_sends_with_idempotency_key(self, service, treasury, reservation, user):
+        counts = service.dispatch(10)
+
+        assert counts["sent"] == 1
+        user_data, ticket_data, trip_data = treasury.pay_ticket.call_args.args
+        assert treasury.pay_ticket.call_args.kwargs == {
+            "idempotency_key": f"ticket-{reservation.pk}"
+        }
+        assert user_data["email"] == user.email
+        assert ticket_data["seat_number"] == reservation.seat_number
+        assert trip_data["route_name"]
+
+        entry = PaymentOutbox.objects.get(ticket=reservation)
+        assert entry.status == PaymentOutbox.Status.SENT
+        assert entry.invoice_id == "INV-1"
+        assert entry.sent_at is not None
+
+    def test_skips_tickets_no_longer_reserved(self, service, treasury, reservation):
+        Ticket.objects.filter(pk=reservation.pk).update(status=Ticket.Status.CANCELLED)
+
+        assert service.dispatch(10)["skipped"] == 1
+        treasury.pay_ticket.assert_not_called()
+
+    def test_failure_backs_off(self, service, treasury, reservation):
+        treasury.pay_ticket.side_effect = TreasuryServiceError("POST", "api", None)
+
+        assert service.dispatch(10)["pending"] == 1
+
+        entry = PaymentOutbox.objects.get(ticket=reservation)
+        assert entry.attempts == 1
+        assert entry.next_attempt_at > timezone.now()
+        assert entry.last_error
+        assert service.dispatch(10) == dict.fromkeys(PaymentOutbox.Status.values, 0)
+
+    def test_gives_up_after_max_attempts(
+        self, service, treasury, reservation, settings
+    ):
+        settings.PAYMENT_OUTBOX_MAX_ATTEMPTS = 2
+        treasury.pay_ticket.side_effect = TreasuryServiceError("POST", "api", None)
+        PaymentOutbox.objects.update(attempts=1)
+
+        assert service.dispatch(10)["failed"] == 1
+
+    def test_depot_failure_retries_the_batch(
+        self, service, depot, treasury, reservation
+    ):
+        depot.get_trips.side_effect = DepotServiceError("GET", "trips", None)
+
+        service.dispatch(10)
+
+        treasury.pay_ticket.assert_not_called()
+        assert PaymentOutbox.objects.get(ticket=reservation).attempts == 1
+
+    def test_claimed_rows_are_leased(self, service, reservation):
+        assert len(service.claim(10)) == 1
+        assert service.claim(10) == []
+
+        PaymentOutbox.objects.update(next_attempt_at=timezone.now() - timedelta(1))
+        assert len(service.claim(10)) == 1
+
+
+@pytest.mark.django_db
+def test_dispatch_payments_task(mocker, treasury, depot, user):
+    mocker.patch(
+        "tickets.core.services.payment_service.get_treasury_backend",
+        return_value=treasury,
+    )
+    mocker.patch(
+        "tickets.core.services.payment_service.get_depot_backend", return_value=depot
+    )
+    Ticket.objects.create_tickets(1, [1, 2, 3], user=user, origin="A", destination="B")
+
+    totals = dispatch_payments(batch_size=2)
+
+    assert totals["sent"] == 3
+    assert treasury.pay_ticket.call_count == 3
+    assert not PaymentOutbox.objects.due().exists()
@@ -0,0 +1,130 @@
+import random
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tickets.core.models import Ticket
+
+User = get_user_model()
+
+TRIPS = 600
+SEATS = 50
+STATUS_WEIGHTS = {
+    Ticket.Status.USED: 50,
+    Ticket.Status.EXPIRED: 25,
+    Ticket.Status.CANCELLED: 15,
+    Ticket.Status.PAID: 7,
+    Ticket.Status.RESERVED: 3,
+}
+
+
+@pytest.fixture(scope="class")
+def seeded(django_db_setup, django_db_blocker):
+    """Committed, analyzed ticket history shaped like production traffic."""
+    rng = random.Random(4)
+    now = timezone.now()
+
+    with django_db_blocker.unblock():
+        users = User.objects.bulk_create(
+            [User(username=f"plan-user-{index}") for index in range(300)]
+        )
+        statuses = rng.choices(
+            list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values()), k=TRIPS * SEATS
+        )
+        Ticket.objects.bulk_create(
+            [
+                Ticket(
+                    trip_id=trip_id,
+                    seat_number=seat,
+                    status=statuses[(trip_id - 1) * SEATS + seat - 1],
+                    user=rng.choice(users),
+                    reserved_until=now + timedelta(minutes=rng.randint(-30, 15)),
+                )
+                for trip_id in range(1, TRIPS + 1)
+                for seat in range(1, SEATS + 1)
+            ],
+            batch_size=5000,
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE core_ticket "
+                "SET created_at = now() - random() * interval '365 days'"
+            )
+            cursor.execute("ANALYZE core_ticket")
+
+        yield {"user": users[0], "trip_id": TRIPS // 2, "now": now}
+
+        Ticket.objects.filter(user__in=users).delete()
+        User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+
+def explain(run) -> list[str]:
+    with CaptureQueriesContext(connection) as context:
+        run()
+
+    plans = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            cursor.execute(f"EXPLAIN {query['sql']}")
+            plans.append("\n".join(row[0] for row in cursor.fetchall()))
+
+    return plans
+
+
+HOT_QUERIES = {
+    "taken_seats": lambda ctx: Ticket.objects.taken_seats(ctx["trip_id"]),
+    "seat_holds": lambda ctx: Ticket.objects.seat_holds(ctx["trip_id"]),
+    "is_seat_taken": lambda ctx: Ticket.objects.get_queryset().is_seat_taken(
+        ctx["trip_id"], 7
+    ),
+    "of_trip": lambda ctx: list(Ticket.objects.of_trip(ctx["trip_id"])),
+    "active_for_trip": lambda ctx: list(
+        Ticket.objects.active_for_trip(ctx["trip_id"])
+    ),
+    "group_by_status": lambda ctx: [
+        list(queryset)
+        for queryset in Ticket.objects.of_trip(ctx["trip_id"]).group_by_status()
+    ],
+    "currently_active": lambda ctx: list(Ticket.objects.currently_active()[:50]),
+    "paid": lambda ctx: list(Ticket.objects.paid()[:50]),
+    "stale_reservations": lambda ctx: list(
+        Ticket.objects.get_queryset().stale_reservations(ctx["now"])[:500]
+    ),
+    "within_date_range": lambda ctx: list(
+        Ticket.objects.get_queryset().within_date_range(
+            ctx["now"] - timedelta(days=1), ctx["now"]
+        )
+    ),
+    "sales_count": lambda ctx: Ticket.objects.sales_count(
+        ctx["now"] - timedelta(days=7), ctx["now"]
+    ),
+    "user_listing": lambda ctx: list(
+        Ticket.objects.filter(user=ctx["user"])[:10]
+    ),
+    "user_keyset_page": lambda ctx: list(
+        Ticket.objects.filter(user=ctx["user"])
+        .older_than(ctx["now"] - timedelta(days=30), 10_000)
+        .newest_first()[:11]
+    ),
+    "keyset_page": lambda ctx: list(
+        Ticket.objects.get_queryset()
+        .older_than(ctx["now"] - timedelta(days=30), 10_000)
+        .newest_first()[:11]
+    ),
+}
+
+
+@pytest.mark.django_db
+class TestTicketQueryPlans:
+    @pytest.mark.parametrize("name", HOT_QUERIES)
+    def test_no_sequential_scan(self, seeded, name):
+        plans = explain(lambda: HOT_QUERIES[name](seeded))
+
+        assert plans, f"{name} ran no queries"
+        for plan in plans:
+            assert "Seq Scan on core_ticket" not in plan, f"{name}:\n{plan}"
@@ -0,0 +1,84 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pytest
+from django.db import IntegrityError, connection
+from django.utils import timezone
+
+from tickets.core.exceptions import SeatAlreadyTakenError
+from tickets.core.models import Ticket
+
+
+@pytest.mark.django_db
+class TestCreateTicket:
+    def test_conflict_raises_seat_already_taken(self, reserved_ticket, user):
+        with pytest.raises(SeatAlreadyTakenError):
+            Ticket.objects.create_ticket(
+                trip_id=reserved_ticket.trip_id,
+                seat_number=reserved_ticket.seat_number,
+                user=user,
+            )
+
+    def test_paid_seat_is_not_reusable(self, paid_ticket, user):
+        with pytest.raises(SeatAlreadyTakenError):
+            Ticket.objects.create_ticket(
+                trip_id=paid_ticket.trip_id,
+                seat_number=paid_ticket.seat_number,
+                user=user,
+            )
+
+    def test_cancelled_seat_can_be_reserved_again(self, ticket_factory, user):
+        cancelled = ticket_factory(seat_number=3, status=Ticket.Status.CANCELLED)
+
+        ticket = Ticket.objects.create_ticket(
+            trip_id=cancelled.trip_id, seat_number=3, user=user
+        )
+
+        assert ticket.status == Ticket.Status.RESERVED
+
+    def test_stale_reservation_is_expired_and_seat_reused(self, expired_ticket, user):
+        ticket = Ticket.objects.create_ticket(
+            trip_id=expired_ticket.trip_id,
+            seat_number=expired_ticket.seat_number,
+            user=user,
+        )
+
+        expired_ticket.refresh_from_db()
+        assert expired_ticket.status == Ticket.Status.EXPIRED
+        assert ticket.status == Ticket.Status.RESERVED
+
+    def test_database_rejects_second_live_ticket(self, reserved_ticket):
+        with pytest.raises(IntegrityError):
+            Ticket.objects.create(
+                trip_id=reserved_ticket.trip_id,
+                seat_number=reserved_ticket.seat_number,
+                reserved_until=timezone.now() + timedelta(minutes=5),
+            )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentReservation:
+    def test_reservation_is_a_single_statement(self, user, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            Ticket.objects.create_ticket(trip_id=1, seat_number=1, user=user)
+
+    def test_only_one_thread_gets_the_seat(self, user):
+        workers = 16
+        barrier = threading.Barrier(workers)
+
+        def reserve(_):
+            barrier.wait()
+            try:
+                Ticket.objects.create_ticket(trip_id=42, seat_number=7, user=user)
+                return True
+            except SeatAlreadyTakenError:
+                return False
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(reserve, range(workers)))
+
+        assert results.count(True) == 1
+        assert Ticket.objects.filter(trip_id=42, seat_number=7).count() == 1
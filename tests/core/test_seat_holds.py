@@ -0,0 +1,332 @@
+import json
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+import redis
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from tickets.core import seat_holds
+from tickets.core.exceptions import SeatAlreadyTakenError, SeatsAlreadyTakenError
+from tickets.core.models import Ticket
+from tickets.core.seat_map import get_seat_map
+from tickets.core.tasks import persist_seat_holds
+
+
+@pytest.fixture
+def redis_client(mocker, settings):
+    settings.SEAT_HOLD_REDIS_URL = "redis://holds:6379/1"
+    client = MagicMock()
+    pending = []
+
+    client.lrange.side_effect = lambda key, start, end: pending[start : end + 1]
+    client.lrem.side_effect = lambda key, count, value: pending.remove(value)
+    client.pipeline.return_value.__enter__.return_value = client
+    client.lock.return_value.acquire.return_value = True
+    mocker.patch("tickets.core.seat_holds.get_client", return_value=client)
+    claim = mocker.patch("tickets.core.seat_holds._claim_script").return_value
+    claim_many = mocker.patch("tickets.core.seat_holds._claim_many_script").return_value
+    release = mocker.patch("tickets.core.seat_holds._release_script").return_value
+    claimed, markers = {}, set()
+
+    def run_claim(keys, args):
+        if keys[0] in claimed:
+            return 0
+        claimed[keys[0]] = args[0]
+        markers.add(keys[2])
+        pending.append(args[2])
+        return 1
+
+    def run_claim_many(keys, args):
+        seats = list(
+            zip(keys[:-1:2], keys[1:-1:2], args[1::2], args[2::2], strict=False)
+        )
+        taken = [i for i, seat in enumerate(seats, start=1) if seat[0] in claimed]
+        if not taken:
+            for claim_key, marker, hold_id, record in seats:
+                claimed[claim_key] = hold_id
+                markers.add(marker)
+                pending.append(record)
+        return taken
+
+    def run_release(keys, args):
+        for claim_key, marker, hold_id in zip(
+            keys[::2], keys[1::2], args, strict=False
+        ):
+            if claimed.get(claim_key) == hold_id:
+                del claimed[claim_key]
+            markers.discard(marker)
+
+    client.exists.side_effect = lambda key: int(key in markers)
+    client.claimed = claimed
+    client.pending = pending
+    claim.side_effect = run_claim
+    claim_many.side_effect = run_claim_many
+    release.side_effect = run_release
+    return client
+
+
+def hold_data(user, trip, seat_number=1):
+    return {
+        "trip_id": trip["id"],
+        "seat_number": seat_number,
+        "user": user,
+        "price": trip["price"],
+        "origin": trip["origin"],
+        "destination": trip["destination"],
+        "reserved_until": timezone.now() + timedelta(minutes=15),
+    }
+
+
+@pytest.mark.django_db
+class TestClaimSeat:
+    def test_claim_queues_hold_and_marks_seat(self, redis_client, user, trip):
+        Ticket.objects.seat_map(trip["id"], 20)
+
+        hold = seat_holds.claim_seat(**hold_data(user, trip))
+
+        assert json.loads(redis_client.pending[0])["hold_id"] == hold["hold_id"]
+        assert get_seat_map(trip["id"]).is_taken(1)
+        assert not Ticket.objects.exists()
+
+    def test_second_claim_loses(self, redis_client, user, trip):
+        seat_holds.claim_seat(**hold_data(user, trip))
+
+        with pytest.raises(SeatAlreadyTakenError):
+            seat_holds.claim_seat(**hold_data(user, trip))
+
+        assert len(redis_client.pending) == 1
+
+    def test_seat_held_in_database_is_not_claimed(
+        self, redis_client, reserved_ticket, user, trip
+    ):
+        with pytest.raises(SeatAlreadyTakenError):
+            seat_holds.claim_seat(
+                **hold_data(user, trip, seat_number=reserved_ticket.seat_number)
+            )
+
+        assert redis_client.pending == []
+
+
+@pytest.mark.django_db
+class TestClaimSeats:
+    def test_claims_every_seat_at_once(self, redis_client, user, trip):
+        data = hold_data(user, trip)
+        del data["seat_number"]
+
+        holds = seat_holds.claim_seats(seat_numbers=[1, 2], **data)
+
+        assert [hold["seat_number"] for hold in holds] == [1, 2]
+        assert len(redis_client.pending) == 2
+        assert all(seat_holds.is_pending(hold["hold_id"]) for hold in holds)
+
+    def test_one_held_seat_fails_the_whole_claim(self, redis_client, user, trip):
+        seat_holds.claim_seat(**hold_data(user, trip, seat_number=2))
+        data = hold_data(user, trip)
+        del data["seat_number"]
+
+        with pytest.raises(SeatsAlreadyTakenError) as error:
+            seat_holds.claim_seats(seat_numbers=[1, 2, 3], **data)
+
+        assert error.value.seats == [2]
+        assert len(redis_client.pending) == 1
+
+
+@pytest.mark.django_db
+class TestReleaseClaims:
+    def test_cancel_frees_the_claim(
+        self, redis_client, django_capture_on_commit_callbacks, user, trip
+    ):
+        hold = seat_holds.claim_seat(**hold_data(user, trip))
+        persist_seat_holds()
+        ticket = Ticket.objects.get(hold_id=hold["hold_id"])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ticket.cancel()
+
+        assert redis_client.claimed == {}
+        seat_holds.claim_seat(**hold_data(user, trip))
+
+    def test_expiry_frees_the_claim(
+        self, redis_client, django_capture_on_commit_callbacks, user, trip
+    ):
+        seat_holds.claim_seat(**hold_data(user, trip))
+        persist_seat_holds()
+        Ticket.objects.update(reserved_until=timezone.now() - timedelta(minutes=1))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Ticket.objects.expire_reservations(batch_size=10, max_batches=1)
+
+        assert redis_client.claimed == {}
+
+    def test_newer_claim_on_the_seat_is_kept(self, redis_client, user, trip):
+        old = seat_holds.claim_seat(**hold_data(user, trip))
+        redis_client.claimed.clear()
+        new = seat_holds.claim_seat(**hold_data(user, trip))
+
+        seat_holds.release_claims([(trip["id"], 1, old["hold_id"])])
+
+        assert list(redis_client.claimed.values()) == [new["hold_id"]]
+
+    def test_lost_hold_frees_its_claim(self, redis_client, ticket_factory, user, trip):
+        hold = seat_holds.claim_seat(**hold_data(user, trip))
+        ticket_factory(seat_number=1, status=Ticket.Status.PAID)
+
+        persist_seat_holds()
+
+        assert redis_client.claimed == {}
+        assert not seat_holds.is_pending(hold["hold_id"])
+
+
+@pytest.mark.django_db
+class TestPersistSeatHolds:
+    def test_disabled_without_redis_url(self, settings):
+        settings.SEAT_HOLD_REDIS_URL = None
+
+        assert persist_seat_holds() == 0
+
+    def test_writes_holds_in_batches(self, redis_client, user, trip):
+        for seat in range(1, 6):
+            seat_holds.claim_seat(**hold_data(user, trip, seat_number=seat))
+
+        assert persist_seat_holds(batch_size=2) == 5
+
+        assert redis_client.pending == []
+        assert sorted(
+            Ticket.objects.filter(status=Ticket.Status.RESERVED).values_list(
+                "seat_number", flat=True
+            )
+        ) == [1, 2, 3, 4, 5]
+
+    def test_conflicting_hold_is_dropped(
+        self, redis_client, ticket_factory, user, trip
+    ):
+        seat_holds.claim_seat(**hold_data(user, trip, seat_number=1))
+        seat_holds.claim_seat(**hold_data(user, trip, seat_number=2))
+        ticket_factory(seat_number=2, status=Ticket.Status.PAID)
+
+        assert persist_seat_holds() == 1
+
+        assert redis_client.pending == []
+        assert Ticket.objects.filter(seat_number=1).exists()
+
+    def test_only_one_run_drains_the_list(self, redis_client, user, trip):
+        seat_holds.claim_seat(**hold_data(user, trip))
+        redis_client.lock.return_value.acquire.return_value = False
+
+        assert persist_seat_holds() == 0
+
+        assert len(redis_client.pending) == 1
+        assert not Ticket.objects.exists()
+
+    def test_holds_queued_during_a_run_are_kept(self, mocker, redis_client, user, trip):
+        seat_holds.claim_seat(**hold_data(user, trip, seat_number=1))
+        persist_holds = Ticket.objects.persist_holds
+
+        def claim_meanwhile(holds):
+            seat_holds.claim_seat(**hold_data(user, trip, seat_number=2))
+            return persist_holds(holds)
+
+        mocker.patch.object(Ticket.objects, "persist_holds", claim_meanwhile)
+
+        assert persist_seat_holds(max_batches=1) == 1
+
+        assert [json.loads(raw)["seat_number"] for raw in redis_client.pending] == [2]
+        redis_client.lock.return_value.release.assert_called_once()
+
+
+@pytest.mark.django_db
+class TestHoldEndpoint:
+    def test_create_returns_hold(self, mocker, redis_client, auth_client, raw_trip):
+        backend = MagicMock()
+        backend.get_trip.return_value = raw_trip
+        mocker.patch("tickets.core.views.get_depot_backend", return_value=backend)
+        url = reverse("tickets-core:ticket-list")
+        payload = {
+            "trip_id": raw_trip["id"],
+            "seat_number": 3,
+            "origin": "Chisinau",
+            "destination": "Balti",
+        }
+
+        response = auth_client.post(url, data=payload)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data["seat_number"] == 3
+        assert response.data["hold_id"]
+        assert not Ticket.objects.exists()
+
+        conflict = auth_client.post(url, data=payload)
+        assert conflict.status_code == status.HTTP_409_CONFLICT
+
+    def test_bulk_claims_seats(self, mocker, redis_client, auth_client, raw_trip):
+        backend = MagicMock()
+        backend.get_trip.return_value = raw_trip
+        mocker.patch("tickets.core.views.get_depot_backend", return_value=backend)
+        url = reverse("tickets-core:ticket-bulk")
+        payload = {
+            "trip_id": raw_trip["id"],
+            "seats": [3, 4],
+            "origin": "Chisinau",
+            "destination": "Balti",
+        }
+
+        response = auth_client.post(url, data=payload, format="json")
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert [hold["seat_number"] for hold in response.data["holds"]] == [3, 4]
+        assert not Ticket.objects.exists()
+
+        conflict = auth_client.post(url, data=payload, format="json")
+        assert conflict.status_code == status.HTTP_409_CONFLICT
+        assert [c["seat_number"] for c in conflict.data["conflicts"]] == [3, 4]
+
+    def test_redis_outage_falls_back_to_a_direct_reservation(
+        self, mocker, redis_client, auth_client, raw_trip
+    ):
+        backend = MagicMock()
+        backend.get_trip.return_value = raw_trip
+        mocker.patch("tickets.core.views.get_depot_backend", return_value=backend)
+        seat_holds._claim_script.return_value.side_effect = redis.ConnectionError()
+        seat_holds._claim_many_script.return_value.side_effect = redis.TimeoutError()
+        route = {
+            "trip_id": raw_trip["id"],
+            "origin": "Chisinau",
+            "destination": "Balti",
+        }
+
+        single = auth_client.post(
+            reverse("tickets-core:ticket-list"), data={**route, "seat_number": 3}
+        )
+        bulk = auth_client.post(
+            reverse("tickets-core:ticket-bulk"),
+            data={**route, "seats": [4, 5]},
+            format="json",
+        )
+
+        assert single.status_code == status.HTTP_201_CREATED
+        assert bulk.status_code == status.HTTP_201_CREATED
+        assert sorted(Ticket.objects.values_list("seat_number", flat=True)) == [3, 4, 5]
+        assert redis_client.pending == []
+
+    def test_hold_resolves_to_its_ticket(self, redis_client, auth_client, user, trip):
+        hold = seat_holds.claim_seat(**hold_data(user, trip))
+        url = reverse("tickets-core:ticket-hold-status", args=[hold["hold_id"]])
+
+        pending = auth_client.get(url)
+        assert pending.status_code == status.HTTP_202_ACCEPTED
+        assert pending.data == {"hold_id": hold["hold_id"], "status": "pending"}
+
+        persist_seat_holds()
+
+        written = auth_client.get(url)
+        assert written.status_code == status.HTTP_200_OK
+        assert written.data["id"] == Ticket.objects.get().pk
+        assert written.data["seat_number"] == 1
+
+    def test_unknown_hold_is_not_found(self, redis_client, auth_client):
+        url = reverse("tickets-core:ticket-hold-status", args=["abc123"])
+
+        assert auth_client.get(url).status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,192 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from tickets.core import seat_map as seat_map_module
+from tickets.core.models import Ticket
+from tickets.core.seat_map import (
+    SeatMap,
+    _store,
+    current_version,
+    get_seat_map,
+    invalidate_seat_map,
+    mark_seat_released,
+    mark_seat_taken,
+    seat_changes,
+)
+from tickets.depot.utils import generate_seat_status
+
+
+class TestSeatMap:
+    def test_take_and_release(self):
+        seat_map = SeatMap(trip_id=1, capacity=20)
+
+        assert seat_map.take(3) is True
+        assert seat_map.take(3) is False
+        assert seat_map.is_taken(3)
+        assert seat_map.taken() == [3]
+
+        assert seat_map.release(3) is True
+        assert seat_map.release(3) is False
+        assert not seat_map.is_taken(3)
+
+    def test_one_bit_per_seat(self):
+        seat_map = SeatMap(trip_id=1, capacity=52)
+
+        assert len(seat_map.bits) == 7
+
+    def test_take_grows_capacity(self):
+        seat_map = SeatMap(trip_id=1, capacity=8)
+        seat_map.take(20)
+
+        assert seat_map.capacity == 20
+        assert seat_map.is_taken(20)
+
+    def test_to_status(self):
+        seat_map = SeatMap.build(1, 3, [(2, None)])
+
+        assert seat_map.to_status() == {
+            "1": "available",
+            "2": "reserved",
+            "3": "available",
+        }
+
+    def test_build_tracks_earliest_pending_deadline(self):
+        now = timezone.now()
+        deadline = now + timedelta(minutes=5)
+        seat_map = SeatMap.build(
+            1,
+            10,
+            [(1, now + timedelta(minutes=10)), (2, deadline), (3, None)],
+        )
+
+        assert seat_map.expires_at == deadline
+        assert not seat_map.is_stale()
+
+    def test_cache_round_trip(self):
+        seat_map = SeatMap.build(7, 10, [(4, None)])
+        seat_map.version = 3
+
+        restored = SeatMap.from_cache(7, seat_map.to_cache())
+
+        assert restored.taken() == [4]
+        assert restored.version == 3
+        assert restored.capacity == 10
+
+
+@pytest.mark.django_db
+class TestSeatMapCache:
+    def test_cache_hit_does_not_query(self, reserved_ticket, django_assert_num_queries):
+        generate_seat_status(reserved_ticket.trip_id, 20)
+
+        with django_assert_num_queries(0):
+            status = generate_seat_status(reserved_ticket.trip_id, 20)
+            taken = Ticket.objects.is_seat_taken(
+                reserved_ticket.trip_id, reserved_ticket.seat_number
+            )
+
+        assert status[str(reserved_ticket.seat_number)] == "reserved"
+        assert taken is True
+
+    def test_cancelled_and_expired_tickets_are_free(self, ticket_factory):
+        ticket_factory(seat_number=1, status=Ticket.Status.EXPIRED)
+        ticket_factory(seat_number=2, status=Ticket.Status.CANCELLED)
+        ticket = ticket_factory(seat_number=3, status=Ticket.Status.PAID)
+
+        status = generate_seat_status(ticket.trip_id, 5)
+
+        assert status["1"] == "available"
+        assert status["2"] == "available"
+        assert status["3"] == "reserved"
+
+    def test_create_ticket_updates_cached_map(
+        self, user, trip, django_capture_on_commit_callbacks
+    ):
+        before = Ticket.objects.seat_map(trip["id"], 20)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Ticket.objects.create_ticket(
+                trip_id=trip["id"], seat_number=4, user=user, price=trip["price"]
+            )
+
+        after = get_seat_map(trip["id"])
+        assert after.is_taken(4)
+        assert after.version > before.version
+
+    def test_cancel_releases_seat(
+        self, reserved_ticket, django_capture_on_commit_callbacks
+    ):
+        Ticket.objects.seat_map(reserved_ticket.trip_id, 20)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            reserved_ticket.cancel()
+
+        cached = get_seat_map(reserved_ticket.trip_id)
+        assert not cached.is_taken(reserved_ticket.seat_number)
+
+    def test_stale_map_is_rebuilt(self, reserved_ticket):
+        seat_map = Ticket.objects.seat_map(reserved_ticket.trip_id, 20)
+        Ticket.objects.filter(pk=reserved_ticket.pk).update(
+            status=Ticket.Status.EXPIRED
+        )
+        seat_map.expires_at = timezone.now() - timedelta(seconds=1)
+        _store(seat_map)
+
+        assert get_seat_map(reserved_ticket.trip_id) is None
+        rebuilt = Ticket.objects.seat_map(reserved_ticket.trip_id, 20)
+        assert not rebuilt.is_taken(reserved_ticket.seat_number)
+        assert rebuilt.version > seat_map.version
+
+    def test_invalidate_bumps_version(self, reserved_ticket):
+        first = Ticket.objects.seat_map(reserved_ticket.trip_id, 20)
+        invalidate_seat_map(reserved_ticket.trip_id)
+
+        second = Ticket.objects.seat_map(reserved_ticket.trip_id, 20)
+
+        assert second.version > first.version
+
+    def test_change_log_covers_single_seat_updates(self, reserved_ticket):
+        first = Ticket.objects.seat_map(reserved_ticket.trip_id, 20)
+        mark_seat_taken(reserved_ticket.trip_id, 5)
+        mark_seat_released(reserved_ticket.trip_id, reserved_ticket.seat_number)
+        version = current_version(reserved_ticket.trip_id)
+
+        assert seat_changes(reserved_ticket.trip_id, first.version, version) == {
+            5: True,
+            reserved_ticket.seat_number: False,
+        }
+
+        invalidate_seat_map(reserved_ticket.trip_id)
+        rebuilt = Ticket.objects.seat_map(reserved_ticket.trip_id, 20)
+        assert seat_changes(reserved_ticket.trip_id, version, rebuilt.version) is None
+
+    def test_racing_writes_do_not_lose_a_seat(self, mocker, ticket_factory, trip):
+        Ticket.objects.seat_map(trip["id"], 20)
+        ticket_factory(seat_number=1)
+        ticket_factory(seat_number=2)
+        next_version = seat_map_module._next_version
+
+        def other_writer_first(trip_id):
+            mocker.stopall()
+            mark_seat_taken(trip_id, 2)
+            return next_version(trip_id)
+
+        # Both writers read the same version before either stores.
+        mocker.patch.object(seat_map_module, "_next_version", other_writer_first)
+        mark_seat_taken(trip["id"], 1)
+
+        assert get_seat_map(trip["id"]) is None
+        assert Ticket.objects.seat_map(trip["id"], 20).taken() == [1, 2]
+
+    def test_rebuild_racing_a_write_is_not_cached(self, mocker, ticket_factory, trip):
+        ticket_factory(seat_number=1)
+
+        def write_meanwhile(trip_id):
+            mark_seat_taken(trip_id, 3)
+            return Ticket.objects.seat_holds(trip_id)
+
+        seat_map = seat_map_module.load_seat_map(trip["id"], 20, write_meanwhile)
+
+        assert seat_map.taken() == [1]
+        assert get_seat_map(trip["id"]) is None
@@ -3,6 +3,7 @@ from unittest.mock import MagicMock
 import pytest
 from rest_framework.exceptions import ValidationError
 
+from tickets.core.exceptions import SeatAlreadyTakenError
 from tickets.core.models import Ticket
 from tickets.core.serializers import TicketConfirmationSerializer, TicketSerializer
 
@@ -84,10 +85,10 @@ class TestTicketSerializer:
         }
 
         serializer = TicketSerializer(data=data, context=context)
-        with pytest.raises(ValidationError) as exc:
-            serializer.is_valid(raise_exception=True)
+        assert serializer.is_valid(), serializer.errors
 
-        assert "Seat is already taken." in str(exc.value)
+        with pytest.raises(SeatAlreadyTakenError):
+            serializer.save()
 
     def test_create_ticket_success(self, context, trip):
         data = {
@@ -125,11 +126,10 @@ class TestTicketConfirmationSerializer:
         assert serializer.is_valid(), serializer.errors
         assert serializer.validated_data["ticket_id"] == ticket.id
 
-    def test_ticket_confirmation_invalid_ticket_id(self):
+    def test_ticket_confirmation_does_not_query(self, django_assert_num_queries):
         data = {"ticket_id": 999999, "invoice_id": "some_invoice"}
         serializer = TicketConfirmationSerializer(data=data)
 
-        with pytest.raises(ValidationError) as exc:
-            serializer.is_valid(raise_exception=True)
-
-        assert "Ticket not found." in str(exc.value)
+        # Unknown tickets and reused invoices are caught by the UPDATE itself.
+        with django_assert_num_queries(0):
+            assert serializer.is_valid(), serializer.errors
@@ -0,0 +1,140 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from tickets.core.models import Ticket
+from tickets.core.seat_map import get_seat_map
+from tickets.core.tasks import expire_reservations, queue_refunds, refund_invoices
+from tickets.treasury.exceptions import TreasuryServiceError
+
+
+@pytest.fixture
+def stale_tickets(ticket_factory):
+    reserved_until = timezone.now() - timedelta(minutes=1)
+    return [
+        ticket_factory(seat_number=seat, reserved_until=reserved_until)
+        for seat in range(1, 6)
+    ]
+
+
+@pytest.mark.django_db
+class TestExpireReservations:
+    def test_expires_only_lapsed_reservations(
+        self, expired_ticket, paid_ticket, other_reserved_ticket
+    ):
+        released = expire_reservations()
+
+        assert released == 1
+        expired_ticket.refresh_from_db()
+        paid_ticket.refresh_from_db()
+        other_reserved_ticket.refresh_from_db()
+        assert expired_ticket.status == Ticket.Status.EXPIRED
+        assert paid_ticket.status == Ticket.Status.PAID
+        assert other_reserved_ticket.status == Ticket.Status.RESERVED
+
+    def test_works_in_bounded_batches(self, stale_tickets):
+        released = expire_reservations(batch_size=2, max_batches=2)
+
+        assert released == 4
+        assert Ticket.objects.filter(status=Ticket.Status.RESERVED).count() == 1
+
+        assert expire_reservations(batch_size=2, max_batches=2) == 1
+
+    def test_releases_seats_in_cached_map(
+        self, expired_ticket, django_capture_on_commit_callbacks
+    ):
+        seat_map = Ticket.objects.seat_map(expired_ticket.trip_id, 20)
+        assert seat_map.is_taken(expired_ticket.seat_number)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            expire_reservations()
+
+        cached = get_seat_map(expired_ticket.trip_id)
+        assert not cached.is_taken(expired_ticket.seat_number)
+
+    def test_hot_queries_filter_on_status(self, expired_ticket):
+        expire_reservations()
+
+        assert Ticket.objects.taken_seats(expired_ticket.trip_id) == []
+        assert "CASE" not in str(Ticket.objects.currently_active().query)
+
+
+class TestQueueRefunds:
+    def test_streams_invoices_in_chunks(self, mocker):
+        delay = mocker.patch("tickets.core.tasks.refund_invoices.delay")
+
+        queued = queue_refunds([f"INV-{index}" for index in range(5)], chunk_size=2)
+
+        assert queued == 5
+        assert [call.args[0] for call in delay.call_args_list] == [
+            ["INV-0", "INV-1"],
+            ["INV-2", "INV-3"],
+            ["INV-4"],
+        ]
+
+
+@pytest.mark.django_db
+class TestRefundInvoices:
+    def test_records_refund_ids(self, mocker, paid_ticket):
+        backend = mocker.patch("tickets.core.tasks.get_treasury_backend").return_value
+        backend.refund_tickets.return_value = {"INV-EXISTING": {"refund_id": "REF-1"}}
+
+        result = refund_invoices(["INV-EXISTING"])
+
+        assert result == {"INV-EXISTING": "REF-1"}
+        assert list(backend.refund_tickets.call_args.args[0]) == [
+            {"invoice_id": "INV-EXISTING"}
+        ]
+        paid_ticket.refresh_from_db()
+        assert paid_ticket.refund_id == "REF-1"
+
+    def test_writes_refund_ids_in_one_update(
+        self, mocker, ticket_factory, django_assert_num_queries
+    ):
+        for seat in range(1, 4):
+            ticket_factory(
+                seat_number=seat, status=Ticket.Status.PAID, invoice_id=f"INV-{seat}"
+            )
+        backend = mocker.patch("tickets.core.tasks.get_treasury_backend").return_value
+        backend.refund_tickets.return_value = {
+            f"INV-{seat}": {"id": f"REF-{seat}"} for seat in range(1, 4)
+        }
+
+        with django_assert_num_queries(1):
+            refund_invoices(["INV-1", "INV-2", "INV-3"])
+
+        assert dict(
+            Ticket.objects.values_list("invoice_id", "refund_id").order_by("invoice_id")
+        ) == {"INV-1": "REF-1", "INV-2": "REF-2", "INV-3": "REF-3"}
+
+    def test_retries_only_failed_invoices(self, mocker, paid_ticket):
+        backend = mocker.patch("tickets.core.tasks.get_treasury_backend").return_value
+        backend.refund_tickets.return_value = {
+            "INV-EXISTING": {"refund_id": "REF-1"},
+            "INV-LOST": TreasuryServiceError("POST", "api/refund"),
+        }
+        retry = mocker.patch.object(
+            refund_invoices, "retry", side_effect=RuntimeError("retry")
+        )
+
+        with pytest.raises(RuntimeError):
+            refund_invoices(["INV-EXISTING", "INV-LOST"])
+
+        retry.assert_called_once_with(args=[["INV-LOST"]])
+        paid_ticket.refresh_from_db()
+        assert paid_ticket.refund_id == "REF-1"
+
+    def test_result_without_refund_id_is_retried(self, mocker, paid_ticket):
+        backend = mocker.patch("tickets.core.tasks.get_treasury_backend").return_value
+        backend.refund_tickets.return_value = {"INV-EXISTING": {}}
+        retry = mocker.patch.object(
+            refund_invoices, "retry", side_effect=RuntimeError("retry")
+        )
+
+        with pytest.raises(RuntimeError):
+            refund_invoices(["INV-EXISTING"])
+
+        retry.assert_called_once_with(args=[["INV-EXISTING"]])
+        paid_ticket.refresh_from_db()
+        assert paid_ticket.refund_id is None
@@ -0,0 +1,131 @@
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+
+from tickets.core.models import Ticket
+
+
+@pytest.mark.django_db
+class TestTicketTransitions:
+    @pytest.mark.parametrize(
+        ("transition", "source", "target"),
+        [
+            ("cancel", Ticket.Status.RESERVED, Ticket.Status.CANCELLED),
+            ("cancel", Ticket.Status.PAID, Ticket.Status.CANCELLED),
+            ("use", Ticket.Status.PAID, Ticket.Status.USED),
+            ("expire", Ticket.Status.RESERVED, Ticket.Status.EXPIRED),
+        ],
+    )
+    def test_allowed_transition_applies(
+        self, ticket_factory, transition, source, target
+    ):
+        ticket = ticket_factory(status=source)
+
+        rows = getattr(Ticket.objects.filter(pk=ticket.pk), transition)()
+
+        assert [row["id"] for row in rows] == [ticket.pk]
+        assert rows[0]["status"] == target
+        ticket.refresh_from_db()
+        assert ticket.status == target
+
+    @pytest.mark.parametrize(
+        ("transition", "source"),
+        [
+            ("cancel", Ticket.Status.USED),
+            ("cancel", Ticket.Status.EXPIRED),
+            ("use", Ticket.Status.RESERVED),
+            ("expire", Ticket.Status.PAID),
+        ],
+    )
+    def test_refused_transition_leaves_row_alone(
+        self, ticket_factory, transition, source
+    ):
+        ticket = ticket_factory(status=source)
+        updated_at = ticket.updated_at
+
+        assert getattr(Ticket.objects.filter(pk=ticket.pk), transition)() == []
+
+        ticket.refresh_from_db()
+        assert (ticket.status, ticket.updated_at) == (source, updated_at)
+
+    def test_confirm_sets_invoice(self, reserved_ticket):
+        rows = Ticket.objects.filter(pk=reserved_ticket.pk).confirm("INV-1")
+
+        assert rows[0]["invoice_id"] == "INV-1"
+        assert rows[0]["can_confirm"] is False
+
+    def test_transition_is_a_single_update(
+        self, reserved_ticket, django_assert_num_queries
+    ):
+        with django_assert_num_queries(1) as context:
+            Ticket.objects.filter(pk=reserved_ticket.pk).cancel()
+
+        sql = context.captured_queries[0]["sql"]
+        assert sql.startswith("UPDATE")
+        assert '"price"' not in sql
+
+    def test_cancel_does_not_refund(
+        self, reserved_ticket, paid_ticket, django_capture_on_commit_callbacks
+    ):
+        with (
+            patch("tickets.core.tasks.queue_refunds") as queue_refunds,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            Ticket.objects.filter(pk__in=[reserved_ticket.pk, paid_ticket.pk]).cancel()
+
+        queue_refunds.assert_not_called()
+
+    def test_cancel_for_trip_queues_refunds_for_paid_tickets(
+        self, reserved_ticket, paid_ticket, django_capture_on_commit_callbacks
+    ):
+        with (
+            patch("tickets.core.tasks.queue_refunds") as queue_refunds,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            Ticket.objects.cancel_for_trip(paid_ticket.trip_id)
+
+        queue_refunds.assert_called_once_with(["INV-EXISTING"])
+
+    def test_instance_cancel_reports_current_status(self, reserved_ticket):
+        # Someone else moved the row after it was loaded.
+        Ticket.objects.filter(pk=reserved_ticket.pk).update(status=Ticket.Status.USED)
+
+        with pytest.raises(ValidationError, match="status 'used'"):
+            reserved_ticket.cancel()
+
+    def test_instance_confirm_refreshes_generated_fields(self, reserved_ticket):
+        reserved_ticket.confirm("INV-1")
+
+        assert reserved_ticket.status == Ticket.Status.PAID
+        assert reserved_ticket.invoice_id == "INV-1"
+        assert reserved_ticket.can_confirm is False
+        assert reserved_ticket.can_cancel is True
+
+
+@pytest.mark.django_db
+class TestTicketAdminActions:
+    def test_cancel_action_skips_tickets_it_cannot_move(
+        self, admin_client, reserved_ticket, ticket_factory
+    ):
+        used = ticket_factory(seat_number=2, status=Ticket.Status.USED)
+
+        response = admin_client.post(
+            reverse("admin:core_ticket_changelist"),
+            {
+                "action": "cancel_tickets",
+                "_selected_action": [reserved_ticket.pk, used.pk],
+            },
+            follow=True,
+        )
+
+        assert response.status_code == 200
+        messages = [str(message) for message in response.context["messages"]]
+        assert "1 ticket(s) cancelled." in messages
+        assert "1 ticket(s) skipped, their status does not allow it." in messages
+
+        reserved_ticket.refresh_from_db()
+        used.refresh_from_db()
+        assert reserved_ticket.status == Ticket.Status.CANCELLED
+        assert used.status == Ticket.Status.USED
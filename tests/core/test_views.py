@@ -2,7 +2,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 from django.contrib.auth import get_user_model
-from django.urls import reverse
+from django.urls import reverse, reverse_lazy
 from rest_framework import status
 
 from tickets.core.models import Ticket
@@ -38,6 +38,119 @@ class TestTicketViews:
         assert response.status_code == 404
 
 
+@pytest.mark.django_db
+class TestTicketListPagination:
+    @pytest.fixture
+    def tickets(self, ticket_factory):
+        return [
+            ticket_factory(seat_number=seat, status=Ticket.Status.CANCELLED)
+            for seat in range(1, 8)
+        ]
+
+    def test_pages_newest_first_without_count(self, auth_client, tickets):
+        url = reverse("tickets-core:ticket-list")
+
+        response = auth_client.get(url, {"page_size": 3})
+
+        assert response.status_code == 200
+        assert "count" not in response.data
+        assert response.data["previous"] is None
+        assert [item["id"] for item in response.data["results"]] == [
+            ticket.id for ticket in tickets[::-1][:3]
+        ]
+
+    def test_walks_forward_and_back_with_cursors(self, auth_client, tickets):
+        url = reverse("tickets-core:ticket-list")
+        seen = []
+
+        response = auth_client.get(url, {"page_size": 3})
+        while True:
+            seen += [item["id"] for item in response.data["results"]]
+            if response.data["next"] is None:
+                break
+            response = auth_client.get(response.data["next"])
+
+        assert seen == [ticket.id for ticket in tickets[::-1]]
+
+        response = auth_client.get(response.data["previous"])
+        assert [item["id"] for item in response.data["results"]] == [
+            ticket.id for ticket in tickets[::-1][3:6]
+        ]
+
+    def test_count_is_opt_in(self, auth_client, tickets):
+        url = reverse("tickets-core:ticket-list")
+
+        response = auth_client.get(url, {"count": "true", "page_size": 2})
+
+        assert response.data["count"] == len(tickets)
+
+    def test_invalid_cursor(self, auth_client, tickets):
+        url = reverse("tickets-core:ticket-list")
+
+        response = auth_client.get(url, {"cursor": "not-a-cursor"})
+
+        assert response.status_code == 404
+
+    def test_page_does_not_count(
+        self, auth_client, tickets, django_assert_num_queries
+    ):
+        url = reverse("tickets-core:ticket-list")
+
+        with django_assert_num_queries(1):
+            auth_client.get(url, {"page_size": 3})
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    def test_file_is_opt_in(self, auth_client, reserved_ticket):
+        url = reverse("tickets-core:ticket-list")
+
+        response = auth_client.get(url)
+
+        assert "file" not in response.data["results"][0]
+        assert "status" in response.data["results"][0]
+
+    def test_file_is_rendered_on_request(self, auth_client, reserved_ticket):
+        url = reverse("tickets-core:ticket-detail", kwargs={"pk": reserved_ticket.id})
+
+        response = auth_client.get(url, {"fields": "id,file"})
+
+        assert response.data == {"id": reserved_ticket.id, "file": None}
+
+    def test_fields_limit_loaded_columns(
+        self, auth_client, reserved_ticket, django_assert_num_queries
+    ):
+        url = reverse("tickets-core:ticket-list")
+
+        with django_assert_num_queries(1) as context:
+            response = auth_client.get(url, {"fields": "id,seat_number"})
+
+        assert response.data["results"] == [
+            {"id": reserved_ticket.id, "seat_number": reserved_ticket.seat_number}
+        ]
+        sql = context.captured_queries[0]["sql"]
+        assert '"core_ticket"."seat_number"' in sql
+        assert '"core_ticket"."file"' not in sql
+        assert '"core_ticket"."origin"' not in sql
+
+    def test_omit(self, auth_client, reserved_ticket):
+        url = reverse("tickets-core:ticket-list")
+
+        response = auth_client.get(url, {"omit": "origin,destination"})
+
+        result = response.data["results"][0]
+        assert "origin" not in result
+        assert "destination" not in result
+        assert "seat_number" in result
+
+    def test_unknown_field(self, auth_client, reserved_ticket):
+        url = reverse("tickets-core:ticket-list")
+
+        response = auth_client.get(url, {"fields": "id,password"})
+
+        assert response.status_code == 400
+
+
 @pytest.mark.django_db
 class TestTicketCreation:
     @pytest.fixture(autouse=True)
@@ -111,9 +224,8 @@ class TestTicketCreation:
 
         response = auth_client.post(url, data=payload)
 
-        assert response.status_code == 400
-        assert "non_field_errors" in response.data or "seat_number" in response.data
-        assert response.data["non_field_errors"][0] == "Seat is already taken."
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data["detail"] == "Seat already taken."
 
     def test_create_ticket_trip_id_does_not_exist(self, auth_client, trip, mocker):
         mock_backend = MagicMock()
@@ -196,6 +308,130 @@ class TestTicketConfirmation:
         assert "ticket_id" in response.data
         assert "This field is required." in response.data["ticket_id"]
 
+    def test_confirm_other_users_ticket_is_not_found(
+        self, auth_client, other_reserved_ticket
+    ):
+        url = reverse("tickets-core:ticket-confirm")
+        payload = {"ticket_id": other_reserved_ticket.id, "invoice_id": "INV-123"}
+
+        response = auth_client.post(url, data=payload)
+
+        assert response.status_code == 404
+        other_reserved_ticket.refresh_from_db()
+        assert other_reserved_ticket.status == Ticket.Status.RESERVED
+
+    def test_confirm_marks_seat_taken_on_commit(
+        self, auth_client, reserved_ticket, django_capture_on_commit_callbacks
+    ):
+        url = reverse("tickets-core:ticket-confirm")
+        payload = {"ticket_id": reserved_ticket.id, "invoice_id": "INV-123"}
+
+        with (
+            patch("tickets.core.models.mark_seat_taken") as mark_seat_taken,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            auth_client.post(url, data=payload)
+
+        mark_seat_taken.assert_called_once_with(
+            reserved_ticket.trip_id, reserved_ticket.seat_number
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTicketConfirmationQueries:
+    def test_confirmation_is_a_single_statement(
+        self, auth_client, reserved_ticket, django_assert_num_queries
+    ):
+        url = reverse("tickets-core:ticket-confirm")
+        payload = {"ticket_id": reserved_ticket.id, "invoice_id": "INV-123"}
+
+        with django_assert_num_queries(1):
+            response = auth_client.post(url, data=payload)
+
+        assert response.status_code == 200
+
+    def test_batch_confirmation_is_a_single_statement(
+        self, auth_client, ticket_factory, django_assert_num_queries
+    ):
+        tickets = [ticket_factory(seat_number=seat) for seat in range(1, 51)]
+        url = reverse("tickets-core:ticket-confirm-batch")
+        payload = {
+            "confirmations": [
+                {"ticket_id": ticket.id, "invoice_id": f"INV-{ticket.id}"}
+                for ticket in tickets
+            ]
+        }
+
+        with django_assert_num_queries(1):
+            response = auth_client.post(url, data=payload, format="json")
+
+        assert response.status_code == 200
+        assert response.data["confirmed"] == sorted(ticket.id for ticket in tickets)
+        assert Ticket.objects.filter(status=Ticket.Status.PAID).count() == 50
+
+
+@pytest.mark.django_db
+class TestTicketBatchConfirmation:
+    url = reverse_lazy("tickets-core:ticket-confirm-batch")
+
+    def test_reports_each_failure(
+        self,
+        auth_client,
+        ticket_factory,
+        paid_ticket,
+        other_reserved_ticket,
+    ):
+        reserved = ticket_factory(seat_number=3)
+        reused = ticket_factory(seat_number=4)
+        payload = {
+            "confirmations": [
+                {"ticket_id": reserved.id, "invoice_id": "INV-1"},
+                {"ticket_id": reused.id, "invoice_id": "INV-EXISTING"},
+                {"ticket_id": paid_ticket.id, "invoice_id": "INV-2"},
+                {"ticket_id": other_reserved_ticket.id, "invoice_id": "INV-3"},
+                {"ticket_id": 99999, "invoice_id": "INV-4"},
+            ]
+        }
+
+        response = auth_client.post(self.url, data=payload, format="json")
+
+        assert response.status_code == 200
+        failed = {item["ticket_id"]: item["detail"] for item in response.data["failed"]}
+        assert response.data["confirmed"] == [reserved.id]
+        assert failed == {
+            reused.id: "This invoice is already associated with another ticket.",
+            paid_ticket.id: "Cannot confirm a ticket with status 'paid'.",
+            other_reserved_ticket.id: "Ticket not found.",
+            99999: "Ticket not found.",
+        }
+
+        reserved.refresh_from_db()
+        reused.refresh_from_db()
+        assert (reserved.status, reserved.invoice_id) == (Ticket.Status.PAID, "INV-1")
+        assert (reused.status, reused.invoice_id) == (Ticket.Status.RESERVED, None)
+
+    def test_rejects_repeated_invoice_ids(self, auth_client, ticket_factory):
+        first, second = ticket_factory(seat_number=1), ticket_factory(seat_number=2)
+        payload = {
+            "confirmations": [
+                {"ticket_id": first.id, "invoice_id": "INV-1"},
+                {"ticket_id": second.id, "invoice_id": "INV-1"},
+            ]
+        }
+
+        response = auth_client.post(self.url, data=payload, format="json")
+
+        assert response.status_code == 400
+        assert response.data["confirmations"] == [
+            "Each invoice_id may appear only once."
+        ]
+        assert not Ticket.objects.filter(status=Ticket.Status.PAID).exists()
+
+    def test_rejects_empty_batch(self, auth_client):
+        response = auth_client.post(self.url, data={"confirmations": []}, format="json")
+
+        assert response.status_code == 400
+
 
 @pytest.mark.django_db
 class TestTicketCancellation:
@@ -287,3 +523,78 @@ class TestTicketPresignedURL:
         assert response.status_code == 400
         assert "error" in response.data
         assert "PDF not available yet" in response.data["error"]
+
+
+@pytest.mark.django_db
+class TestBulkTicketReservation:
+    @pytest.fixture(autouse=True)
+    def mock_backend(self, mocker, raw_trip):
+        mock_backend = MagicMock()
+        mock_backend.get_trip.return_value = raw_trip
+        mocker.patch("tickets.core.views.get_depot_backend", return_value=mock_backend)
+        return mock_backend
+
+    @pytest.fixture
+    def payload(self, trip):
+        return {
+            "trip_id": trip["id"],
+            "origin": trip["origin"],
+            "destination": trip["destination"],
+            "seats": [3, 1, 2],
+        }
+
+    def test_bulk_reservation_success(self, auth_client, payload, mock_backend):
+        url = reverse("tickets-core:ticket-bulk")
+        response = auth_client.post(url, data=payload, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        tickets = response.data["tickets"]
+        assert [ticket["seat_number"] for ticket in tickets] == [1, 2, 3]
+        assert all(ticket["status"] == "reserved" for ticket in tickets)
+        assert Ticket.objects.filter(trip_id=payload["trip_id"]).count() == 3
+        mock_backend.get_trip.assert_called_once()
+
+    def test_bulk_reservation_is_all_or_nothing(
+        self, auth_client, payload, ticket_factory
+    ):
+        ticket_factory(seat_number=2, status=Ticket.Status.PAID)
+
+        url = reverse("tickets-core:ticket-bulk")
+        response = auth_client.post(url, data=payload, format="json")
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data["conflicts"] == [
+            {"seat_number": 2, "detail": "Seat already taken."}
+        ]
+        assert Ticket.objects.filter(trip_id=payload["trip_id"]).count() == 1
+
+    def test_bulk_reservation_reuses_lapsed_seats(
+        self, auth_client, payload, expired_ticket
+    ):
+        url = reverse("tickets-core:ticket-bulk")
+        response = auth_client.post(url, data=payload, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        expired_ticket.refresh_from_db()
+        assert expired_ticket.status == Ticket.Status.EXPIRED
+
+    def test_bulk_reservation_rejects_duplicate_seats(self, auth_client, payload):
+        payload["seats"] = [1, 1]
+
+        url = reverse("tickets-core:ticket-bulk")
+        response = auth_client.post(url, data=payload, format="json")
+
+        assert response.status_code == 400
+        assert "seats" in response.data
+
+    def test_bulk_reservation_rejects_seats_over_capacity(
+        self, auth_client, payload, trip
+    ):
+        payload["seats"] = [1, trip["bus_capacity"] + 1]
+
+        url = reverse("tickets-core:ticket-bulk")
+        response = auth_client.post(url, data=payload, format="json")
+
+        assert response.status_code == 400
+        assert "seats" in response.data
+        assert not Ticket.objects.exists()
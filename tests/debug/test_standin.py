@@ -0,0 +1,157 @@
+import json
+import random
+import threading
+
+import pytest
+from django.core.management import call_command
+
+from tickets.debug.standin import FaultProfile, Latency, StandinServer
+from tickets.depot.backends.client import DepotClient
+from tickets.depot.backends.json import JsonDepotBackend
+from tickets.depot.backends.json import trips as sample_trips
+from tickets.depot.backends.service import DepotServiceBackend
+from tickets.depot.exceptions import DepotServiceError
+from tickets.treasury.backends.client import TreasuryClient
+from tickets.treasury.backends.service import TreasuryServiceBackend
+
+
+@pytest.fixture
+def standin(tmp_path):
+    servers = []
+    path = tmp_path / "trips.json"
+    path.write_text(json.dumps(sample_trips))
+
+    def start(**profiles):
+        server = StandinServer(
+            ("127.0.0.1", 0), JsonDepotBackend(None, path=path), profiles, seed=1
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def depot(server, timeout=5):
+    client = DepotClient(base_url=f"{server.url}api/", timeout=timeout)
+    return DepotServiceBackend(client, bulk_path="trips/extra-info/bulk")
+
+
+def treasury(server):
+    return TreasuryServiceBackend(TreasuryClient(base_url=server.url, timeout=5))
+
+
+class TestLatency:
+    @pytest.mark.parametrize(
+        ("spec", "expected"),
+        [
+            ("25", Latency("fixed", (25.0,))),
+            ("uniform:10:20", Latency("uniform", (10.0, 20.0))),
+            ("lognormal:40:0.5", Latency("lognormal", (40.0, 0.5))),
+        ],
+    )
+    def test_parse(self, spec, expected):
+        assert Latency.parse(spec) == expected
+
+    @pytest.mark.parametrize("spec", ["uniform:10", "gamma:1:2", "fixed:fast"])
+    def test_parse_rejects_bad_specs(self, spec):
+        with pytest.raises(ValueError):
+            Latency.parse(spec)
+
+    def test_samples_in_seconds_and_never_negative(self):
+        rng = random.Random(0)
+
+        assert Latency.parse("uniform:10:20").sample(rng) == pytest.approx(0.015, 0.4)
+        assert min(Latency.parse("normal:1:50").sample(rng) for _ in range(100)) == 0
+
+
+class TestStandinServer:
+    def test_serves_depot_api(self, standin):
+        backend = depot(standin())
+
+        trips = backend.list_trips("ialoveni", "Hincesti")
+
+        assert [trip["id"] for trip in trips] == [1, 2]
+        assert (
+            backend.get_trip(1, "Ialoveni", "Hincesti")["trip_nr"]
+            == trips[0]["trip_nr"]
+        )
+        assert backend.get_trip(404, "", "") is None
+        assert backend.get_trips([(1, "A", "B"), (3, "A", "B")]) == {
+            (1, "A", "B"): trips[0],
+            (3, "A", "B"): None,
+        }
+
+    def test_serves_treasury_api(self, standin):
+        backend = treasury(standin())
+
+        invoice = backend.pay_ticket({}, {"seat_number": 1}, {})
+        refund = backend.refund_ticket({"invoice_id": invoice["invoice_id"]})
+
+        assert invoice["invoice_id"].startswith("INV-")
+        assert refund["refund_id"].startswith("REF-")
+        assert refund["invoice_id"] == invoice["invoice_id"]
+
+    def test_serves_bulk_refunds(self, standin):
+        server = standin()
+        backend = TreasuryServiceBackend(
+            TreasuryClient(base_url=server.url, timeout=5),
+            bulk_refund_path="api/refunds/bulk",
+        )
+
+        results = backend.refund_tickets(
+            [{"invoice_id": "INV-1"}, {"invoice_id": "INV-2"}]
+        )
+
+        assert {key: value["invoice_id"] for key, value in results.items()} == {
+            "INV-1": "INV-1",
+            "INV-2": "INV-2",
+        }
+        assert server.stats == {("refunds", "ok"): 1}
+
+    def test_injected_errors(self, standin):
+        server = standin(depot=FaultProfile(error_rate=1.0))
+
+        with pytest.raises(DepotServiceError):
+            depot(server).list_trips("Ialoveni", "Hincesti")
+
+        assert treasury(server).refund_ticket({"invoice_id": "INV-1"})
+        assert server.stats == {("search", "error"): 1, ("refund", "ok"): 1}
+
+    def test_injected_timeouts(self, standin):
+        server = standin(depot=FaultProfile(timeout_rate=1.0, hang=0.5))
+
+        with pytest.raises(DepotServiceError):
+            depot(server, timeout=0.05).get_trip(1, "", "")
+
+        assert server.stats == {("trip", "timeout"): 1}
+
+    def test_injected_latency(self, standin):
+        server = standin(depot=FaultProfile(latency=Latency.parse("50")))
+
+        client = DepotClient(base_url=server.url, timeout=0.01)
+        with pytest.raises(DepotServiceError):
+            DepotServiceBackend(client).list_trips("Ialoveni", "Hincesti")
+
+    def test_unknown_path(self, standin):
+        with pytest.raises(DepotServiceError):
+            depot(standin())._request("get", "unknown")
+
+
+def test_bench_backends_command(standin, settings, capsys):
+    server = standin()
+    settings.DEPOT = {
+        "backend": "tickets.depot.backends.service.DepotServiceBackend",
+        "options": {"base_url": server.url, "timeout": 5},
+    }
+
+    call_command("bench_backends", "search", requests=20, concurrency=4)
+
+    output = capsys.readouterr().out
+    assert "20 requests" in output
+    assert "0 error(s)" in output
+    assert "p99" in output
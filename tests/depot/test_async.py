@@ -0,0 +1,154 @@
+import json
+
+import httpx
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from tickets.core.models import Ticket
+from tickets.core.seat_map import get_seat_map, mark_seat_taken
+from tickets.depot.backends.async_service import (
+    AsyncDepotServiceBackend,
+    ThreadedDepotBackend,
+    get_async_depot_backend,
+)
+from tickets.depot.exceptions import DepotServiceError
+
+
+def depot_transport(raw_trip, calls=None):
+    trip = json.loads(json.dumps(raw_trip, default=str))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if calls is not None:
+            calls.append(request.url.path)
+        if request.url.path == "/api/smart-trip-search":
+            return httpx.Response(200, json=[trip])
+        if request.url.path == "/api/trips/1/extra-info":
+            return httpx.Response(200, json=trip)
+        if request.url.path == "/api/trips/bulk":
+            return httpx.Response(404)
+        return httpx.Response(404, json={"detail": "Not found."})
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def async_backend(raw_trip):
+    calls = []
+    client = httpx.AsyncClient(
+        base_url="http://depot/api/", transport=depot_transport(raw_trip, calls)
+    )
+    backend = AsyncDepotServiceBackend(client, bulk_path="trips/bulk")
+    backend.calls = calls
+    return backend
+
+
+@pytest.mark.django_db
+class TestAsyncDepotServiceBackend:
+    def test_get_trip(self, async_backend):
+        trip = async_to_sync(async_backend.get_trip)(1, "A", "B")
+
+        assert trip["id"] == 1
+
+    def test_http_errors_become_depot_errors(self, async_backend):
+        with pytest.raises(DepotServiceError):
+            async_to_sync(async_backend.get_trip)(2, "A", "B")
+
+    def test_get_trips_falls_back_to_fan_out(self, async_backend):
+        trips = async_to_sync(async_backend.get_trips)([(1, "A", "B"), (1, "A", "C")])
+
+        assert trips[(1, "A", "B")]["id"] == 1
+        assert trips[(1, "A", "C")]["id"] == 1
+        assert async_backend.bulk_path is None
+        assert async_backend.calls.count("/api/trips/1/extra-info") == 2
+
+    def test_seat_info_reads_depot_and_holds(self, async_backend, ticket_factory):
+        ticket_factory(seat_number=3)
+
+        seat_info = async_to_sync(async_backend.get_seat_info)(1, "A", "B")
+
+        assert seat_info["seats"]["3"] == "reserved"
+        assert seat_info["seats"]["4"] == "available"
+        assert Ticket.objects.seat_map(1, 52).is_taken(3)
+
+    def test_seat_change_during_cold_load_is_not_cached(
+        self, mocker, async_backend, ticket_factory
+    ):
+        seat_holds = Ticket.objects.seat_holds
+
+        def commit_meanwhile(trip_id):
+            # A reservation lands after the version was read, before the holds.
+            ticket_factory(seat_number=5)
+            mark_seat_taken(trip_id, 5)
+            return seat_holds(trip_id)
+
+        mocker.patch.object(Ticket.objects, "seat_holds", commit_meanwhile)
+
+        seat_info = async_to_sync(async_backend.get_seat_info)(1, "A", "B")
+
+        assert seat_info["seats"]["5"] == "reserved"
+        assert get_seat_map(1) is None
+
+
+@pytest.mark.django_db
+class TestAsyncTripViews:
+    @pytest.fixture(autouse=True)
+    def async_service(self, settings, mocker, raw_trip):
+        settings.DEPOT = {
+            **settings.DEPOT,
+            "async_backend": (
+                "tickets.depot.backends.async_service.AsyncDepotServiceBackend"
+            ),
+            "options": {"base_url": "http://depot/api/"},
+        }
+        transport = depot_transport(raw_trip)
+        original = httpx.AsyncClient.__init__
+
+        def init(self, *args, **kwargs):
+            original(self, *args, transport=transport, **kwargs)
+
+        mocker.patch.object(httpx.AsyncClient, "__init__", init)
+
+    def get(self, url):
+        return async_to_sync(AsyncClient().get)(url, {"origin": "A", "destination": "B"})
+
+    def test_list(self):
+        response = self.get(reverse("tickets-depot:async-trip-list"))
+
+        assert response.status_code == 200
+        assert response.json()[0]["id"] == 1
+
+    def test_retrieve(self):
+        url = reverse("tickets-depot:async-trip-detail", kwargs={"pk": 1})
+
+        response = self.get(url)
+
+        assert response.status_code == 200
+        assert response.json()["id"] == 1
+
+    def test_retrieve_depot_error(self):
+        url = reverse("tickets-depot:async-trip-detail", kwargs={"pk": 7})
+
+        response = self.get(url)
+
+        assert response.status_code == 502
+
+    def test_seats(self, ticket_factory):
+        ticket_factory(seat_number=2)
+        url = reverse("tickets-depot:async-trip-seats", kwargs={"pk": 1})
+
+        response = self.get(url)
+
+        assert response.status_code == 200
+        assert response.json()["seats"]["2"] == "reserved"
+
+
+def test_default_wraps_blocking_backend():
+    backend = async_to_sync(_get_backend)()
+
+    assert isinstance(backend, ThreadedDepotBackend)
+
+
+async def _get_backend():
+    return get_async_depot_backend()
@@ -0,0 +1,322 @@
+import json
+import os
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from tickets.depot.backends.base import BaseBackend
+from tickets.depot.backends.json import JsonDepotBackend
+from tickets.depot.backends.service import DepotServiceBackend
+from tickets.depot.exceptions import DepotServiceError
+
+
+def json_response(data, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = data
+    if status_code >= 400:
+        error = requests.HTTPError(f"{status_code}")
+        error.response = response
+        response.raise_for_status.side_effect = error
+    return response
+
+
+class TestBaseBackendGetTrips:
+    def test_falls_back_to_get_trip_per_unique_key(self):
+        backend = BaseBackend()
+        backend.get_trip = MagicMock(side_effect=lambda trip_id, *args: {"id": trip_id})
+
+        trips = backend.get_trips([(1, "A", "B"), (2, "A", "B"), (1, "A", "B")])
+
+        assert trips == {(1, "A", "B"): {"id": 1}, (2, "A", "B"): {"id": 2}}
+        assert backend.get_trip.call_count == 2
+
+
+def catalog_trip(trip_id, origin="Ialoveni", destination="Hincesti"):
+    return {
+        "id": trip_id,
+        "from_station": {"city": origin},
+        "to_station": {"city": destination},
+    }
+
+
+def write_catalog(path, trips, mtime=None):
+    path.write_text(json.dumps({"trips": trips}))
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+class TestJsonDepotBackend:
+    @pytest.fixture
+    def catalog_path(self, tmp_path):
+        path = tmp_path / "trips.json"
+        write_catalog(
+            path,
+            [
+                catalog_trip(1),
+                catalog_trip(2, "Chisinau", "Balti"),
+                catalog_trip(3, "Chisinau", "Hincesti"),
+            ],
+            mtime=1_000_000_000,
+        )
+        return path
+
+    def test_get_trips_from_index(self):
+        backend = JsonDepotBackend(client=MagicMock(), path="/nonexistent.json")
+
+        trips = backend.get_trips([(1, "", ""), (99, "", "")])
+
+        assert trips[(1, "", "")]["id"] == 1
+        assert trips[(99, "", "")] is None
+
+    def test_loads_configured_file(self, settings, catalog_path):
+        settings.DEPOT_JSON_PATH = str(catalog_path)
+
+        backend = JsonDepotBackend(client=MagicMock())
+
+        assert backend.get_trip(3)["from_station"]["city"] == "Chisinau"
+
+    def test_list_trips_filters_by_route(self, catalog_path):
+        backend = JsonDepotBackend(client=MagicMock(), path=catalog_path)
+
+        def ids(origin, destination):
+            return [trip["id"] for trip in backend.list_trips(origin, destination)]
+
+        assert ids("chisinau", "Balti") == [2]
+        assert ids("Chisinau", None) == [2, 3]
+        assert ids(None, "Hincesti") == [1, 3]
+        assert ids(None, None) == [1, 2, 3]
+        assert ids("Ialoveni", "Balti") == []
+
+    def test_reloads_when_file_changes(self, catalog_path):
+        backend = JsonDepotBackend(
+            client=MagicMock(), path=catalog_path, reload_interval=0
+        )
+        write_catalog(catalog_path, [catalog_trip(7)], mtime=2_000_000_000)
+
+        assert backend.get_trip(1) is None
+        assert backend.get_trip(7)["id"] == 7
+
+    def test_broken_file_keeps_previous_catalog(self, catalog_path):
+        backend = JsonDepotBackend(
+            client=MagicMock(), path=catalog_path, reload_interval=0
+        )
+        catalog_path.write_text('{"trips": [')
+        os.utime(catalog_path, ns=(2_000_000_000, 2_000_000_000))
+
+        assert backend.get_trip(1)["id"] == 1
+
+    def test_empty_file_at_start_serves_no_trips_until_reload(self, tmp_path):
+        path = tmp_path / "trips.json"
+        path.touch()
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+        backend = JsonDepotBackend(client=MagicMock(), path=path, reload_interval=0)
+
+        assert backend.list_trips(None, None) == []
+        write_catalog(path, [catalog_trip(7)], mtime=2_000_000_000)
+        assert backend.get_trip(7)["id"] == 7
+
+    def test_reload_is_throttled(self, catalog_path):
+        backend = JsonDepotBackend(
+            client=MagicMock(), path=catalog_path, reload_interval=60
+        )
+        write_catalog(catalog_path, [catalog_trip(7)], mtime=2_000_000_000)
+
+        assert backend.get_trip(1)["id"] == 1
+
+    def test_large_catalog_lookups_use_indexes(self, tmp_path):
+        path = tmp_path / "trips.json"
+        write_catalog(
+            path,
+            [
+                catalog_trip(trip_id, f"City {trip_id % 300}", f"City {trip_id % 7}")
+                for trip_id in range(100_000)
+            ],
+        )
+        backend = JsonDepotBackend(client=MagicMock(), path=path)
+
+        started = time.perf_counter()
+        for trip_id in range(0, 100_000, 10):
+            backend.get_trip(trip_id)
+        matches = backend.list_trips("City 5", "City 5")
+        elapsed = time.perf_counter() - started
+
+        assert {trip["id"] % 300 for trip in matches} == {5}
+        assert elapsed < 0.5
+
+
+class TestDepotServiceBackendGetTrips:
+    def test_uses_bulk_endpoint(self):
+        client = MagicMock()
+        client.request.return_value = json_response([{"id": 1}, {"id": 2}])
+        backend = DepotServiceBackend(client, bulk_path="trips/extra-info/bulk")
+
+        trips = backend.get_trips([(1, "A", "B"), (2, "A", "B"), (3, "A", "B")])
+
+        assert trips == {
+            (1, "A", "B"): {"id": 1},
+            (2, "A", "B"): {"id": 2},
+            (3, "A", "B"): None,
+        }
+        client.request.assert_called_once_with(
+            "post",
+            "trips/extra-info/bulk",
+            json={
+                "trips": [
+                    {"id": 1, "origin": "A", "destination": "B"},
+                    {"id": 2, "origin": "A", "destination": "B"},
+                    {"id": 3, "origin": "A", "destination": "B"},
+                ]
+            },
+        )
+
+    def test_missing_bulk_endpoint_falls_back_to_fan_out(self):
+        client = MagicMock()
+        client.request.side_effect = lambda method, path, **kwargs: (
+            json_response(None, 404)
+            if method == "post"
+            else json_response({"id": int(path.split("/")[1])})
+        )
+        backend = DepotServiceBackend(client, bulk_path="trips/extra-info/bulk")
+
+        trips = backend.get_trips([(1, "A", "B"), (2, "A", "B")])
+
+        assert trips == {(1, "A", "B"): {"id": 1}, (2, "A", "B"): {"id": 2}}
+        assert backend.bulk_path is None
+
+    def test_bulk_server_error_is_raised(self):
+        client = MagicMock()
+        client.request.return_value = json_response(None, 500)
+        backend = DepotServiceBackend(client, bulk_path="trips/extra-info/bulk")
+
+        with pytest.raises(DepotServiceError):
+            backend.get_trips([(1, "A", "B")])
+
+    def test_fan_out_is_bounded(self):
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def request(method, path, **kwargs):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            return json_response({"id": int(path.split("/")[1])})
+
+        client = MagicMock()
+        client.request.side_effect = request
+        backend = DepotServiceBackend(client, max_workers=3)
+
+        trips = backend.get_trips([(trip_id, "A", "B") for trip_id in range(12)])
+
+        assert len(trips) == 12
+        assert trips[(7, "A", "B")] == {"id": 7}
+        assert peak <= 3
+
+
+class TestDepotServiceBackendSingleFlight:
+    @staticmethod
+    def blocking_client(release, responses=None):
+        def request(method, path, **kwargs):
+            release.wait(1)
+            if responses:
+                return responses.pop(0)
+            return json_response({"id": int(path.split("/")[1])})
+
+        client = MagicMock()
+        client.request.side_effect = request
+        return client
+
+    @staticmethod
+    def run_concurrently(fn, count):
+        results, errors = [], []
+
+        def call():
+            try:
+                results.append(fn())
+            except DepotServiceError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_concurrent_identical_gets_share_one_request(self):
+        release = threading.Event()
+        client = self.blocking_client(release)
+        backend = DepotServiceBackend(client)
+
+        threads, results, _ = self.run_concurrently(
+            lambda: backend.get_trip(1, "A", "B"), 5
+        )
+        while backend.flights.stats["coalesced"] < 4:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == [{"id": 1}] * 5
+        assert client.request.call_count == 1
+        assert backend.flights.stats == {"leader": 1, "coalesced": 4}
+
+    def test_seat_info_joins_in_flight_trip_request(self, mocker):
+        release = threading.Event()
+        client = self.blocking_client(release)
+        backend = DepotServiceBackend(client)
+        mocker.patch(
+            "tickets.depot.backends.service.build_seat_info",
+            side_effect=lambda trip_id, trip: {"trip_info": trip},
+        )
+
+        threads, results, _ = self.run_concurrently(
+            lambda: backend.get_trip(1, "A", "B"), 1
+        )
+        while not backend.flights.stats["leader"]:
+            time.sleep(0.001)
+        seat_thread = threading.Thread(target=backend.get_seat_info, args=(1, "A", "B"))
+        seat_thread.start()
+        while not backend.flights.stats["coalesced"]:
+            time.sleep(0.001)
+        release.set()
+        for thread in [*threads, seat_thread]:
+            thread.join()
+
+        assert client.request.call_count == 1
+
+    def test_errors_are_shared_and_not_kept(self):
+        release = threading.Event()
+        client = self.blocking_client(release, [json_response(None, 503)])
+        backend = DepotServiceBackend(client)
+
+        threads, _, errors = self.run_concurrently(
+            lambda: backend.get_trip(1, "A", "B"), 3
+        )
+        while backend.flights.stats["coalesced"] < 2:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 3
+        assert backend.get_trip(1, "A", "B") == {"id": 1}
+        assert client.request.call_count == 2
+
+    def test_different_params_are_not_coalesced(self):
+        client = MagicMock()
+        client.request.return_value = json_response({"id": 1})
+        backend = DepotServiceBackend(client)
+
+        backend.get_trip(1, "A", "B")
+        backend.get_trip(1, "A", "C")
+
+        assert client.request.call_count == 2
+        assert backend.flights.stats["coalesced"] == 0
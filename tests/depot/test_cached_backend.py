@@ -0,0 +1,150 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from tickets.depot.backends.base import get_depot_backend
+from tickets.depot.backends.cached import CachedDepotBackend
+from tickets.depot.exceptions import DepotServiceError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class InlineExecutor:
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def inner():
+    backend = MagicMock()
+    backend.get_trip.side_effect = lambda trip_id, *args: {"id": trip_id}
+    return backend
+
+
+@pytest.fixture
+def cached(inner, clock):
+    backend = CachedDepotBackend(
+        inner, ttl=10, stale_ttl=20, negative_ttl=5, maxsize=2, clock=clock
+    )
+    backend._executor = InlineExecutor()
+    return backend
+
+
+class TestCachedDepotBackend:
+    def test_hit_within_ttl(self, cached, inner):
+        assert cached.get_trip(1, "A", "B") == {"id": 1}
+        assert cached.get_trip(1, "A", "B") == {"id": 1}
+
+        assert inner.get_trip.call_count == 1
+        assert cached.stats["miss"] == 1
+        assert cached.stats["hit"] == 1
+
+    def test_key_includes_route(self, cached, inner):
+        cached.get_trip(1, "A", "B")
+        cached.get_trip(1, "A", "C")
+
+        assert inner.get_trip.call_count == 2
+
+    def test_stale_value_served_while_refreshing(self, cached, inner, clock):
+        cached.get_trip(1, "A", "B")
+        inner.get_trip.side_effect = lambda *args: {"id": 1, "price": 40}
+        clock.now = 15
+
+        assert cached.get_trip(1, "A", "B") == {"id": 1}
+        assert cached.stats["stale"] == 1
+        assert cached.get_trip(1, "A", "B") == {"id": 1, "price": 40}
+
+    def test_expired_past_stale_window(self, cached, inner, clock):
+        cached.get_trip(1, "A", "B")
+        clock.now = 31
+
+        cached.get_trip(1, "A", "B")
+
+        assert inner.get_trip.call_count == 2
+
+    def test_failed_refresh_keeps_stale_value(self, cached, inner, clock):
+        cached.get_trip(1, "A", "B")
+        inner.get_trip.side_effect = DepotServiceError("GET", "trips/1", "down")
+        clock.now = 15
+
+        assert cached.get_trip(1, "A", "B") == {"id": 1}
+        assert cached.get_trip(1, "A", "B") == {"id": 1}
+
+    def test_missing_trip_is_cached_negatively(self, cached, inner, clock):
+        inner.get_trip.side_effect = lambda *args: None
+
+        assert cached.get_trip(9, "A", "B") is None
+        assert cached.get_trip(9, "A", "B") is None
+        assert cached.stats["negative"] == 1
+
+        clock.now = 6
+        cached.get_trip(9, "A", "B")
+        assert inner.get_trip.call_count == 2
+
+    def test_errors_are_not_cached(self, cached, inner):
+        inner.get_trip.side_effect = DepotServiceError("GET", "trips/1", "down")
+
+        with pytest.raises(DepotServiceError):
+            cached.get_trip(1, "A", "B")
+
+        inner.get_trip.side_effect = lambda trip_id, *args: {"id": trip_id}
+        assert cached.get_trip(1, "A", "B") == {"id": 1}
+
+    def test_least_recently_used_is_evicted(self, cached, inner):
+        cached.get_trip(1)
+        cached.get_trip(2)
+        cached.get_trip(1)
+        cached.get_trip(3)
+
+        cached.get_trip(1)
+        cached.get_trip(2)
+
+        assert inner.get_trip.call_count == 4
+
+    def test_get_trips_fetches_only_missing_keys(self, cached, inner):
+        inner.get_trips.side_effect = lambda keys: {key: {"id": key[0]} for key in keys}
+        cached.get_trip(1, "A", "B")
+
+        trips = cached.get_trips([(1, "A", "B"), (2, "A", "B")])
+
+        assert trips == {(1, "A", "B"): {"id": 1}, (2, "A", "B"): {"id": 2}}
+        inner.get_trips.assert_called_once_with([(2, "A", "B")])
+
+    @pytest.mark.django_db
+    def test_seat_info_uses_cached_trip(self, cached, inner):
+        inner.get_trip.side_effect = lambda trip_id, *args: {
+            "id": trip_id,
+            "schedule": {"bus": {"capacity": 3}},
+        }
+
+        cached.get_seat_info(1, "A", "B")
+        seat_info = cached.get_seat_info(1, "A", "B")
+
+        assert seat_info["seats"] == {"1": "available", "2": "available", "3": "available"}
+        assert inner.get_trip.call_count == 1
+
+
+class TestCacheSettings:
+    def test_backend_is_wrapped_when_configured(self, settings):
+        settings.DEPOT = {**settings.DEPOT, "cache": {"ttl": 30}}
+
+        backend = get_depot_backend()
+
+        assert isinstance(backend, CachedDepotBackend)
+        assert backend.ttl == 30
+
+    def test_cache_can_be_disabled(self, settings):
+        settings.DEPOT = {**settings.DEPOT, "cache": None}
+
+        assert not isinstance(get_depot_backend(), CachedDepotBackend)
@@ -0,0 +1,112 @@
+import copy
+import time
+from datetime import date
+from datetime import time as dt_time
+
+import pytest
+from rest_framework import serializers
+
+from tickets.depot.projections import TripView, project_trip, project_trips
+from tickets.depot.serializers import TripSerializer
+
+
+def nested_trip_representation(raw_trip: dict) -> dict:
+    """The previous TripSerializer output: full nested DRF pass, then flatten."""
+    data = serializers.Serializer.to_representation(TripSerializer(), raw_trip)
+
+    from_station = data.get("from_station", {})
+    to_station = data.get("to_station", {})
+    bus = data.get("schedule", {}).get("bus", {})
+    driver = bus.get("driver", {})
+    route = data.get("schedule", {}).get("route", {})
+
+    return {
+        "id": data.get("id"),
+        "trip_nr": data.get("trip_nr"),
+        "date": data.get("date"),
+        "status": data.get("status"),
+        "price": data.get("price"),
+        "origin": from_station.get("city", ""),
+        "destination": to_station.get("city", ""),
+        "start_time": data.get("departure_time"),
+        "end_time": data.get("arrival_time"),
+        "bus_capacity": bus.get("capacity", 0),
+        "bus_model": bus.get("model", ""),
+        "bus_plate_number": bus.get("plate_number", ""),
+        "driver_name": driver.get("name", ""),
+        "driver_phone": driver.get("phone_number", ""),
+        "route_name": route.get("name", ""),
+    }
+
+
+def depot_payload(raw_trip: dict) -> dict:
+    """The raw_trip fixture as the depot sends it over JSON."""
+    trip = copy.deepcopy(raw_trip)
+    trip["date"] = raw_trip["date"].isoformat()
+    trip["departure_time"] = raw_trip["departure_time"].isoformat()
+    trip["arrival_time"] = raw_trip["arrival_time"].isoformat()
+    trip["schedule"]["start_time"] = "08:00:00"
+    trip["schedule"]["end_time"] = "10:00:00"
+    trip["price"] = "150.50"
+    trip["id"] = "1"
+    return trip
+
+
+class TestTripView:
+    def test_matches_nested_serializer(self, raw_trip):
+        assert project_trip(raw_trip) == nested_trip_representation(raw_trip)
+
+    def test_matches_nested_serializer_for_json_payload(self, raw_trip):
+        payload = depot_payload(raw_trip)
+
+        assert project_trip(payload) == nested_trip_representation(payload)
+        assert project_trip(payload)["id"] == 1
+        assert project_trip(payload)["price"] == 150.5
+
+    def test_optional_times(self, raw_trip):
+        del raw_trip["departure_time"]
+        raw_trip["arrival_time"] = None
+
+        assert project_trip(raw_trip) == nested_trip_representation(raw_trip)
+
+    def test_coerces_dates_and_times(self):
+        view = TripView.from_depot(
+            {"date": date(2025, 1, 2), "departure_time": dt_time(9, 30)}
+        )
+
+        assert view.date == "2025-01-02"
+        assert view.start_time == "09:30:00"
+        assert view.end_time is None
+        assert view.bus_capacity == 0
+
+    def test_serializer_uses_projection(self, raw_trip):
+        assert TripSerializer(raw_trip).data == project_trip(raw_trip)
+        assert TripSerializer([raw_trip], many=True).data == project_trips([raw_trip])
+
+    def test_slots(self, raw_trip):
+        view = TripView.from_depot(raw_trip)
+
+        assert not hasattr(view, "__dict__")
+        assert set(view.to_dict()) == set(TripView.__slots__)
+
+
+@pytest.mark.benchmark
+def test_projection_outpaces_nested_serializer(raw_trip):
+    trips = []
+    for trip_id in range(1000):
+        trip = depot_payload(raw_trip)
+        trip["id"] = trip_id
+        trips.append(trip)
+
+    def best_of(fn, rounds=3):
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    nested = best_of(lambda: [nested_trip_representation(trip) for trip in trips])
+    projected = best_of(lambda: TripSerializer(trips, many=True).data)
+
+    assert projected * 5 < nested
@@ -0,0 +1,182 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from tickets.depot.backends.base import get_depot_backend
+from tickets.depot.backends.client import DepotClient
+from tickets.depot.backends.resilience import (
+    BulkheadFullError,
+    CircuitBreaker,
+    CircuitOpenError,
+    DepotResilience,
+)
+from tickets.depot.backends.service import DepotServiceBackend
+from tickets.depot.exceptions import DepotServiceError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def response(status_code=200):
+    return MagicMock(status_code=status_code)
+
+
+def fail():
+    raise requests.ConnectionError("boom")
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def policy(clock):
+    return DepotResilience(failure_threshold=2, reset_timeout=30, clock=clock)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self, policy):
+        for _ in range(2):
+            with pytest.raises(requests.ConnectionError):
+                policy.call("GET", "/trips/1/", fail)
+
+        send = MagicMock(return_value=response())
+        with pytest.raises(CircuitOpenError):
+            policy.call("GET", "/trips/2/", send)
+
+        send.assert_not_called()
+        assert policy.snapshot() == {
+            "GET /trips/{id}/": {"state": "open", "failures": 2}
+        }
+
+    def test_endpoints_are_isolated(self, policy):
+        for _ in range(2):
+            with pytest.raises(requests.ConnectionError):
+                policy.call("GET", "/trips/1/", fail)
+
+        assert policy.call("GET", "/trips/", lambda: response()).status_code == 200
+
+    def test_server_errors_count_client_errors_do_not(self, policy):
+        policy.call("GET", "/trips/1/", lambda: response(404))
+        policy.call("GET", "/trips/1/", lambda: response(404))
+        assert policy.breaker("GET /trips/{id}/").state == CircuitBreaker.CLOSED
+
+        policy.call("GET", "/trips/1/", lambda: response(503))
+        policy.call("GET", "/trips/1/", lambda: response(503))
+        assert policy.breaker("GET /trips/{id}/").state == CircuitBreaker.OPEN
+
+    def test_half_open_probe(self, policy, clock):
+        breaker = policy.breaker("GET /trips/{id}/")
+        breaker.record_failure()
+        breaker.record_failure()
+
+        clock.now = 31
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        clock.now = 62
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow()
+
+
+class TestBulkhead:
+    def test_rejects_when_full(self):
+        policy = DepotResilience(max_concurrent=1, bulkhead_timeout=0.01)
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(1)
+            return response()
+
+        worker = threading.Thread(target=policy.call, args=("GET", "/trips/", slow))
+        worker.start()
+        started.wait(1)
+
+        with pytest.raises(BulkheadFullError):
+            policy.call("GET", "/trips/", lambda: response())
+
+        release.set()
+        worker.join()
+        assert policy.call("GET", "/trips/", lambda: response()).status_code == 200
+
+    def test_rejected_probe_does_not_wedge_half_open_breaker(self, clock):
+        policy = DepotResilience(
+            failure_threshold=1,
+            max_concurrent=1,
+            bulkhead_timeout=0.01,
+            clock=clock,
+        )
+        with pytest.raises(requests.ConnectionError):
+            policy.call("GET", "/trips/1/", fail)
+
+        clock.now = 31
+        policy.bulkhead.acquire()
+        with pytest.raises(BulkheadFullError):
+            policy.call("GET", "/trips/1/", lambda: response())
+        policy.bulkhead.release()
+
+        assert policy.call("GET", "/trips/1/", lambda: response()).status_code == 200
+        assert policy.breaker("GET /trips/{id}/").state == CircuitBreaker.CLOSED
+
+
+class TestHedging:
+    def test_slow_get_is_hedged(self):
+        policy = DepotResilience(hedge_after=0.01)
+        release = threading.Event()
+        calls = []
+
+        def send():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(1)
+                return response(500)
+            return response(200)
+
+        assert policy.call("GET", "/trips/", send).status_code == 200
+        assert len(calls) == 2
+        release.set()
+
+    def test_writes_are_not_hedged(self):
+        policy = DepotResilience(hedge_after=0.001)
+        send = MagicMock(return_value=response())
+
+        policy.call("POST", "/trips/bulk/", send)
+
+        send.assert_called_once()
+
+
+class TestDepotClientResilience:
+    def test_open_circuit_becomes_depot_service_error(self, policy):
+        client = DepotClient(base_url="http://depot.fake", resilience=policy)
+        breaker = policy.breaker("GET trips/{id}/extra-info")
+        breaker.record_failure()
+        breaker.record_failure()
+
+        with pytest.raises(DepotServiceError):
+            DepotServiceBackend(client).get_trip(1, "A", "B")
+
+    def test_build_from_settings(self, settings):
+        settings.DEPOT = {
+            "backend": "tickets.depot.backends.service.DepotServiceBackend",
+            "options": {"base_url": "http://depot.fake", "timeout": 5},
+            "resilience": {"failure_threshold": 3, "hedge_after": None},
+        }
+
+        client = get_depot_backend().client
+
+        assert client.resilience.failure_threshold == 3
+        assert client.resilience._executor is None
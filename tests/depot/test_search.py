@@ -0,0 +1,122 @@
+from unittest.mock import MagicMock
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from tickets.core.tasks import warm_trip_searches
+from tickets.depot import search
+from tickets.depot.exceptions import DepotServiceError
+
+
+@pytest.fixture
+def backend(mocker, raw_trip):
+    backend = MagicMock()
+    backend.list_trips.return_value = [raw_trip]
+    mocker.patch("tickets.depot.views.get_depot_backend", return_value=backend)
+    return backend
+
+
+class TestSearchTrips:
+    def test_second_search_is_served_from_cache(self, backend, raw_trip):
+        assert search.search_trips(backend, "Chisinau", "Balti") == ([raw_trip], None)
+
+        trips, age = search.search_trips(backend, "  chisinau ", "BALTI")
+
+        assert trips == [raw_trip]
+        assert age == 0
+        backend.list_trips.assert_called_once_with("Chisinau", "Balti")
+
+    def test_errors_are_not_cached(self, backend):
+        backend.list_trips.side_effect = DepotServiceError("GET", "search", None)
+
+        for _ in range(2):
+            with pytest.raises(DepotServiceError):
+                search.search_trips(backend, "Chisinau", "Balti")
+
+        assert backend.list_trips.call_count == 2
+
+    def test_disabled(self, backend, settings):
+        settings.TRIP_SEARCH_TIMEOUT = 0
+
+        search.search_trips(backend, "Chisinau", "Balti")
+        search.search_trips(backend, "Chisinau", "Balti")
+
+        assert backend.list_trips.call_count == 2
+
+
+@pytest.mark.django_db
+class TestPopularPairs:
+    def test_traffic_first_then_ticket_history(self, ticket_factory):
+        ticket_factory(origin="Orhei", destination="Soroca")
+        for _ in range(3):
+            search.record_search("Chisinau", "Balti")
+        search.record_search("cahul", "comrat")
+
+        assert search.popular_pairs(3) == [
+            ("Chisinau", "Balti"),
+            ("cahul", "comrat"),
+            ("Orhei", "Soroca"),
+        ]
+        assert search.popular_pairs(1) == [("Chisinau", "Balti")]
+
+    def test_traffic_ages_out_bucket_by_bucket(self, mocker, settings):
+        settings.TRIP_SEARCH_TRAFFIC_WINDOW = 600
+        settings.TRIP_SEARCH_TRAFFIC_BUCKETS = 6
+        clock = mocker.patch("tickets.depot.search.time")
+        clock.time.return_value = 1_000_000
+        search.record_search("Chisinau", "Balti")
+        clock.time.return_value += 300
+        search.record_search("cahul", "comrat")
+        search.record_search("cahul", "comrat")
+        search.record_search("chisinau", "balti")
+
+        assert search.popular_pairs(2) == [("chisinau", "balti"), ("cahul", "comrat")]
+
+        clock.time.return_value += 400
+        assert search.popular_pairs(2) == [("cahul", "comrat"), ("chisinau", "balti")]
+
+        clock.time.return_value += 300
+        assert search.popular_pairs(2) == []
+
+    def test_tracked_pairs_are_capped(self, settings):
+        settings.TRIP_SEARCH_TRAFFIC_PAIRS = 2
+        for origin in ("Balti", "Cahul", "Orhei"):
+            search.record_search(origin, "Chisinau")
+        search.record_search("Orhei", "Chisinau")
+
+        assert search.popular_pairs(5) == [("Balti", "Chisinau"), ("Cahul", "Chisinau")]
+
+    def test_warm_refreshes_popular_pairs(self, mocker, raw_trip):
+        backend = mocker.patch("tickets.core.tasks.get_depot_backend").return_value
+        backend.list_trips.return_value = [raw_trip]
+        search.record_search("Chisinau", "Balti")
+
+        assert warm_trip_searches() == 1
+
+        trips, age = search.search_trips(backend, "chisinau", "balti")
+        assert (trips, age) == ([raw_trip], 0)
+        backend.list_trips.assert_called_once_with("Chisinau", "Balti")
+
+    def test_warm_skips_failing_pairs(self, mocker):
+        backend = mocker.patch("tickets.core.tasks.get_depot_backend").return_value
+        backend.list_trips.side_effect = DepotServiceError("GET", "search", None)
+        search.record_search("Chisinau", "Balti")
+
+        assert warm_trip_searches() == 0
+
+
+@pytest.mark.django_db
+class TestTripListCacheHeaders:
+    def test_miss_then_hit(self, api_client, backend):
+        url = reverse("tickets-depot:trip-list")
+        params = {"origin": "Chisinau", "destination": "Balti"}
+
+        first = api_client.get(url, params)
+        second = api_client.get(url, params)
+
+        assert first.status_code == second.status_code == status.HTTP_200_OK
+        assert (first["X-Cache"], first["Age"]) == ("MISS", "0")
+        assert second["X-Cache"] == "HIT"
+        assert second.data == first.data
+        backend.list_trips.assert_called_once()
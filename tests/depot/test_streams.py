@@ -0,0 +1,186 @@
+import itertools
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from tickets.core.models import Ticket
+from tickets.core.seat_map import (
+    invalidate_seat_map,
+    mark_seat_released,
+    mark_seat_taken,
+)
+from tickets.depot.streams import aseat_events, seat_events
+
+
+def parse(frame: str) -> dict:
+    fields = dict(
+        line.split(": ", 1) for line in frame.strip().splitlines() if ": " in line
+    )
+    if "data" in fields:
+        fields["data"] = json.loads(fields["data"])
+    return fields
+
+
+@pytest.fixture
+def stream_settings(settings):
+    settings.SEAT_STREAM_POLL_INTERVAL = 1
+    settings.SEAT_STREAM_HEARTBEAT = 3
+    settings.SEAT_STREAM_MAX_AGE = 10
+    settings.SEAT_STREAM_RETRY = 1000
+    return settings
+
+
+@pytest.fixture
+def clock():
+    ticks = itertools.count()
+    return lambda: next(ticks)
+
+
+def collect(events, count: int | None = None) -> list[str]:
+    async def run():
+        frames = []
+        async for frame in events:
+            frames.append(frame)
+            if len(frames) == count:
+                break
+        return frames
+
+    return async_to_sync(run)()
+
+
+async def no_sleep(_seconds):
+    pass
+
+
+@pytest.mark.django_db
+class TestSeatEvents:
+    def test_sends_one_batch_and_ends(self, stream_settings):
+        frames = list(seat_events(1, 5))
+
+        assert frames[0] == "retry: 1000\n\n"
+        snapshot = parse(frames[1])
+        assert snapshot["event"] == "snapshot"
+        assert snapshot["data"]["seats"] == {str(s): "available" for s in range(1, 6)}
+        assert len(frames) == 2
+
+    def test_resume_sends_only_missed_seats(self, stream_settings):
+        version = Ticket.objects.seat_map(1, 5).version
+        mark_seat_taken(1, 2)
+        mark_seat_taken(1, 3)
+        mark_seat_released(1, 2)
+
+        _retry, resumed = seat_events(1, 5, version)
+
+        resumed = parse(resumed)
+        assert resumed["event"] == "seats"
+        assert resumed["data"]["seats"] == {"2": "available", "3": "reserved"}
+
+    def test_resume_across_gap_sends_snapshot(self, stream_settings):
+        _retry, frame = seat_events(1, 5, 999)
+
+        assert parse(frame)["event"] == "snapshot"
+
+    def test_up_to_date_resume_sends_nothing(self, stream_settings):
+        version = Ticket.objects.seat_map(1, 5).version
+
+        assert list(seat_events(1, 5, version)) == ["retry: 1000\n\n"]
+
+
+@pytest.mark.django_db
+class TestAsyncSeatEvents:
+    def test_snapshot_then_changed_seats(self, stream_settings, clock):
+        actions = iter([lambda: mark_seat_taken(1, 4), lambda: None])
+
+        async def sleep(_seconds):
+            next(actions)()
+
+        frames = collect(aseat_events(1, 5, sleep=sleep, clock=clock), count=3)
+
+        assert frames[0] == "retry: 1000\n\n"
+        snapshot = parse(frames[1])
+        assert snapshot["event"] == "snapshot"
+        assert snapshot["data"]["seats"] == {str(s): "available" for s in range(1, 6)}
+
+        update = parse(frames[2])
+        assert update["event"] == "seats"
+        assert update["data"]["seats"] == {"4": "reserved"}
+        assert int(update["id"]) == update["data"]["version"]
+
+    def test_heartbeat_when_idle(self, stream_settings, clock):
+        frames = collect(aseat_events(1, 5, sleep=no_sleep, clock=clock))
+
+        assert ": heartbeat\n\n" in frames
+        assert not any("event: seats" in frame for frame in frames)
+
+    def test_resume_sends_only_missed_seats(self, stream_settings, clock):
+        version = Ticket.objects.seat_map(1, 5).version
+        mark_seat_taken(1, 3)
+
+        events = aseat_events(1, 5, version, sleep=no_sleep, clock=clock)
+        _retry, resumed = collect(events, count=2)
+
+        assert parse(resumed)["data"]["seats"] == {"3": "reserved"}
+
+    def test_reloads_an_invalidated_map(
+        self, stream_settings, clock, ticket_factory, trip
+    ):
+        Ticket.objects.seat_map(trip["id"], 5)
+        ticket_factory(seat_number=2)
+
+        async def sleep(_seconds):
+            invalidate_seat_map(trip["id"])
+
+        events = aseat_events(trip["id"], 5, sleep=sleep, clock=clock)
+        *_opening, update = collect(events, count=3)
+
+        assert parse(update)["data"]["seats"] == {"2": "reserved"}
+
+
+@pytest.mark.django_db
+class TestSeatStreamView:
+    def test_streams_event_source(self, mocker, api_client, stream_settings):
+        stream_settings.SEAT_STREAM_MAX_AGE = 0
+        backend = MagicMock()
+        backend.get_seat_info.return_value = {
+            "trip_info": {},
+            "seats": {"1": "available", "2": "available"},
+            "version": 1,
+        }
+        mocker.patch("tickets.depot.views.get_depot_backend", return_value=backend)
+        url = reverse("tickets-depot:trip-seats-stream", kwargs={"pk": 1})
+
+        response = api_client.get(url, HTTP_ACCEPT="text/event-stream")
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+        body = b"".join(response.streaming_content).decode()
+        assert "event: snapshot" in body
+
+    def test_asgi_streams_asynchronously(self, mocker, stream_settings):
+        stream_settings.SEAT_STREAM_MAX_AGE = 0
+        backend = MagicMock()
+        backend.get_seat_info.return_value = {"trip_info": {}, "seats": {"1": "x"}}
+        mocker.patch("tickets.depot.views.get_depot_backend", return_value=backend)
+        url = reverse("tickets-depot:trip-seats-stream", kwargs={"pk": 1})
+
+        async def stream():
+            response = await AsyncClient().get(url, HTTP_ACCEPT="text/event-stream")
+            assert response.is_async
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        assert b"event: snapshot" in async_to_sync(stream)()
+
+    def test_unknown_trip(self, mocker, api_client):
+        backend = MagicMock()
+        backend.get_seat_info.return_value = None
+        mocker.patch("tickets.depot.views.get_depot_backend", return_value=backend)
+        url = reverse("tickets-depot:trip-seats-stream", kwargs={"pk": 1})
+
+        response = api_client.get(url, HTTP_ACCEPT="text/event-stream")
+
+        assert response.status_code == 404
+        assert b"event: error" in response.content
@@ -0,0 +1,52 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from tickets.core.models import Ticket
+
+
+@pytest.mark.django_db
+class TestCancelTripTickets:
+    @pytest.fixture
+    def queue_refunds(self, mocker):
+        return mocker.patch("tickets.core.tasks.queue_refunds")
+
+    def test_cancels_active_tickets_with_one_update(
+        self,
+        api_client,
+        reserved_ticket,
+        paid_ticket,
+        ticket_factory,
+        queue_refunds,
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+    ):
+        used = ticket_factory(seat_number=9, status=Ticket.Status.USED)
+        url = reverse("tickets-depot:trip-cancel-tickets", kwargs={"pk": 1})
+
+        with (
+            django_capture_on_commit_callbacks(execute=True),
+            django_assert_num_queries(1),
+        ):
+            response = api_client.post(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert sorted(item["id"] for item in response.data["cancelled"]) == sorted(
+            [reserved_ticket.id, paid_ticket.id]
+        )
+        assert {item["status"] for item in response.data["cancelled"]} == {
+            Ticket.Status.CANCELLED
+        }
+        assert response.data["failed"] == []
+
+        used.refresh_from_db()
+        assert used.status == Ticket.Status.USED
+        queue_refunds.assert_called_once_with(["INV-EXISTING"])
+
+    def test_no_active_tickets(self, api_client, queue_refunds):
+        url = reverse("tickets-depot:trip-cancel-tickets", kwargs={"pk": 1})
+        response = api_client.post(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"cancelled": [], "failed": []}
+        queue_refunds.assert_not_called()
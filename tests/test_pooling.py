@@ -0,0 +1,114 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from requests.adapters import HTTPAdapter
+
+from tickets.depot.backends.base import get_depot_backend
+from tickets.pooling import BackendRegistry, registry
+from tickets.treasury.backends.base import get_treasury_backend
+
+User = get_user_model()
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+class TestBackendRegistry:
+    def test_builds_once_per_name(self):
+        registry = BackendRegistry()
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return object()
+
+        first = registry.get("depot", factory)
+
+        assert registry.get("depot", factory) is first
+        assert len(calls) == 1
+
+        registry.reset("depot")
+        assert registry.get("depot", factory) is not first
+
+    def test_forked_child_starts_empty(self):
+        registry = BackendRegistry()
+        registry.get("depot", object)
+
+        registry._after_fork()
+
+        assert registry.stats() == {}
+
+
+class TestPooledBackends:
+    def test_depot_backend_is_shared(self):
+        assert get_depot_backend() is get_depot_backend()
+
+    def test_settings_override_rebuilds_backend(self, settings):
+        before = get_treasury_backend()
+
+        settings.TREASURY = {
+            **settings.TREASURY,
+            "options": {"base_url": "http://treasury.fake", "pool_maxsize": 3},
+        }
+        after = get_treasury_backend()
+
+        assert after is not before
+        adapter = after.client.get_adapter("http://treasury.fake")
+        assert isinstance(adapter, HTTPAdapter)
+        assert adapter._pool_maxsize == 3
+
+    def test_keep_alive_reuses_one_connection(self, settings, http_server):
+        settings.DEPOT = {
+            "backend": "tickets.depot.backends.service.DepotServiceBackend",
+            "options": {"base_url": http_server, "timeout": 5},
+        }
+
+        for _ in range(5):
+            get_depot_backend().client.get("trips")
+
+        [pool] = registry.stats()["depot"]
+        assert pool["requests"] == 5
+        assert pool["connections_opened"] == 1
+
+
+@pytest.mark.django_db
+class TestBackendPoolStatsView:
+    def test_admin_sees_pool_counters(self, api_client):
+        admin = User.objects.create_superuser(username="admin", password="pass")
+        api_client.force_authenticate(user=admin)
+        get_depot_backend()
+
+        response = api_client.get(reverse("debug:backend-pools"))
+
+        assert response.status_code == 200
+        assert "depot" in response.data
+
+    def test_requires_admin(self, auth_client):
+        response = auth_client.get(reverse("debug:backend-pools"))
+
+        assert response.status_code == 403
@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+def load_settings(**env):
+    environ = {k: v for k, v in os.environ.items() if k not in ("CACHE_URL", "DEBUG")}
+    return subprocess.run(
+        [sys.executable, "-c", "import tickets.settings as s; print(s.CACHES)"],
+        env={**environ, **env},
+        capture_output=True,
+        text=True,
+    )
+
+
+class TestSeatMapCache:
+    @pytest.mark.parametrize("cache_url", [None, "locmemcache://", "dummycache://"])
+    def test_process_local_cache_is_refused_in_production(self, cache_url):
+        env = {"DEBUG": "False"} | ({"CACHE_URL": cache_url} if cache_url else {})
+
+        result = load_settings(**env)
+
+        assert result.returncode != 0
+        assert "CACHE_URL" in result.stderr
+
+    def test_shared_cache_is_accepted(self):
+        result = load_settings(DEBUG="False", CACHE_URL="redis://cache:6379/1")
+
+        assert result.returncode == 0, result.stderr
+        assert "RedisCache" in result.stdout
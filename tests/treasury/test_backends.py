@@ -1,10 +1,12 @@
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 from django.core.exceptions import ImproperlyConfigured
 
-from tickets.treasury.backends.base import get_treasury_backend
+from tickets.treasury.backends.base import BaseBackend, get_treasury_backend
 from tickets.treasury.backends.service import TreasuryClient, TreasuryServiceBackend
 from tickets.treasury.exceptions import TreasuryServiceError
 
@@ -131,3 +133,120 @@ class TestTreasuryServiceBackendPayments:
 
         backend._request.assert_called_once_with("post", "api/refund", json=data)
         assert result == {"refunded": True}
+
+    def test_pay_ticket_sends_idempotency_key(self, monkeypatch):
+        backend = TreasuryServiceBackend(client=MagicMock())
+        monkeypatch.setattr(
+            "tickets.treasury.backends.service.TicketFormatterDict",
+            lambda u, t, tr: MagicMock(to_dict=dict),
+        )
+        backend._request = MagicMock(return_value={"invoice": 123})
+
+        backend.pay_ticket({}, {}, {}, idempotency_key="ticket-7")
+
+        backend._request.assert_called_once_with(
+            "post",
+            "api/invoices",
+            json={},
+            headers={"Idempotency-Key": "ticket-7"},
+        )
+
+
+def json_response(data, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = data
+    if status_code >= 400:
+        error = requests.HTTPError(f"{status_code}")
+        error.response = response
+        response.raise_for_status.side_effect = error
+    return response
+
+
+class TestTreasuryServiceBackendRefundTickets:
+    invoices = [{"invoice_id": "INV-1"}, {"invoice_id": "INV-2"}]
+
+    def test_uses_bulk_endpoint(self):
+        client = MagicMock()
+        client.request.return_value = json_response(
+            [
+                {"invoice_id": "INV-1", "refund_id": "REF-1"},
+                {"invoice_id": "INV-2", "error": "already refunded"},
+            ]
+        )
+        backend = TreasuryServiceBackend(client, bulk_refund_path="api/refunds/bulk")
+
+        results = backend.refund_tickets(self.invoices)
+
+        assert results["INV-1"] == {"invoice_id": "INV-1", "refund_id": "REF-1"}
+        assert isinstance(results["INV-2"], TreasuryServiceError)
+        client.request.assert_called_once_with(
+            "post", "api/refunds/bulk", json={"refunds": self.invoices}
+        )
+
+    def test_missing_bulk_endpoint_falls_back_to_fan_out(self):
+        client = MagicMock()
+        client.request.side_effect = lambda method, path, json: (
+            json_response(None, 404)
+            if path == "api/refunds/bulk"
+            else json_response({"refund_id": f"REF-{json['invoice_id'][-1]}"})
+        )
+        backend = TreasuryServiceBackend(client, bulk_refund_path="api/refunds/bulk")
+
+        results = backend.refund_tickets(self.invoices)
+
+        assert results == {
+            "INV-1": {"refund_id": "REF-1"},
+            "INV-2": {"refund_id": "REF-2"},
+        }
+        assert backend.bulk_refund_path is None
+
+    def test_fan_out_reports_failures_per_invoice(self):
+        client = MagicMock()
+        client.request.side_effect = lambda method, path, json: (
+            json_response(None, 500)
+            if json["invoice_id"] == "INV-2"
+            else json_response({"refund_id": "REF-1"})
+        )
+        backend = TreasuryServiceBackend(client)
+
+        results = backend.refund_tickets(self.invoices)
+
+        assert results["INV-1"] == {"refund_id": "REF-1"}
+        assert isinstance(results["INV-2"], TreasuryServiceError)
+
+    def test_fan_out_is_bounded(self):
+        running = peak = 0
+        lock = threading.Lock()
+
+        def request(method, path, json):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            return json_response({"refund_id": f"REF-{json['invoice_id']}"})
+
+        client = MagicMock()
+        client.request.side_effect = request
+        backend = TreasuryServiceBackend(client, max_workers=3)
+
+        results = backend.refund_tickets(
+            {"invoice_id": f"INV-{index}"} for index in range(12)
+        )
+
+        assert len(results) == 12
+        assert peak <= 3
+
+    def test_base_backend_refunds_one_by_one(self):
+        backend = BaseBackend()
+        backend.refund_ticket = MagicMock(
+            side_effect=[{"refund_id": "REF-1"}, TreasuryServiceError("POST", "x")]
+        )
+
+        results = backend.refund_tickets(self.invoices)
+
+        assert results["INV-1"] == {"refund_id": "REF-1"}
+        assert isinstance(results["INV-2"], TreasuryServiceError)
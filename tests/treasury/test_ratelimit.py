@@ -0,0 +1,115 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+
+from tickets.treasury.backends.base import get_treasury_backend
+from tickets.treasury.backends.client import TreasuryClient
+from tickets.treasury.backends.ratelimit import RateLimitedError, TreasuryRateLimiter
+from tickets.treasury.backends.service import TreasuryServiceBackend
+from tickets.treasury.exceptions import TreasuryServiceError
+
+
+@pytest.fixture
+def sleep():
+    return MagicMock()
+
+
+@pytest.fixture
+def limiter(sleep):
+    limiter = TreasuryRateLimiter(
+        "redis://limits:6379/2", rate=5, burst=2, max_wait=1, sleep=sleep
+    )
+    limiter.script = MagicMock(return_value=[0, 0])
+    return limiter
+
+
+class TestTreasuryRateLimiter:
+    def test_token_available_goes_straight_through(self, limiter, sleep):
+        assert limiter.acquire() == 0
+
+        sleep.assert_not_called()
+        limiter.script.assert_called_once_with(
+            keys=["treasury:rate-limit"], args=[5, 2, 1000]
+        )
+        assert limiter.stats["immediate"] == 1
+
+    def test_empty_bucket_queues_for_its_turn(self, limiter, sleep):
+        limiter.script.return_value = [400, 3]
+
+        assert limiter.acquire() == 0.4
+
+        sleep.assert_called_once_with(0.4)
+        assert limiter.depth == 3
+        assert limiter.stats["queued"] == 1
+
+    def test_turn_past_the_deadline_is_refused(self, limiter, sleep):
+        limiter.script.return_value = [-1, 7]
+
+        with pytest.raises(RateLimitedError, match="7 call"):
+            limiter.acquire()
+
+        sleep.assert_not_called()
+        assert limiter.stats["rejected"] == 1
+
+    def test_caller_can_pass_its_own_deadline(self, limiter):
+        limiter.acquire(max_wait=0.25)
+
+        assert limiter.script.call_args.kwargs["args"] == [5, 2, 250]
+
+    def test_redis_outage_does_not_block_calls(self, limiter, sleep):
+        limiter.script.side_effect = redis.ConnectionError("down")
+
+        assert limiter.acquire() == 0
+        assert limiter.stats["unlimited"] == 1
+
+
+class TestRateLimitedClient:
+    def test_request_waits_for_a_token_before_sending(self, limiter):
+        client = TreasuryClient(base_url="http://treasury.fake/")
+        client.rate_limiter = limiter
+
+        with patch("requests.Session.request") as send:
+            client.request("post", "api/refund")
+
+        limiter.script.assert_called_once()
+        send.assert_called_once()
+
+    def test_refusal_surfaces_as_service_error_without_a_request(self, limiter):
+        limiter.script.return_value = [-1, 12]
+        client = TreasuryClient(base_url="http://treasury.fake/")
+        client.rate_limiter = limiter
+        backend = TreasuryServiceBackend(client=client)
+
+        with (
+            patch("requests.Session.request") as send,
+            pytest.raises(TreasuryServiceError) as error,
+        ):
+            backend.refund_ticket({"invoice_id": "INV-1"})
+
+        send.assert_not_called()
+        assert isinstance(error.value.original, RateLimitedError)
+
+    def test_backend_is_built_with_the_configured_limiter(self, settings):
+        settings.TREASURY = {
+            "backend": "tickets.treasury.backends.service.TreasuryServiceBackend",
+            "options": {"base_url": "http://treasury.fake/"},
+            "rate_limit": {
+                "redis_url": "redis://limits:6379/2",
+                "rate": 20,
+                "burst": 5,
+            },
+        }
+
+        limiter = get_treasury_backend().client.rate_limiter
+
+        assert isinstance(limiter, TreasuryRateLimiter)
+        assert (limiter.rate, limiter.burst, limiter.max_wait) == (20, 5, 5)
+
+    def test_no_limiter_by_default(self, settings):
+        settings.TREASURY = {
+            "backend": "tickets.treasury.backends.service.TreasuryServiceBackend",
+            "options": {"base_url": "http://treasury.fake/"},
+        }
+
+        assert get_treasury_backend().client.rate_limiter is None
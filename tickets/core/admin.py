@@ -1 +1,37 @@
-# Register your models here.
+from django.contrib import admin, messages
+from unfold.admin import ModelAdmin
+
+from .models import Ticket
+
+
+@admin.register(Ticket)
+class TicketAdmin(ModelAdmin):
+    list_display = ("id", "trip_id", "seat_number", "status", "user", "created_at")
+    list_filter = ("status",)
+    search_fields = ("id", "invoice_id", "refund_id", "user__username")
+    readonly_fields = ("status", "invoice_id", "refund_id", "can_cancel", "can_confirm")
+    actions = ("cancel_tickets", "mark_tickets_used", "expire_tickets")
+
+    def transition(self, request, queryset, name: str, verb: str) -> None:
+        selected = queryset.count()
+        moved = len(getattr(queryset, name)())
+        self.message_user(request, f"{moved} ticket(s) {verb}.")
+
+        if moved < selected:
+            self.message_user(
+                request,
+                f"{selected - moved} ticket(s) skipped, their status does not allow it.",
+                level=messages.WARNING,
+            )
+
+    @admin.action(description="Cancel selected tickets")
+    def cancel_tickets(self, request, queryset):
+        self.transition(request, queryset, "cancel", "cancelled")
+
+    @admin.action(description="Mark selected tickets as used")
+    def mark_tickets_used(self, request, queryset):
+        self.transition(request, queryset, "use", "marked as used")
+
+    @admin.action(description="Expire selected reservations")
+    def expire_tickets(self, request, queryset):
+        self.transition(request, queryset, "expire", "expired")
@@ -6,6 +6,12 @@ class SeatAlreadyTakenError(TicketError):
     pass
 
 
+class SeatsAlreadyTakenError(SeatAlreadyTakenError):
+    def __init__(self, seats: list[int]):
+        self.seats = seats
+        super().__init__(f"Seats already taken: {', '.join(map(str, seats))}.")
+
+
 class TicketNotFoundError(TicketError):
     pass
 
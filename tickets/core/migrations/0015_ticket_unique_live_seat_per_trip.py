@@ -0,0 +1,66 @@
+# Generated by Django 5.2.3 on 2025-09-15 10:12
+
+from django.db import migrations, models
+from django.utils import timezone
+
+LIVE_STATUSES = ["reserved", "paid", "used"]
+# Which live ticket keeps a seat held twice: a sold one, then the oldest.
+STATUS_RANK = {"used": 0, "paid": 1, "reserved": 2}
+
+
+def expire_duplicate_reservations(apps, schema_editor):
+    """Expire the reservations that share a live seat with another ticket.
+
+    Before the constraint a lapsed-but-unswept reservation, or a paid ticket
+    whose ``reserved_until`` had passed, could be booked over. Only
+    reservations are moved; two sold tickets for one seat need a human.
+    """
+    Ticket = apps.get_model("core", "Ticket")
+    live = Ticket.objects.filter(status__in=LIVE_STATUSES)
+
+    duplicates = (
+        live.values("trip_id", "seat_number")
+        .annotate(tickets=models.Count("id"))
+        .filter(tickets__gt=1, seat_number__isnull=False)
+    )
+
+    expired = []
+    for seat in duplicates:
+        tickets = sorted(
+            live.filter(trip_id=seat["trip_id"], seat_number=seat["seat_number"]),
+            key=lambda ticket: (STATUS_RANK[ticket.status], ticket.created_at),
+        )
+        keeper, *rest = tickets
+        sold = [ticket.pk for ticket in rest if ticket.status != "reserved"]
+
+        if sold:
+            raise RuntimeError(
+                f"Seat {seat['seat_number']} of trip {seat['trip_id']} is sold "
+                f"to tickets {[keeper.pk, *sold]}; resolve them before migrating."
+            )
+
+        expired.extend(ticket.pk for ticket in rest)
+
+    if expired:
+        Ticket.objects.filter(pk__in=expired).update(
+            status="expired", updated_at=timezone.now()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_ticket_can_cancel_ticket_can_confirm"),
+    ]
+
+    operations = [
+        migrations.RunPython(expire_duplicate_reservations, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status__in", ["reserved", "paid", "used"])),
+                fields=("trip_id", "seat_number"),
+                name="unique_live_seat_per_trip",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.3 on 2025-09-16 09:41
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # The ticket table is live; build the indexes without blocking writes.
+    atomic = False
+
+    dependencies = [
+        ("core", "0015_ticket_unique_live_seat_per_trip"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="ticket",
+            index=models.Index(
+                fields=["trip_id", "status"], name="ticket_trip_status_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ticket",
+            index=models.Index(
+                fields=["status", "created_at"], name="ticket_status_created_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ticket",
+            index=models.Index(
+                condition=models.Q(("status", "reserved")),
+                fields=["reserved_until"],
+                name="ticket_pending_expiry_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2025-09-18 11:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # The ticket table is live; build the indexes without blocking writes.
+    atomic = False
+
+    dependencies = [
+        ("core", "0016_ticket_query_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="ticket",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"], name="ticket_user_keyset_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ticket",
+            index=models.Index(fields=["-created_at", "-id"], name="ticket_keyset_idx"),
+        ),
+        # ticket_user_keyset_idx leads with user, so the FK index can go, but
+        # only once the replacement exists.
+        migrations.AlterField(
+            model_name="ticket",
+            name="user",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tickets",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2025-09-30 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0018_payment_outbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="hold_id",
+            field=models.CharField(blank=True, max_length=32, null=True, unique=True),
+        ),
+    ]
@@ -1,43 +1,127 @@
-from datetime import timedelta
+from collections.abc import Sequence
+from datetime import datetime, timedelta
 
 from django.contrib.auth import get_user_model
 from django.core.validators import MinLengthValidator, MinValueValidator
-from django.db import models, transaction
-from django.db.models import QuerySet
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import Case, Count, QuerySet, Value, When, sql
+from django.db.models.fields.tuple_lookups import (
+    Tuple,
+    TupleGreaterThan,
+    TupleLessThan,
+)
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import ValidationError
 
-from tickets.core.exceptions import SeatAlreadyTakenError
+from tickets.core import seat_holds
+from tickets.core.exceptions import SeatAlreadyTakenError, SeatsAlreadyTakenError
+from tickets.core.seat_map import (
+    SeatMap,
+    get_seat_map,
+    invalidate_seat_map,
+    load_seat_map,
+    mark_seat_released,
+    mark_seat_taken,
+)
 
 User = get_user_model()
 
+LIVE_SEAT_CONSTRAINT = "unique_live_seat_per_trip"
+KEYSET_ORDERING = ("-created_at", "-id")
+
+# Allowed ticket state changes: target status -> statuses it may come from.
+TRANSITIONS = {
+    "paid": ("reserved",),
+    "cancelled": ("reserved", "paid"),
+    "used": ("paid",),
+    "expired": ("reserved",),
+}
+TRANSITION_FIELDS = (
+    "id",
+    "status",
+    "trip_id",
+    "seat_number",
+    "invoice_id",
+    "hold_id",
+    "updated_at",
+    "can_cancel",
+    "can_confirm",
+)
+
+
+def seat_hold(seat: int, status: str, reserved_until) -> tuple[int, datetime | None]:
+    # Only a pending reservation frees its seat on its own.
+    return seat, reserved_until if status == "reserved" else None
+
 
 def default_reserved_until():
     return timezone.now() + timedelta(minutes=15)
 
 
+def is_seat_conflict(error: IntegrityError) -> bool:
+    diag = getattr(error.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None) == LIVE_SEAT_CONSTRAINT
+
+
 class TicketQuerySet(models.QuerySet):
-    def annotate_is_expired(self):
-        return self.annotate(
-            is_expired=models.Case(
-                models.When(reserved_until__lt=timezone.now(), then=models.Value(True)),
-                default=models.Value(False),
-                output_field=models.BooleanField(),
-            )
+    def update_returning(self, fields: Sequence[str], **values) -> list[tuple]:
+        """Same as ``update(**values)`` but returns ``fields`` of the updated
+        rows from the single ``UPDATE ... RETURNING`` statement."""
+        query = self.query.chain(sql.UpdateQuery)
+        query.add_update_values(values)
+        query.annotations = {}
+
+        compiler = query.get_compiler(self.db)
+        compiler.pre_sql_setup()
+        statement, params = compiler.as_sql()
+
+        connection = connections[self.db]
+        columns = ", ".join(
+            connection.ops.quote_name(self.model._meta.get_field(field).column)
+            for field in fields
         )
 
-    def taken_seats(self, trip_id: int) -> list[int]:
-        return list(
-            self.filter(trip_id=trip_id, is_expired=False)
+        with (
+            transaction.mark_for_rollback_on_error(using=self.db),
+            connection.cursor() as cursor,
+        ):
+            cursor.execute(f"{statement} RETURNING {columns}", params)
+            return cursor.fetchall()
+
+    def holding_seats(self) -> QuerySet:
+        return self.filter(status__in=["reserved", "paid", "used"])
+
+    def _taken_seat_numbers(self, trip_id: int) -> QuerySet:
+        return (
+            self.holding_seats()
+            .filter(trip_id=trip_id)
             .values_list("seat_number", flat=True)
             .order_by("seat_number")
         )
 
+    def _seat_hold_rows(self, trip_id: int) -> QuerySet:
+        return (
+            self.holding_seats()
+            .filter(trip_id=trip_id, seat_number__isnull=False)
+            .values_list("seat_number", "status", "reserved_until")
+        )
+
+    def taken_seats(self, trip_id: int) -> list[int]:
+        return list(self._taken_seat_numbers(trip_id))
+
+    async def ataken_seats(self, trip_id: int) -> list[int]:
+        return [seat async for seat in self._taken_seat_numbers(trip_id)]
+
+    def seat_holds(self, trip_id: int) -> list[tuple[int, datetime | None]]:
+        return [seat_hold(*row) for row in self._seat_hold_rows(trip_id)]
+
     def is_seat_taken(self, trip_id: int, seat_number: int) -> bool:
-        return self.filter(
-            trip_id=trip_id, seat_number=seat_number, is_expired=False
-        ).exists()
+        return (
+            self.holding_seats()
+            .filter(trip_id=trip_id, seat_number=seat_number)
+            .exists()
+        )
 
     def currently_active(self) -> QuerySet:
         return self.filter(status__in=["paid", "reserved"])
@@ -58,6 +142,12 @@ class TicketQuerySet(models.QuerySet):
     def paid(self) -> QuerySet:
         return self.filter(status=Ticket.Status.PAID)
 
+    def stale_reservations(self, now=None) -> QuerySet:
+        return self.filter(
+            status=Ticket.Status.RESERVED,
+            reserved_until__lt=now or timezone.now(),
+        )
+
     def within_date_range(self, start_date=None, end_date=None) -> QuerySet:
         queryset = self
 
@@ -69,15 +159,127 @@ class TicketQuerySet(models.QuerySet):
 
         return queryset
 
+    def newest_first(self) -> QuerySet:
+        return self.order_by(*KEYSET_ORDERING)
+
+    def oldest_first(self) -> QuerySet:
+        return self.order_by(*(field.lstrip("-") for field in KEYSET_ORDERING))
+
+    def older_than(self, created_at: datetime, pk: int) -> QuerySet:
+        """Tickets that come after (created_at, pk) in newest-first order."""
+        return self.filter(TupleLessThan(Tuple("created_at", "id"), (created_at, pk)))
+
+    def newer_than(self, created_at: datetime, pk: int) -> QuerySet:
+        """Tickets that come before (created_at, pk) in newest-first order."""
+        return self.filter(
+            TupleGreaterThan(Tuple("created_at", "id"), (created_at, pk))
+        )
+
+    def popular_routes(self, since: datetime, limit: int) -> list[tuple[str, str]]:
+        """Most booked (origin, destination) pairs since ``since``."""
+        rows = (
+            self.filter(created_at__gte=since)
+            .exclude(origin="")
+            .exclude(destination="")
+            .values_list("origin", "destination")
+            .annotate(bookings=Count("id"))
+            .order_by("-bookings")[:limit]
+        )
+        return [(origin, destination) for origin, destination, _bookings in rows]
+
+    def transition(self, status: str, **values) -> list[dict]:
+        """Move the tickets allowed to reach ``status`` there.
+
+        One conditional ``UPDATE ... RETURNING`` writes only ``status``,
+        ``updated_at`` and ``values``; tickets in any other state are left
+        alone. Returns ``TRANSITION_FIELDS`` of the moved rows, so an empty
+        list means the transition did not apply.
+        """
+        rows = self.filter(status__in=TRANSITIONS[status]).update_returning(
+            TRANSITION_FIELDS, status=status, updated_at=timezone.now(), **values
+        )
+        return [dict(zip(TRANSITION_FIELDS, row, strict=True)) for row in rows]
+
+    def confirm(self, invoice_id) -> list[dict]:
+        """reserved -> paid. ``invoice_id`` may be an expression for batches."""
+        rows = self.transition(Ticket.Status.PAID, invoice_id=invoice_id)
+
+        def mark_seats_taken():
+            for row in rows:
+                mark_seat_taken(row["trip_id"], row["seat_number"])
+
+        if rows:
+            transaction.on_commit(mark_seats_taken, using=self.db)
+        return rows
+
+    def cancel(self) -> list[dict]:
+        """reserved/paid -> cancelled. Refunds are the caller's decision."""
+        rows = self.transition(Ticket.Status.CANCELLED)
+        self._release_seats(rows)
+        return rows
+
+    def use(self) -> list[dict]:
+        """paid -> used; the seat stays taken."""
+        return self.transition(Ticket.Status.USED)
+
+    def expire(self) -> list[dict]:
+        """reserved -> expired."""
+        rows = self.transition(Ticket.Status.EXPIRED)
+        self._release_seats(rows)
+        return rows
+
+    def _release_seats(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+
+        seats: dict[int, list[int]] = {}
+        for row in rows:
+            seats.setdefault(row["trip_id"], []).append(row["seat_number"])
+
+        holds = [
+            (row["trip_id"], row["seat_number"], row["hold_id"])
+            for row in rows
+            if row["hold_id"]
+        ]
+
+        def release():
+            for trip_id, seat_numbers in seats.items():
+                # Patching many bits costs more than rebuilding the map once.
+                if len(seat_numbers) > 1:
+                    invalidate_seat_map(trip_id)
+                else:
+                    mark_seat_released(trip_id, seat_numbers[0])
+
+            seat_holds.release_claims(holds)
+
+        transaction.on_commit(release, using=self.db)
+
 
 class TicketManager(models.Manager):
     def get_queryset(self):
-        return TicketQuerySet(self.model, using=self._db).annotate_is_expired()
+        return TicketQuerySet(self.model, using=self._db)
 
-    def taken_seats(self, trip_id: int) -> set[int]:
+    def taken_seats(self, trip_id: int) -> list[int]:
         return self.get_queryset().taken_seats(trip_id)
 
-    def is_seat_taken(self, trip_id: int, seat_number: int) -> list[int]:
+    def seat_holds(self, trip_id: int) -> list[tuple[int, datetime | None]]:
+        return self.get_queryset().seat_holds(trip_id)
+
+    async def ataken_seats(self, trip_id: int) -> list[int]:
+        return await self.get_queryset().ataken_seats(trip_id)
+
+    def popular_routes(self, since: datetime, limit: int) -> list[tuple[str, str]]:
+        return self.get_queryset().popular_routes(since, limit)
+
+    def seat_map(self, trip_id: int, capacity: int) -> SeatMap:
+        return load_seat_map(trip_id, capacity, self.seat_holds)
+
+    def is_seat_taken(self, trip_id: int, seat_number: int) -> bool:
+        cached = get_seat_map(trip_id)
+
+        if cached is not None:
+            return cached.is_taken(seat_number)
+
         return self.get_queryset().is_seat_taken(trip_id, seat_number)
 
     def invoice_exists(self, invoice_id: str) -> bool:
@@ -100,43 +302,316 @@ class TicketManager(models.Manager):
     def active_for_trip(self, trip_id) -> TicketQuerySet:
         return self.get_queryset().active_for_trip(trip_id)
 
-    def create_ticket(self, **data):
-        trip_id = data["trip_id"]
-        seat_number = data["seat_number"]
+    def release_stale_seats(self, trip_id: int, seat_numbers: list[int]) -> int:
+        return len(
+            self.get_queryset()
+            .stale_reservations()
+            .filter(trip_id=trip_id, seat_number__in=seat_numbers)
+            .expire()
+        )
+
+    def expire_reservations(self, batch_size: int, max_batches: int) -> int:
+        """Move lapsed reservations to EXPIRED, at most ``batch_size`` rows per
+        transaction, and release their seats. Returns the number of rows moved."""
+        released = 0
+
+        for _batch in range(max_batches):
+            now = timezone.now()
+
+            with transaction.atomic(using=self.db):
+                ids = list(
+                    self.get_queryset()
+                    .stale_reservations(now)
+                    .select_for_update(skip_locked=True)
+                    .order_by("reserved_until")
+                    .values_list("id", flat=True)[:batch_size]
+                )
+
+                if not ids:
+                    break
+
+                self.filter(pk__in=ids).expire()
+
+            released += len(ids)
+
+            if len(ids) < batch_size:
+                break
+
+        return released
+
+    def _insert_reservation(self, ticket) -> None:
+        # Inside an outer transaction a failed INSERT must not poison it, so
+        # guard it with a savepoint; in autocommit the INSERT stands alone.
+        if connections[self.db].in_atomic_block:
+            with transaction.atomic(using=self.db):
+                self._insert_with_outbox(ticket)
+        else:
+            self._insert_with_outbox(ticket)
+
+    def _insert_with_outbox(self, ticket) -> None:
+        """INSERT ``ticket`` and its payment outbox row in one statement.
+
+        The outbox INSERT rides along in a data-modifying CTE, so the
+        reservation stays a single round trip and both rows commit or fail
+        together.
+        """
+        meta = self.model._meta
+        fields = [
+            field
+            for field in meta.local_concrete_fields
+            if not field.generated and field is not meta.auto_field
+        ]
+        returning = [
+            meta.pk,
+            meta.get_field("can_cancel"),
+            meta.get_field("can_confirm"),
+        ]
+
+        query = sql.InsertQuery(self.model)
+        query.insert_values(fields, [ticket])
+        compiler = query.get_compiler(self.db)
+        compiler.returning_fields = returning
+        [(insert, params)] = compiler.as_sql()
+
+        connection = connections[self.db]
+        outbox = PaymentOutbox._meta
+        columns = ", ".join(
+            connection.ops.quote_name(outbox.get_field(name).column)
+            for name in ("ticket", "status", "attempts", "next_attempt_at")
+        )
+        now = timezone.now()
+        statement = (
+            f"WITH reservation AS ({insert}), "
+            f"outbox AS (INSERT INTO {connection.ops.quote_name(outbox.db_table)} "
+            f"({columns}, last_error, created_at) "
+            f"SELECT {connection.ops.quote_name(meta.pk.column)}, %s, 0, %s, '', %s "
+            "FROM reservation) "
+            "SELECT * FROM reservation"
+        )
+
+        with (
+            transaction.mark_for_rollback_on_error(using=self.db),
+            connection.cursor() as cursor,
+        ):
+            cursor.execute(statement, (*params, PaymentOutbox.Status.PENDING, now, now))
+            row = cursor.fetchone()
 
-        if self.model.objects.is_seat_taken(trip_id, seat_number):
-            raise SeatAlreadyTakenError("Seat already taken.")
+        for field, value in zip(returning, row, strict=True):
+            setattr(ticket, field.attname, value)
+        ticket._state.adding = False
+        ticket._state.db = self.db
 
+    def create_ticket(self, **data):
         ticket = self.model(**data)
         ticket.status = ticket.Status.RESERVED
         ticket.reserved_until = timezone.now() + timedelta(minutes=15)
-        ticket.save()
+
+        try:
+            self._insert_reservation(ticket)
+        except IntegrityError as error:
+            if not is_seat_conflict(error):
+                raise
+
+            if not self.release_stale_seats(ticket.trip_id, [ticket.seat_number]):
+                raise SeatAlreadyTakenError("Seat already taken.") from error
+
+            try:
+                self._insert_reservation(ticket)
+            except IntegrityError as retry_error:
+                if not is_seat_conflict(retry_error):
+                    raise
+                raise SeatAlreadyTakenError("Seat already taken.") from retry_error
+
+        transaction.on_commit(
+            lambda: mark_seat_taken(
+                ticket.trip_id, ticket.seat_number, ticket.reserved_until
+            )
+        )
         return ticket
 
-    def cancel_for_trip(self, trip_id):
-        tickets = self.active_for_trip(trip_id)
+    def persist_holds(self, holds: list[dict]) -> list[dict]:
+        """Write Redis seat holds to the table; returns the holds that lost."""
+        now = timezone.now()
+        # An earlier run may have written some before it could acknowledge them.
+        written = set(
+            self.filter(hold_id__in=[hold["hold_id"] for hold in holds]).values_list(
+                "hold_id", flat=True
+            )
+        )
+        live = [
+            hold
+            for hold in holds
+            if hold["reserved_until"] > now and hold["hold_id"] not in written
+        ]
+        tickets = [
+            self.model(
+                hold_id=hold["hold_id"],
+                trip_id=hold["trip_id"],
+                seat_number=hold["seat_number"],
+                user_id=hold["user_id"],
+                price=hold["price"],
+                origin=hold["origin"],
+                destination=hold["destination"],
+                status=Ticket.Status.RESERVED,
+                reserved_until=hold["reserved_until"],
+            )
+            for hold in live
+        ]
+
+        if not tickets or self._retry_bulk_insert(tickets):
+            return []
+
+        rejected = []
+        for ticket, hold in zip(tickets, live, strict=True):
+            try:
+                self._insert_reservation(ticket)
+            except IntegrityError as error:
+                if not is_seat_conflict(error):
+                    raise
+                rejected.append(hold)
+
+        return rejected
+
+    def _bulk_insert_reservations(self, tickets: list) -> None:
+        with transaction.atomic(using=self.db):
+            self.bulk_create(tickets)
+            PaymentOutbox.objects.using(self.db).enqueue(tickets)
+
+    def _retry_bulk_insert(self, tickets: list) -> bool:
+        try:
+            self._bulk_insert_reservations(tickets)
+        except IntegrityError as error:
+            if not is_seat_conflict(error):
+                raise
+            return False
+        return True
+
+    def create_tickets(self, trip_id: int, seat_numbers: list[int], **data):
+        """Reserve several seats of one trip in one INSERT, all or nothing."""
+        reserved_until = timezone.now() + timedelta(minutes=15)
+        tickets = [
+            self.model(
+                **data,
+                trip_id=trip_id,
+                seat_number=seat_number,
+                status=Ticket.Status.RESERVED,
+                reserved_until=reserved_until,
+            )
+            for seat_number in seat_numbers
+        ]
+
+        try:
+            self._bulk_insert_reservations(tickets)
+        except IntegrityError as error:
+            if not is_seat_conflict(error):
+                raise
+
+            if not (
+                self.release_stale_seats(trip_id, seat_numbers)
+                and self._retry_bulk_insert(tickets)
+            ):
+                taken = (
+                    self.get_queryset()
+                    .holding_seats()
+                    .filter(trip_id=trip_id, seat_number__in=seat_numbers)
+                    .values_list("seat_number", flat=True)
+                    .order_by("seat_number")
+                )
+                raise SeatsAlreadyTakenError(list(taken)) from error
+
+        def mark_seats_taken():
+            for ticket in tickets:
+                mark_seat_taken(trip_id, ticket.seat_number, reserved_until)
+
+        transaction.on_commit(mark_seats_taken, using=self.db)
+        return tickets
+
+    def record_refunds(self, refund_ids: dict[str, str]) -> int:
+        """Store refund ids by invoice id in a single UPDATE."""
+        if not refund_ids:
+            return 0
+
+        return self.filter(invoice_id__in=refund_ids).update(
+            refund_id=Case(
+                *(
+                    When(invoice_id=invoice_id, then=Value(refund_id))
+                    for invoice_id, refund_id in refund_ids.items()
+                ),
+                output_field=models.CharField(),
+            ),
+            updated_at=timezone.now(),
+        )
 
-        if not tickets.exists():
-            return {"cancelled": [], "failed": []}
+    def confirm_payments(
+        self, invoices: dict[int, str], **filters
+    ) -> tuple[list[int], list[int]]:
+        """Mark reserved tickets paid, ``invoices`` mapping ticket id to invoice id.
+
+        The happy path is one conditional ``UPDATE ... RETURNING``. The unique
+        ``invoice_id`` constraint rejects reused invoices: the statement then
+        fails as a whole, so the offending tickets are looked up and the rest
+        retried. Returns ``(confirmed, duplicates)`` ticket ids; tickets that
+        are missing, filtered out or not reserved are in neither list.
+        """
+        rows: list[dict] = []
+        duplicates: list[int] = []
+        remaining = dict(invoices)
+
+        while remaining:
+            try:
+                rows = self._confirm_reserved(remaining, **filters)
+            except IntegrityError:
+                taken = set(
+                    self.filter(invoice_id__in=remaining.values()).values_list(
+                        "invoice_id", flat=True
+                    )
+                )
+                if not taken:
+                    raise
+
+                for pk, invoice_id in list(remaining.items()):
+                    if invoice_id in taken:
+                        duplicates.append(pk)
+                        del remaining[pk]
+                continue
+            break
+
+        return [row["id"] for row in rows], duplicates
+
+    def _confirm_reserved(self, invoices: dict[int, str], **filters) -> list[dict]:
+        queryset = self.filter(pk__in=invoices, **filters)
+        invoice_id = Case(
+            *(When(pk=pk, then=Value(invoice)) for pk, invoice in invoices.items()),
+            output_field=models.CharField(),
+        )
+
+        # Same as reservations: a savepoint keeps a duplicate invoice from
+        # poisoning an outer transaction.
+        if connections[self.db].in_atomic_block:
+            with transaction.atomic(using=self.db):
+                return queryset.confirm(invoice_id)
+
+        return queryset.confirm(invoice_id)
 
-        paid_queryset, reserved_queryset, failed_queryset = tickets.group_by_status()
+    def cancel_for_trip(self, trip_id):
+        rows = self.active_for_trip(trip_id).cancel()
+
+        # Only paid tickets carry an invoice, so these are the ones to refund.
+        invoice_ids = [row["invoice_id"] for row in rows if row["invoice_id"]]
 
-        with transaction.atomic():
-            cancelled_queryset = paid_queryset | reserved_queryset
-            cancelled_queryset.update(status=Ticket.Status.CANCELLED)
+        if invoice_ids:
+            from tickets.core.tasks import queue_refunds
 
-        refund_ids = list(paid_queryset.values_list("id", flat=True))
-        cancelled_ids = list(cancelled_queryset.values_list("id", flat=True))
+            transaction.on_commit(lambda: queue_refunds(invoice_ids), using=self.db)
 
         return {
-            "cancelled": list(cancelled_queryset.values("id", "status")),
-            "failed": list(failed_queryset.values("id", "status")),
+            "cancelled": [{"id": row["id"], "status": row["status"]} for row in rows],
+            "failed": [],
         }
 
 
 class Ticket(models.Model):
     objects = TicketManager()
-    is_expired: bool  # annotated from manager
 
     class Status(models.TextChoices):
         RESERVED = "reserved", _("Reserved")
@@ -179,10 +654,17 @@ class Ticket(models.Model):
         default=Status.RESERVED,
     )
     user = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="tickets", null=True, blank=True
+        User,
+        on_delete=models.CASCADE,
+        related_name="tickets",
+        null=True,
+        blank=True,
+        db_index=False,  # covered by ticket_user_keyset_idx
     )
     invoice_id = models.CharField(null=True, blank=True, unique=True, max_length=100)
     refund_id = models.CharField(null=True, blank=True, unique=True, max_length=100)
+    # Redis seat hold the row was written from, see tickets.core.seat_holds.
+    hold_id = models.CharField(null=True, blank=True, unique=True, max_length=32)
     reserved_until = models.DateTimeField(
         default=default_reserved_until, null=True, blank=True
     )
@@ -218,22 +700,107 @@ class Ticket(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Ticket"
         verbose_name_plural = "Tickets"
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-id"], name="ticket_user_keyset_idx"
+            ),
+            models.Index(fields=["trip_id", "status"], name="ticket_trip_status_idx"),
+            models.Index(
+                fields=["status", "created_at"], name="ticket_status_created_idx"
+            ),
+            models.Index(fields=["-created_at", "-id"], name="ticket_keyset_idx"),
+            models.Index(
+                fields=["reserved_until"],
+                condition=models.Q(status="reserved"),
+                name="ticket_pending_expiry_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["trip_id", "seat_number"],
+                condition=models.Q(status__in=["reserved", "paid", "used"]),
+                name=LIVE_SEAT_CONSTRAINT,
+            ),
+        ]
+
+    def _apply(self, rows: list[dict]) -> bool:
+        """Copy a transition's RETURNING row onto this instance, or reload the
+        status it was refused for."""
+        if not rows:
+            self.refresh_from_db(fields=["status"])
+            return False
+
+        for field, value in rows[0].items():
+            setattr(self, field, value)
+        return True
 
     def cancel(self):
-        if not self.can_cancel:
+        if not self._apply(Ticket.objects.filter(pk=self.pk).cancel()):
             raise ValidationError(
                 f"Cannot cancel a ticket with status '{self.status}'."
             )
 
-        self.status = self.Status.CANCELLED
-        self.save()
-
     def confirm(self, invoice_id: str):
-        if not self.can_confirm:
+        if not self._apply(Ticket.objects.filter(pk=self.pk).confirm(invoice_id)):
             raise ValidationError(
                 f"Cannot confirm a ticket with status '{self.status}'."
             )
 
-        self.status = self.Status.PAID
-        self.invoice_id = invoice_id
-        self.save()
+
+class PaymentOutboxQuerySet(models.QuerySet):
+    def due(self, now=None) -> QuerySet:
+        return self.filter(
+            status=PaymentOutbox.Status.PENDING,
+            next_attempt_at__lte=now or timezone.now(),
+        )
+
+    def enqueue(self, tickets: Sequence[Ticket]) -> list["PaymentOutbox"]:
+        return self.bulk_create([self.model(ticket_id=ticket.pk) for ticket in tickets])
+
+
+class PaymentOutbox(models.Model):
+    """Treasury invoice still to be requested for a reservation.
+
+    Rows are written in the reservation's transaction and drained by the
+    ``dispatch_payments`` task, so the treasury never sits on the request
+    path. The ticket id is the idempotency key sent with every attempt.
+    """
+
+    objects = PaymentOutboxQuerySet.as_manager()
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        SENT = "sent", _("Sent")
+        FAILED = "failed", _("Failed")
+        SKIPPED = "skipped", _("Skipped")
+
+    ticket = models.OneToOneField(
+        Ticket, on_delete=models.CASCADE, related_name="payment_outbox"
+    )
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    invoice_id = models.CharField(null=True, blank=True, max_length=100)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Payment outbox entry"
+        verbose_name_plural = "Payment outbox"
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status="pending"),
+                name="payment_outbox_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Payment for ticket {self.ticket_id} ({self.status})"
+
+    @property
+    def idempotency_key(self) -> str:
+        return f"ticket-{self.ticket_id}"
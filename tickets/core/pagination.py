@@ -0,0 +1,156 @@
+import base64
+import json
+from datetime import datetime
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class TicketCursorPagination(BasePagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    Pages are fetched with a row comparison against the last seen position
+    instead of an OFFSET, so deep pages cost the same as the first one.
+    The total is only counted when the client asks for it with ``?count=true``.
+    Works with any queryset exposing the ``TicketQuerySet`` keyset methods.
+    """
+
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    page_size_query_param = "page_size"
+    page_size = api_settings.PAGE_SIZE or 10
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.size = self.get_page_size(request)
+        self.count = None
+
+        if request.query_params.get(self.count_query_param) == "true":
+            self.count = queryset.count()
+
+        cursor = self.decode_cursor(request)
+
+        if cursor is None:
+            rows = list(queryset.newest_first()[: self.size + 1])
+            self.has_next, self.has_previous = len(rows) > self.size, False
+            self.page = rows[: self.size]
+        elif cursor["reverse"]:
+            rows = list(
+                queryset.newer_than(*cursor["position"]).oldest_first()[
+                    : self.size + 1
+                ]
+            )
+            self.has_next, self.has_previous = True, len(rows) > self.size
+            self.page = rows[: self.size][::-1]
+        else:
+            rows = list(
+                queryset.older_than(*cursor["position"]).newest_first()[
+                    : self.size + 1
+                ]
+            )
+            self.has_next, self.has_previous = len(rows) > self.size, True
+            self.page = rows[: self.size]
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if size <= 0:
+            return self.page_size
+
+        return min(size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        payload = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+        if self.count is not None:
+            payload = {"count": self.count, **payload}
+
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def encode_cursor(self, ticket, reverse: bool) -> str:
+        raw = json.dumps(
+            [ticket.created_at.isoformat(), ticket.pk, int(reverse)],
+            separators=(",", ":"),
+        )
+        token = base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request) -> dict | None:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            created_at, pk, reverse = json.loads(raw)
+            position = (datetime.fromisoformat(created_at), int(pk))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return {"position": position, "reverse": bool(reverse)}
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Include the total number of results.",
+                "schema": {"type": "boolean"},
+            },
+        ]
+
@@ -0,0 +1,247 @@
+"""Redis seat-hold tier for on-sale spikes.
+
+A reservation becomes a ``SET NX PX`` claim on ``seat-hold:{trip}:{seat}``
+and a JSON record appended to a pending list, both in one Lua script. The
+claim decides contention; ``persist_seat_holds`` later writes the pending
+records to the ``Ticket`` table in batches for durability, one run at a
+time under ``flush_lock``.
+
+The tier is off unless ``SEAT_HOLD_REDIS_URL`` is set.
+"""
+
+import json
+import logging
+import uuid
+from datetime import datetime
+from functools import cache
+
+import redis
+from django.conf import settings
+from django.utils import timezone
+from redis.lock import Lock
+
+from tickets.core.exceptions import SeatAlreadyTakenError, SeatsAlreadyTakenError
+from tickets.core.seat_map import get_seat_map, mark_seat_taken
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "seat-hold:pending"
+FLUSH_LOCK_KEY = "seat-hold:flush-lock"
+
+# KEYS: claim, pending list, hold id marker.
+CLAIM_SCRIPT = """
+if redis.call("SET", KEYS[1], ARGV[1], "NX", "PX", ARGV[2]) then
+    redis.call("SET", KEYS[3], "1", "PX", ARGV[2])
+    redis.call("RPUSH", KEYS[2], ARGV[3])
+    return 1
+end
+return 0
+"""
+
+# KEYS: (claim, hold id marker) per seat, then the pending list.
+# ARGV: ttl, then (hold id, record) per seat. Returns the taken seats' indexes.
+CLAIM_MANY_SCRIPT = """
+local seats = (#KEYS - 1) / 2
+local taken = {}
+for i = 1, seats do
+    if redis.call("EXISTS", KEYS[i * 2 - 1]) == 1 then
+        taken[#taken + 1] = i
+    end
+end
+if #taken == 0 then
+    for i = 1, seats do
+        redis.call("SET", KEYS[i * 2 - 1], ARGV[i * 2], "PX", ARGV[1])
+        redis.call("SET", KEYS[i * 2], "1", "PX", ARGV[1])
+        redis.call("RPUSH", KEYS[#KEYS], ARGV[i * 2 + 1])
+    end
+end
+return taken
+"""
+
+# KEYS: (claim, hold id marker) per hold; ARGV: hold ids. A claim is only
+# deleted while it still belongs to the hold, never a newer one.
+RELEASE_SCRIPT = """
+local released = 0
+for i = 1, #ARGV do
+    if redis.call("GET", KEYS[i * 2 - 1]) == ARGV[i] then
+        released = released + redis.call("DEL", KEYS[i * 2 - 1])
+    end
+    redis.call("DEL", KEYS[i * 2])
+end
+return released
+"""
+
+
+def enabled() -> bool:
+    return bool(settings.SEAT_HOLD_REDIS_URL)
+
+
+@cache
+def get_client() -> redis.Redis:
+    return redis.Redis.from_url(settings.SEAT_HOLD_REDIS_URL)
+
+
+@cache
+def _claim_script():
+    return get_client().register_script(CLAIM_SCRIPT)
+
+
+@cache
+def _claim_many_script():
+    return get_client().register_script(CLAIM_MANY_SCRIPT)
+
+
+@cache
+def _release_script():
+    return get_client().register_script(RELEASE_SCRIPT)
+
+
+def _claim_key(trip_id: int, seat_number: int) -> str:
+    return f"seat-hold:{trip_id}:{seat_number}"
+
+
+def _hold_key(hold_id: str) -> str:
+    return f"seat-hold:id:{hold_id}"
+
+
+def _hold_record(
+    trip_id: int, seat_number: int, reserved_until: datetime, user, data: dict
+) -> dict:
+    return {
+        "hold_id": uuid.uuid4().hex,
+        "trip_id": trip_id,
+        "seat_number": seat_number,
+        "user_id": user.pk if user else None,
+        "price": str(data["price"]) if data.get("price") is not None else None,
+        "origin": data.get("origin"),
+        "destination": data.get("destination"),
+        "reserved_until": reserved_until.isoformat(),
+    }
+
+
+def _ttl(reserved_until: datetime) -> int:
+    return max(int((reserved_until - timezone.now()).total_seconds() * 1000), 1)
+
+
+def claim_seat(
+    trip_id: int, seat_number: int, reserved_until: datetime, **data
+) -> dict:
+    """Claim a seat in Redis and queue it for persistence.
+
+    Raises ``SeatAlreadyTakenError`` when another hold owns the seat.
+    """
+    from tickets.core.models import Ticket
+
+    if Ticket.objects.is_seat_taken(trip_id, seat_number):
+        raise SeatAlreadyTakenError("Seat already taken.")
+
+    user = data.pop("user", None)
+    hold = _hold_record(trip_id, seat_number, reserved_until, user, data)
+
+    claimed = _claim_script()(
+        keys=[
+            _claim_key(trip_id, seat_number),
+            PENDING_KEY,
+            _hold_key(hold["hold_id"]),
+        ],
+        args=[hold["hold_id"], _ttl(reserved_until), json.dumps(hold)],
+    )
+
+    if not claimed:
+        raise SeatAlreadyTakenError("Seat already taken.")
+
+    mark_seat_taken(trip_id, seat_number, reserved_until)
+    return hold
+
+
+def claim_seats(
+    trip_id: int, seat_numbers: list[int], reserved_until: datetime, **data
+) -> list[dict]:
+    """Claim several seats of one trip in one script, all or nothing.
+
+    Raises ``SeatsAlreadyTakenError`` naming the seats that are held.
+    """
+    from tickets.core.models import Ticket
+
+    seat_map = get_seat_map(trip_id)
+    if seat_map is not None:
+        taken = [seat for seat in seat_numbers if seat_map.is_taken(seat)]
+    else:
+        taken = list(
+            Ticket.objects.get_queryset()
+            .holding_seats()
+            .filter(trip_id=trip_id, seat_number__in=seat_numbers)
+            .values_list("seat_number", flat=True)
+            .order_by("seat_number")
+        )
+
+    if taken:
+        raise SeatsAlreadyTakenError(taken)
+
+    user = data.pop("user", None)
+    holds = [
+        _hold_record(trip_id, seat_number, reserved_until, user, data)
+        for seat_number in seat_numbers
+    ]
+    keys, args = [], [_ttl(reserved_until)]
+    for hold in holds:
+        keys += [_claim_key(trip_id, hold["seat_number"]), _hold_key(hold["hold_id"])]
+        args += [hold["hold_id"], json.dumps(hold)]
+
+    taken = _claim_many_script()(keys=[*keys, PENDING_KEY], args=args)
+
+    if taken:
+        raise SeatsAlreadyTakenError([seat_numbers[index - 1] for index in taken])
+
+    for seat_number in seat_numbers:
+        mark_seat_taken(trip_id, seat_number, reserved_until)
+    return holds
+
+
+def is_pending(hold_id: str) -> bool:
+    """Whether a hold is still claimed and waiting to be written."""
+    return bool(get_client().exists(_hold_key(hold_id)))
+
+
+def release_claims(holds: list[tuple[int, int, str]]) -> None:
+    """Free the Redis claims of ``(trip_id, seat_number, hold_id)`` holds whose
+    ticket was cancelled, expired or lost, so the seat is bookable at once."""
+    if not holds or not enabled():
+        return
+
+    keys, hold_ids = [], []
+    for trip_id, seat_number, hold_id in holds:
+        keys += [_claim_key(trip_id, seat_number), _hold_key(hold_id)]
+        hold_ids.append(hold_id)
+
+    try:
+        _release_script()(keys=keys, args=hold_ids)
+    except redis.RedisError:
+        logger.warning("Could not release %s seat hold(s)", len(holds), exc_info=True)
+
+
+def flush_lock() -> Lock:
+    """Held by the one ``persist_seat_holds`` run draining the pending list."""
+    return get_client().lock(
+        FLUSH_LOCK_KEY, timeout=settings.SEAT_HOLD_FLUSH_LEASE, blocking=False
+    )
+
+
+def pending_holds(limit: int) -> list[tuple[bytes, dict]]:
+    """The oldest ``limit`` pending holds, each with its raw list entry."""
+    holds = []
+
+    for raw in get_client().lrange(PENDING_KEY, 0, limit - 1):
+        hold = json.loads(raw)
+        hold["reserved_until"] = datetime.fromisoformat(hold["reserved_until"])
+        holds.append((raw, hold))
+
+    return holds
+
+
+def acknowledge_holds(entries: list[bytes]) -> None:
+    """Drop exactly these entries, so holds queued meanwhile are never lost."""
+    with get_client().pipeline() as pipe:
+        for raw in entries:
+            pipe.lrem(PENDING_KEY, 1, raw)
+        pipe.execute()
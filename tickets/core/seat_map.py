@@ -0,0 +1,292 @@
+from collections.abc import Callable, Iterable
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+SeatHold = tuple[int, datetime | None]
+
+
+class SeatMap:
+    """Compact per-trip seat index: one bit per seat plus a version counter.
+
+    Seat numbers are 1-based, bit ``n - 1`` is set when seat ``n`` is taken.
+    ``expires_at`` is the earliest pending reservation deadline; once it passes
+    the cached map is considered stale and rebuilt from the database.
+    """
+
+    __slots__ = ("trip_id", "capacity", "version", "bits", "expires_at")
+
+    def __init__(
+        self,
+        trip_id: int,
+        capacity: int,
+        bits: bytes | bytearray | None = None,
+        version: int = 0,
+        expires_at: datetime | None = None,
+    ):
+        self.trip_id = trip_id
+        self.capacity = capacity
+        self.version = version
+        self.expires_at = expires_at
+        self.bits = bytearray(bits or b"")
+        self._grow(capacity)
+
+    @classmethod
+    def build(cls, trip_id: int, capacity: int, holds: Iterable[SeatHold]):
+        seat_map = cls(trip_id, capacity)
+        now = timezone.now()
+
+        for seat, deadline in holds:
+            seat_map.take(seat, deadline if deadline and deadline > now else None)
+
+        return seat_map
+
+    def _grow(self, capacity: int) -> None:
+        self.capacity = max(self.capacity, capacity)
+        missing = (self.capacity + 7) // 8 - len(self.bits)
+
+        if missing > 0:
+            self.bits.extend(bytes(missing))
+
+    def is_taken(self, seat: int) -> bool:
+        if seat < 1 or seat > self.capacity:
+            return False
+
+        index = seat - 1
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def take(self, seat: int, deadline: datetime | None = None) -> bool:
+        if seat < 1:
+            return False
+
+        self._grow(seat)
+
+        if deadline and (self.expires_at is None or deadline < self.expires_at):
+            self.expires_at = deadline
+
+        if self.is_taken(seat):
+            return False
+
+        index = seat - 1
+        self.bits[index >> 3] |= 1 << (index & 7)
+        return True
+
+    def release(self, seat: int) -> bool:
+        if not self.is_taken(seat):
+            return False
+
+        index = seat - 1
+        self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+        return True
+
+    def is_stale(self) -> bool:
+        return self.expires_at is not None and self.expires_at <= timezone.now()
+
+    def taken(self) -> list[int]:
+        return [seat for seat in range(1, self.capacity + 1) if self.is_taken(seat)]
+
+    def to_status(self, capacity: int | None = None) -> dict[str, str]:
+        capacity = capacity or self.capacity
+        return {
+            str(seat): "reserved" if self.is_taken(seat) else "available"
+            for seat in range(1, capacity + 1)
+        }
+
+    def diff(self, other: "SeatMap") -> dict[int, bool]:
+        """Seats whose state differs in ``other``, mapped to their new state."""
+        capacity = max(self.capacity, other.capacity)
+        return {
+            seat: other.is_taken(seat)
+            for seat in range(1, capacity + 1)
+            if self.is_taken(seat) != other.is_taken(seat)
+        }
+
+    def to_cache(self) -> tuple:
+        return self.capacity, self.version, bytes(self.bits), self.expires_at
+
+    @classmethod
+    def from_cache(cls, trip_id: int, value: tuple):
+        capacity, version, bits, expires_at = value
+        return cls(trip_id, capacity, bits, version, expires_at)
+
+
+def _cache():
+    return caches[settings.SEAT_MAP_CACHE]
+
+
+def _map_key(trip_id: int) -> str:
+    return f"seat-map:{trip_id}"
+
+
+def _version_key(trip_id: int) -> str:
+    return f"seat-map:{trip_id}:version"
+
+
+def _change_key(trip_id: int, version: int) -> str:
+    return f"seat-map:{trip_id}:change:{version}"
+
+
+def _next_version(trip_id: int) -> int:
+    cache = _cache()
+    key = _version_key(trip_id)
+    cache.add(key, 0, timeout=None)
+
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+        return 1
+
+
+def _store(seat_map: SeatMap) -> None:
+    _cache().set(
+        _map_key(seat_map.trip_id),
+        seat_map.to_cache(),
+        timeout=settings.SEAT_MAP_TIMEOUT,
+    )
+
+
+def _record_change(seat_map: SeatMap, seat: int, taken: bool) -> None:
+    _cache().set(
+        _change_key(seat_map.trip_id, seat_map.version),
+        (seat, taken),
+        timeout=settings.SEAT_MAP_TIMEOUT,
+    )
+
+
+def current_version(trip_id: int) -> int:
+    return _cache().get(_version_key(trip_id)) or 0
+
+
+def seat_changes(trip_id: int, since: int, until: int) -> dict[int, bool] | None:
+    """Net seat changes between two versions, or None if the log has a gap.
+
+    Only single-seat updates are logged; a rebuild or invalidation leaves a
+    gap, and the caller then has to fall back to a full map.
+    """
+    if until < since:
+        return None
+
+    if until == since:
+        return {}
+
+    keys = _change_keys(trip_id, since, until)
+    return _net_changes(keys, _cache().get_many(keys))
+
+
+async def aseat_changes(trip_id: int, since: int, until: int) -> dict[int, bool] | None:
+    if until < since:
+        return None
+
+    if until == since:
+        return {}
+
+    keys = _change_keys(trip_id, since, until)
+    return _net_changes(keys, await _cache().aget_many(keys))
+
+
+def _change_keys(trip_id: int, since: int, until: int) -> list[str]:
+    return [_change_key(trip_id, version) for version in range(since + 1, until + 1)]
+
+
+def _net_changes(keys: list[str], logged: dict) -> dict[int, bool] | None:
+    if len(logged) != len(keys):
+        return None
+
+    changes: dict[int, bool] = {}
+    for key in keys:
+        seat, taken = logged[key]
+        changes[seat] = taken
+
+    return changes
+
+
+# The map is only trusted while its version is the trip's current version.
+# Every write bumps the counter with an atomic incr, so a writer knows it
+# moved the map from the version it read only when incr returns that plus
+# one. A writer that lost the race stores nothing and the map it read is now
+# behind the counter, so the next read rebuilds it from the database rather
+# than serving a map missing either write.
+
+
+def get_seat_map(trip_id: int) -> SeatMap | None:
+    return _read(trip_id)[0]
+
+
+async def aget_seat_map(trip_id: int) -> SeatMap | None:
+    keys = [_map_key(trip_id), _version_key(trip_id)]
+    return _current(trip_id, await _cache().aget_many(keys))[0]
+
+
+def _read(trip_id: int) -> tuple[SeatMap | None, int]:
+    keys = [_map_key(trip_id), _version_key(trip_id)]
+    return _current(trip_id, _cache().get_many(keys))
+
+
+def _current(trip_id: int, values: dict) -> tuple[SeatMap | None, int]:
+    value = values.get(_map_key(trip_id))
+    version = values.get(_version_key(trip_id)) or 0
+
+    if value is None:
+        return None, version
+
+    seat_map = SeatMap.from_cache(trip_id, value)
+    if seat_map.version != version or seat_map.is_stale():
+        return None, version
+
+    return seat_map, version
+
+
+def load_seat_map(
+    trip_id: int, capacity: int, loader: Callable[[int], Iterable[SeatHold]]
+) -> SeatMap:
+    seat_map, version = _read(trip_id)
+
+    if seat_map is not None:
+        return seat_map
+
+    seat_map = SeatMap.build(trip_id, capacity, loader(trip_id))
+    seat_map.version = _next_version(trip_id)
+
+    # A seat changed while the holds were read, and the map may have missed it.
+    if seat_map.version == version + 1:
+        _store(seat_map)
+    return seat_map
+
+
+def _update(
+    trip_id: int, seat: int, taken: bool, apply: Callable[[SeatMap], bool]
+) -> SeatMap | None:
+    seat_map, version = _read(trip_id)
+
+    if seat_map is not None and not apply(seat_map):
+        return seat_map
+
+    # Bumped even without a map, so a rebuild racing this write is not stored.
+    new_version = _next_version(trip_id)
+
+    if seat_map is None or new_version != version + 1:
+        return None
+
+    seat_map.version = new_version
+    _store(seat_map)
+    _record_change(seat_map, seat, taken)
+    return seat_map
+
+
+def mark_seat_taken(
+    trip_id: int, seat: int, deadline: datetime | None = None
+) -> SeatMap | None:
+    """Set a seat bit on the cached map; a missing map is left for the next read."""
+    return _update(trip_id, seat, True, lambda seat_map: seat_map.take(seat, deadline))
+
+
+def mark_seat_released(trip_id: int, seat: int) -> SeatMap | None:
+    return _update(trip_id, seat, False, lambda seat_map: seat_map.release(seat))
+
+
+def invalidate_seat_map(trip_id: int) -> None:
+    _next_version(trip_id)
+    _cache().delete(_map_key(trip_id))
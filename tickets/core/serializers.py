@@ -4,7 +4,46 @@ from tickets.core.models import Ticket
 from tickets.core.services.trip_service import TripService
 
 
+def sparse_fieldset(query_params) -> dict:
+    """Parse ``?fields=`` and ``?omit=`` into serializer context."""
+
+    def names(param):
+        value = query_params.get(param)
+        if value is None:
+            return None
+        return {name.strip() for name in value.split(",") if name.strip()}
+
+    return {"fields": names("fields"), "omit": names("omit") or set()}
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    # Rendering a file means signing a storage URL, so it is sent on request only.
+    opt_in_fields = {"file"}
+    # Always loaded: primary key, cursor position and owner check.
+    required_columns = {"id", "created_at", "user"}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.context.get("fields")
+        omitted = self.context.get("omit") or set()
+
+        unknown = ((selected or set()) | omitted) - set(self.fields)
+        if unknown:
+            raise serializers.ValidationError(
+                {"fields": f"Unknown fields: {', '.join(sorted(unknown))}."}
+            )
+
+        if selected is None:
+            selected = set(self.fields) - self.opt_in_fields
+
+        for name in set(self.fields) - (selected - omitted):
+            self.fields.pop(name)
+
+    def model_columns(self) -> set[str]:
+        concrete = {field.name for field in Ticket._meta.concrete_fields}
+        sources = {field.source for field in self.fields.values()}
+        return (sources & concrete) | self.required_columns
+
     class Meta:
         model = Ticket
         fields = "__all__"
@@ -21,10 +60,11 @@ class TicketSerializer(serializers.ModelSerializer):
             "updated_at",
             "expires_at",
         ]
+        # Seat uniqueness is enforced by the database on insert.
+        validators = []
 
     def validate(self, attrs: dict) -> dict:
         trip_id = attrs["trip_id"]
-        seat_number = attrs["seat_number"]
 
         backend = self.context.get("backend")
 
@@ -45,9 +85,6 @@ class TicketSerializer(serializers.ModelSerializer):
                 f"Seat number must be between 1 and {trip['bus_capacity']}."
             )
 
-        if Ticket.objects.is_seat_taken(trip_id, seat_number):
-            raise serializers.ValidationError("Seat is already taken.")
-
         attrs["status"] = Ticket.Status.RESERVED
         attrs["price"] = trip["price"]
         attrs["origin"] = trip["origin"]
@@ -62,25 +99,87 @@ class TicketSerializer(serializers.ModelSerializer):
         attrs["user"] = request.user
         return attrs
 
+    def create(self, validated_data: dict) -> Ticket:
+        return Ticket.objects.create_ticket(**validated_data)
 
-class TicketConfirmationSerializer(serializers.Serializer):
-    ticket_id = serializers.IntegerField()
-    invoice_id = serializers.CharField()
+
+class TicketBulkReservationSerializer(serializers.Serializer):
+    max_seats = 30
+
+    trip_id = serializers.IntegerField()
+    origin = serializers.CharField()
+    destination = serializers.CharField()
+    seats = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=max_seats,
+    )
 
     @classmethod
-    def validate_ticket_id(cls, value: str) -> str:
-        if not Ticket.objects.filter(pk=value).exists():
-            raise serializers.ValidationError("Ticket not found.")
-        return value
+    def validate_seats(cls, value: list[int]) -> list[int]:
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Seat numbers must be unique.")
+        return sorted(value)
 
     def validate(self, attrs: dict) -> dict:
-        invoice_id = attrs.get("invoice_id")
+        backend = self.context.get("backend")
+
+        if not backend:
+            raise serializers.ValidationError("Backend not provided for validation.")
+
+        service = TripService(backend=backend)
 
-        if invoice_id and Ticket.objects.invoice_exists(invoice_id):
+        try:
+            trip = service.fetch_and_serialize_trip(
+                attrs["trip_id"], attrs["origin"], attrs["destination"]
+            )
+        except RuntimeError as e:
+            raise serializers.ValidationError(f"Cannot fetch trip: {str(e)}")
+
+        out_of_range = [seat for seat in attrs["seats"] if seat > trip["bus_capacity"]]
+
+        if out_of_range:
+            invalid = ", ".join(map(str, out_of_range))
             raise serializers.ValidationError(
                 {
-                    "invoice_id": "This invoice is already associated with another ticket."
+                    "seats": f"Seat number must be between 1 and "
+                    f"{trip['bus_capacity']} (got {invalid})."
                 }
             )
 
-        return attrs
+        request = self.context.get("request")
+
+        if not request or not hasattr(request, "user"):
+            raise serializers.ValidationError(
+                "User information missing in request context."
+            )
+
+        return {
+            "trip_id": attrs["trip_id"],
+            "seat_numbers": attrs["seats"],
+            "price": trip["price"],
+            "origin": trip["origin"],
+            "destination": trip["destination"],
+            "user": request.user,
+        }
+
+
+class TicketConfirmationSerializer(serializers.Serializer):
+    ticket_id = serializers.IntegerField()
+    invoice_id = serializers.CharField()
+
+
+class TicketBatchConfirmationSerializer(serializers.Serializer):
+    max_confirmations = 500
+
+    confirmations = TicketConfirmationSerializer(
+        many=True, min_length=1, max_length=max_confirmations
+    )
+
+    @classmethod
+    def validate_confirmations(cls, value: list[dict]) -> list[dict]:
+        for field in ("ticket_id", "invoice_id"):
+            values = [item[field] for item in value]
+            if len(set(values)) != len(values):
+                raise serializers.ValidationError(f"Each {field} may appear only once.")
+        return value
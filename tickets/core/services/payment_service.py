@@ -0,0 +1,154 @@
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from tickets.core.models import PaymentOutbox, Ticket
+from tickets.depot.backends.base import get_depot_backend
+from tickets.depot.exceptions import DepotServiceError
+from tickets.depot.projections import project_trip
+from tickets.treasury.backends.base import get_treasury_backend
+from tickets.treasury.exceptions import TreasuryServiceError
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentDispatchService:
+    """Drain the payment outbox into treasury invoices.
+
+    Due rows are claimed with ``SKIP LOCKED`` and leased for
+    ``PAYMENT_OUTBOX_LEASE`` seconds, so concurrent workers never share a
+    batch. Each batch is sent at most ``PAYMENT_OUTBOX_CONCURRENCY`` at a
+    time. Failed sends back off exponentially, with jitter, until
+    ``PAYMENT_OUTBOX_MAX_ATTEMPTS`` is reached.
+    """
+
+    UPDATE_FIELDS = [
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "invoice_id",
+        "last_error",
+        "sent_at",
+    ]
+
+    def __init__(self, backend=None, depot=None, max_workers: int | None = None):
+        self.backend = backend or get_treasury_backend()
+        self.depot = depot or get_depot_backend()
+        self.max_workers = max_workers or settings.PAYMENT_OUTBOX_CONCURRENCY
+
+    def claim(self, batch_size: int) -> list[PaymentOutbox]:
+        now = timezone.now()
+
+        with transaction.atomic():
+            entries = list(
+                PaymentOutbox.objects.due(now)
+                .select_related("ticket", "ticket__user")
+                .select_for_update(skip_locked=True, of=("self",))
+                .order_by("next_attempt_at")[:batch_size]
+            )
+            PaymentOutbox.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+                next_attempt_at=now + timedelta(seconds=settings.PAYMENT_OUTBOX_LEASE)
+            )
+
+        return entries
+
+    def dispatch(self, batch_size: int) -> dict[str, int]:
+        entries = self.claim(batch_size)
+        counts = dict.fromkeys(PaymentOutbox.Status.values, 0)
+        live = []
+
+        for entry in entries:
+            if entry.ticket.status == Ticket.Status.RESERVED:
+                live.append(entry)
+            else:
+                # Paid, cancelled or expired before we got to it.
+                entry.status = PaymentOutbox.Status.SKIPPED
+
+        if live:
+            try:
+                trips = self.depot.get_trips(
+                    (e.ticket.trip_id, e.ticket.origin, e.ticket.destination)
+                    for e in live
+                )
+            except DepotServiceError as error:
+                trips = None
+                for entry in live:
+                    self._failed(entry, error)
+
+            if trips is not None:
+                workers = min(self.max_workers, len(live))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(lambda entry: self._send(entry, trips), live))
+
+        PaymentOutbox.objects.bulk_update(entries, self.UPDATE_FIELDS)
+
+        for entry in entries:
+            counts[entry.status] += 1
+
+        return counts
+
+    @staticmethod
+    def payload(ticket: Ticket, raw_trip: dict | None) -> tuple[dict, dict, dict]:
+        """User, ticket and trip data for ``TicketFormatterDict``."""
+        user = ticket.user
+        user_data = (
+            {
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "email": user.email,
+            }
+            if user
+            else {}
+        )
+        ticket_data = {
+            "id": ticket.pk,
+            "seat_number": ticket.seat_number,
+            "price": ticket.price,
+        }
+        return user_data, ticket_data, project_trip(raw_trip) if raw_trip else {}
+
+    def _send(self, entry: PaymentOutbox, trips: dict) -> None:
+        ticket = entry.ticket
+        raw_trip = trips.get((ticket.trip_id, ticket.origin, ticket.destination))
+
+        try:
+            response = self.backend.pay_ticket(
+                *self.payload(ticket, raw_trip), idempotency_key=entry.idempotency_key
+            )
+        except TreasuryServiceError as error:
+            self._failed(entry, error)
+            return
+
+        response = response or {}
+        entry.status = PaymentOutbox.Status.SENT
+        entry.attempts += 1
+        entry.invoice_id = response.get("invoice_id") or response.get("id")
+        entry.last_error = ""
+        entry.sent_at = timezone.now()
+
+    def _failed(self, entry: PaymentOutbox, error: Exception) -> None:
+        entry.attempts += 1
+        entry.last_error = str(error)
+
+        if entry.attempts >= settings.PAYMENT_OUTBOX_MAX_ATTEMPTS:
+            logger.error(
+                "Giving up on invoice for ticket %s after %s attempts: %s",
+                entry.ticket_id,
+                entry.attempts,
+                error,
+            )
+            entry.status = PaymentOutbox.Status.FAILED
+            return
+
+        delay = min(
+            settings.PAYMENT_OUTBOX_BACKOFF * 2 ** (entry.attempts - 1),
+            settings.PAYMENT_OUTBOX_BACKOFF_MAX,
+        )
+        entry.next_attempt_at = timezone.now() + timedelta(
+            seconds=delay * random.uniform(0.5, 1)
+        )
@@ -5,7 +5,7 @@ from django.utils import timezone
 from tickets.core.models import Ticket
 from tickets.core.services.email_service import TicketEmailService
 from tickets.depot.backends.base import get_depot_backend
-from tickets.depot.serializers import TripSerializer
+from tickets.depot.projections import project_trip
 
 
 class TripReminderService:
@@ -18,27 +18,32 @@ class TripReminderService:
     def process_reminders(self) -> None:
         now: datetime = timezone.now()
 
+        tickets = list(
+            Ticket.objects.filter(
+                status=Ticket.Status.PAID,
+            ).select_related("user")
+        )
+        trips = self.backend.get_trips(
+            (ticket.trip_id, ticket.origin, ticket.destination) for ticket in tickets
+        )
+
         for hours in self.REMINDER_INTERVALS:
-            self._send_reminders_for_interval(now, hours)
+            self._send_reminders_for_interval(now, hours, tickets, trips)
 
-    def _send_reminders_for_interval(self, now: datetime, hours: int) -> None:
+    def _send_reminders_for_interval(
+        self, now: datetime, hours: int, tickets: list[Ticket], trips: dict
+    ) -> None:
         reminder_time: datetime = now + timedelta(hours=hours)
         reminder_date = reminder_time.date()
         reminder_hour = reminder_time.time().hour
 
-        tickets = Ticket.objects.filter(
-            status=Ticket.Status.PAID,
-        ).select_related("user")
-
         for ticket in tickets:
-            raw_trip = self.backend.get_trip(
-                ticket.trip_id, ticket.origin, ticket.destination
-            )
-            serialized_trip = TripSerializer(raw_trip).data
-
-            if not serialized_trip:
+            raw_trip = trips.get((ticket.trip_id, ticket.origin, ticket.destination))
+            if not raw_trip:
                 continue
 
+            serialized_trip = project_trip(raw_trip)
+
             if (
                 serialized_trip["date"] == reminder_date
                 and serialized_trip["start_time"].hour == reminder_hour
@@ -1,5 +1,5 @@
 from tickets.depot.exceptions import DepotServiceError
-from tickets.depot.serializers import TripSerializer
+from tickets.depot.projections import project_trip
 
 
 class TripService:
@@ -19,4 +19,4 @@ class TripService:
                 f"Trip {trip_id} not found for {origin} -> {destination}"
             )
 
-        return TripSerializer(raw_trip).data
+        return project_trip(raw_trip)
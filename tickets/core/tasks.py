@@ -0,0 +1,167 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from redis.exceptions import LockError
+
+from tickets.core import seat_holds
+from tickets.core.models import Ticket
+from tickets.depot import search
+from tickets.depot.backends.base import get_depot_backend
+from tickets.treasury.backends.base import get_treasury_backend
+from tickets.treasury.exceptions import TreasuryServiceError
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def expire_reservations(
+    batch_size: int | None = None, max_batches: int | None = None
+) -> int:
+    released = Ticket.objects.expire_reservations(
+        batch_size=batch_size or settings.RESERVATION_SWEEP_BATCH_SIZE,
+        max_batches=max_batches or settings.RESERVATION_SWEEP_MAX_BATCHES,
+    )
+    logger.info("Expired %s stale reservation(s)", released)
+    return released
+
+
+@shared_task
+def persist_seat_holds(
+    batch_size: int | None = None, max_batches: int | None = None
+) -> int:
+    if not seat_holds.enabled():
+        return 0
+
+    lock = seat_holds.flush_lock()
+    if not lock.acquire():
+        logger.info("Seat holds are being persisted by another run")
+        return 0
+
+    try:
+        persisted = _persist_seat_holds(
+            batch_size or settings.SEAT_HOLD_BATCH_SIZE,
+            max_batches or settings.SEAT_HOLD_MAX_BATCHES,
+        )
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            logger.warning("Seat hold flush lock expired before the run finished")
+
+    logger.info("Persisted %s seat hold(s)", persisted)
+    return persisted
+
+
+def _persist_seat_holds(batch_size: int, max_batches: int) -> int:
+    persisted = 0
+
+    for _batch in range(max_batches):
+        entries = seat_holds.pending_holds(batch_size)
+        if not entries:
+            break
+
+        holds = [hold for _raw, hold in entries]
+        rejected = Ticket.objects.persist_holds(holds)
+        for hold in rejected:
+            logger.warning(
+                "Seat hold %s lost seat %s on trip %s to an existing ticket",
+                hold["hold_id"],
+                hold["seat_number"],
+                hold["trip_id"],
+            )
+        seat_holds.release_claims(
+            [
+                (hold["trip_id"], hold["seat_number"], hold["hold_id"])
+                for hold in rejected
+            ]
+        )
+
+        seat_holds.acknowledge_holds([raw for raw, _hold in entries])
+        persisted += len(holds) - len(rejected)
+
+        if len(entries) < batch_size:
+            break
+
+    return persisted
+
+
+@shared_task
+def dispatch_payments(
+    batch_size: int | None = None, max_batches: int | None = None
+) -> dict[str, int]:
+    from tickets.core.services.payment_service import PaymentDispatchService
+
+    batch_size = batch_size or settings.PAYMENT_OUTBOX_BATCH_SIZE
+    max_batches = max_batches or settings.PAYMENT_OUTBOX_MAX_BATCHES
+    service = PaymentDispatchService()
+    totals: dict[str, int] = {}
+
+    for _batch in range(max_batches):
+        counts = service.dispatch(batch_size)
+        for outcome, count in counts.items():
+            totals[outcome] = totals.get(outcome, 0) + count
+
+        if sum(counts.values()) < batch_size:
+            break
+
+    logger.info("Dispatched payment outbox: %s", totals)
+    return totals
+
+
+@shared_task
+def warm_trip_searches(limit: int | None = None) -> int:
+    if not settings.TRIP_SEARCH_TIMEOUT:
+        return 0
+
+    warmed = search.warm_trip_searches(
+        get_depot_backend(), limit or settings.TRIP_SEARCH_WARM_TOP
+    )
+    logger.info("Warmed %s trip search(es)", warmed)
+    return warmed
+
+
+@shared_task(bind=True, max_retries=5, default_retry_delay=60)
+def refund_invoices(self, invoice_ids: list[str]) -> dict[str, str]:
+    try:
+        results = get_treasury_backend().refund_tickets(
+            {"invoice_id": invoice_id} for invoice_id in invoice_ids
+        )
+    except TreasuryServiceError as error:
+        logger.error("Bulk refund of %s invoice(s) failed: %s", len(invoice_ids), error)
+        raise self.retry(args=[invoice_ids]) from error
+
+    refunded: dict[str, str] = {}
+    failed: list[str] = []
+
+    for invoice_id, result in results.items():
+        if isinstance(result, Exception):
+            logger.error("Refund failed for invoice %s: %s", invoice_id, result)
+            failed.append(invoice_id)
+            continue
+
+        refund_id = result.get("refund_id") or result.get("id")
+
+        if not refund_id:
+            logger.error("Refund for invoice %s returned no refund id", invoice_id)
+            failed.append(invoice_id)
+            continue
+
+        refunded[invoice_id] = str(refund_id)
+
+    Ticket.objects.record_refunds(refunded)
+
+    if failed:
+        raise self.retry(args=[failed])
+
+    return refunded
+
+
+def queue_refunds(invoice_ids: list[str], chunk_size: int | None = None) -> int:
+    """Hand paid invoice ids to the refund queue in fixed-size chunks."""
+    chunk_size = chunk_size or settings.REFUND_CHUNK_SIZE
+
+    for start in range(0, len(invoice_ids), chunk_size):
+        refund_invoices.delay(invoice_ids[start : start + chunk_size])
+
+    return len(invoice_ids)
@@ -1,8 +1,9 @@
 import logging
 
+import redis
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.renderers import (
@@ -14,12 +15,17 @@ from rest_framework.status import HTTP_400_BAD_REQUEST
 from rest_framework.views import APIView
 
 from ..depot.backends.base import get_depot_backend
-from .exceptions import SeatAlreadyTakenError
-from .models import Ticket
+from . import seat_holds
+from .exceptions import SeatAlreadyTakenError, SeatsAlreadyTakenError
+from .models import Ticket, default_reserved_until
+from .pagination import TicketCursorPagination
 from .permissions import IsTicketOwner
 from .serializers import (
+    TicketBatchConfirmationSerializer,
+    TicketBulkReservationSerializer,
     TicketConfirmationSerializer,
     TicketSerializer,
+    sparse_fieldset,
 )
 from .services.ticket_pdf_service import TicketPDFService
 
@@ -27,6 +33,33 @@ pdf_service = TicketPDFService()
 
 logger = logging.getLogger(__name__)
 
+TICKET_NOT_FOUND = "Ticket not found."
+DUPLICATE_INVOICE = "This invoice is already associated with another ticket."
+
+
+def cannot_confirm(ticket_status: str) -> str:
+    return f"Cannot confirm a ticket with status '{ticket_status}'."
+
+
+def reservation_data(ticket: Ticket) -> dict:
+    return {
+        "id": ticket.id,
+        "trip_id": ticket.trip_id,
+        "seat_number": ticket.seat_number,
+        "status": ticket.status,
+        "reserved_until": ticket.reserved_until,
+    }
+
+
+def hold_data(hold: dict) -> dict:
+    return {
+        "hold_id": hold["hold_id"],
+        "trip_id": hold["trip_id"],
+        "seat_number": hold["seat_number"],
+        "status": Ticket.Status.RESERVED,
+        "reserved_until": hold["reserved_until"],
+    }
+
 
 class TicketViewSet(
     mixins.CreateModelMixin,
@@ -36,19 +69,42 @@ class TicketViewSet(
 ):
     serializer_class = TicketSerializer
     permission_classes = [IsAuthenticated, IsTicketOwner]
+    pagination_class = TicketCursorPagination
+
+    sparse_actions = ("list", "retrieve")
 
     def get_queryset(self):
-        return Ticket.objects.filter(user=self.request.user)
+        queryset = Ticket.objects.filter(user=self.request.user)
+
+        if self.action in self.sparse_actions:
+            serializer = self.get_serializer_class()(context=self.get_fieldset())
+            queryset = queryset.only(*serializer.model_columns())
+
+        return queryset
+
+    def get_fieldset(self) -> dict:
+        if self.action not in self.sparse_actions:
+            return {}
+
+        return sparse_fieldset(self.request.query_params)
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context["backend"] = get_depot_backend()
+        context.update(self.get_fieldset())
         return context
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
+        if seat_holds.enabled():
+            try:
+                return self.hold(serializer.validated_data)
+            except redis.RedisError:
+                # The unique live-seat constraint still guards the fallback.
+                logger.warning("Seat hold tier unavailable, reserving directly")
+
         try:
             ticket = Ticket.objects.create_ticket(**serializer.validated_data)
         except SeatAlreadyTakenError as e:
@@ -60,14 +116,85 @@ class TicketViewSet(
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+        return Response(reservation_data(ticket), status=status.HTTP_201_CREATED)
+
+    def hold(self, data: dict) -> Response:
+        """Claim the seat in the Redis hold tier; the row is written later."""
+        try:
+            hold = seat_holds.claim_seat(
+                reserved_until=default_reserved_until(),
+                **{key: value for key, value in data.items() if key != "status"},
+            )
+        except SeatAlreadyTakenError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT)
+
+        return Response(hold_data(hold), status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["get"], url_path=r"holds/(?P<hold_id>[0-9a-f]+)")
+    def hold_status(self, request, hold_id=None):
+        """Resolve a 202 seat hold to the ticket written from it."""
+        ticket = self.get_queryset().filter(hold_id=hold_id).first()
+
+        if ticket is not None:
+            return Response(
+                {"hold_id": hold_id, **reservation_data(ticket)},
+                status=status.HTTP_200_OK,
+            )
+
+        if seat_holds.enabled() and seat_holds.is_pending(hold_id):
+            return Response(
+                {"hold_id": hold_id, "status": "pending"},
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        return Response({"detail": "Hold not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        serializer_class=TicketBulkReservationSerializer,
+        url_path="bulk",
+    )
+    def bulk(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            if seat_holds.enabled():
+                try:
+                    holds = seat_holds.claim_seats(
+                        reserved_until=default_reserved_until(),
+                        **serializer.validated_data,
+                    )
+                except redis.RedisError:
+                    logger.warning("Seat hold tier unavailable, reserving directly")
+                else:
+                    return Response(
+                        {"holds": [hold_data(hold) for hold in holds]},
+                        status=status.HTTP_202_ACCEPTED,
+                    )
+
+            tickets = Ticket.objects.create_tickets(**serializer.validated_data)
+        except SeatsAlreadyTakenError as e:
+            return Response(
+                {
+                    "detail": str(e),
+                    "conflicts": [
+                        {"seat_number": seat, "detail": "Seat already taken."}
+                        for seat in e.seats
+                    ],
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+        except Exception:
+            logger.exception("Unexpected error while creating tickets")
+            return Response(
+                {"detail": "An unexpected error occurred while creating tickets."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
         return Response(
-            {
-                "id": ticket.id,
-                "trip_id": ticket.trip_id,
-                "seat_number": ticket.seat_number,
-                "status": ticket.status,
-                "reserved_until": ticket.reserved_until,
-            },
+            {"tickets": [reservation_data(ticket) for ticket in tickets]},
             status=status.HTTP_201_CREATED,
         )
 
@@ -83,18 +210,81 @@ class TicketViewSet(
         ticket_id = serializer.validated_data["ticket_id"]
         invoice_id = serializer.validated_data["invoice_id"]
 
-        ticket = get_object_or_404(self.get_queryset(), pk=ticket_id)
+        confirmed, duplicates = Ticket.objects.confirm_payments(
+            {ticket_id: invoice_id}, user=request.user
+        )
 
-        try:
-            ticket.confirm(invoice_id)
-        except ValidationError as e:
-            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if duplicates:
+            return Response(
+                {"invoice_id": [DUPLICATE_INVOICE]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not confirmed:
+            ticket = (
+                Ticket.objects.filter(pk=ticket_id).values("user_id", "status").first()
+            )
+
+            if ticket is None:
+                return Response(
+                    {"ticket_id": [TICKET_NOT_FOUND]},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            if ticket["user_id"] != request.user.pk:
+                raise NotFound()
+
+            return Response(
+                {"detail": cannot_confirm(ticket["status"])},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         return Response(
             {"message": "Ticket confirmed."},
             status=status.HTTP_200_OK,
         )
 
+    @action(
+        detail=False,
+        methods=["post"],
+        serializer_class=TicketBatchConfirmationSerializer,
+        url_path="webhook/confirm/batch",
+    )
+    def confirm_batch(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        invoices = {
+            item["ticket_id"]: item["invoice_id"]
+            for item in serializer.validated_data["confirmations"]
+        }
+
+        confirmed, duplicates = Ticket.objects.confirm_payments(
+            invoices, user=request.user
+        )
+
+        failed = {pk: DUPLICATE_INVOICE for pk in duplicates}
+        unmatched = invoices.keys() - set(confirmed) - failed.keys()
+
+        if unmatched:
+            statuses = dict(
+                self.get_queryset().filter(pk__in=unmatched).values_list("id", "status")
+            )
+            for pk in unmatched:
+                failed[pk] = (
+                    cannot_confirm(statuses[pk]) if pk in statuses else TICKET_NOT_FOUND
+                )
+
+        return Response(
+            {
+                "confirmed": sorted(confirmed),
+                "failed": [
+                    {"ticket_id": pk, "detail": detail}
+                    for pk, detail in sorted(failed.items())
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
+
     @action(detail=True, methods=["post"])
     def cancel(self, request, pk=None):
         ticket = get_object_or_404(self.get_queryset(), pk=pk)
@@ -0,0 +1,69 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+from tickets.depot.backends.base import get_depot_backend
+from tickets.depot.exceptions import DepotServiceError
+from tickets.treasury.backends.base import get_treasury_backend
+from tickets.treasury.exceptions import TreasuryServiceError
+
+OPERATIONS = {
+    "search": lambda args: get_depot_backend().list_trips(args.origin, args.dest),
+    "trip": lambda args: get_depot_backend().get_trip(
+        args.trip_id, args.origin, args.dest
+    ),
+    "pay": lambda args: get_treasury_backend().pay_ticket({}, {}, {}),
+    "refund": lambda args: get_treasury_backend().refund_ticket(
+        {"invoice_id": "INV-BENCH"}
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Call the configured depot or treasury backend concurrently and report "
+        "latency percentiles. Point DEPOT_API_URL/TREASURY_API_URL at the "
+        "standin command to load-test on one machine."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("operation", choices=sorted(OPERATIONS))
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument("--origin", default="Ialoveni")
+        parser.add_argument("--dest", default="Hincesti")
+        parser.add_argument("--trip-id", type=int, default=1)
+
+    def handle(self, *args, **options):
+        call = OPERATIONS[options["operation"]]
+        params = SimpleNamespace(**options)
+
+        def timed(_index):
+            started = time.perf_counter()
+            try:
+                call(params)
+            except (DepotServiceError, TreasuryServiceError):
+                return time.perf_counter() - started, False
+            return time.perf_counter() - started, True
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            results = list(executor.map(timed, range(options["requests"])))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for latency, _ok in results)
+        errors = sum(1 for _latency, ok in results if not ok)
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else []
+
+        self.stdout.write(
+            f"{len(results)} requests in {elapsed:.2f}s "
+            f"({len(results) / elapsed:.1f} req/s), {errors} error(s)"
+        )
+        for label, index in (("p50", 49), ("p90", 89), ("p99", 98)):
+            if cuts:
+                self.stdout.write(f"{label}: {cuts[index] * 1000:.1f}ms")
+        if latencies:
+            self.stdout.write(f"max: {latencies[-1] * 1000:.1f}ms")
@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.debug.standin import FaultProfile, Latency, StandinServer
+from tickets.depot.backends.json import JsonDepotBackend
+
+SERVICES = ("depot", "treasury")
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the depot and treasury APIs from the trips fixture, with "
+        "injected latency, errors and timeouts, for local load tests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8100)
+        parser.add_argument(
+            "--trips",
+            default=settings.DEPOT_JSON_PATH,
+            help="Trips fixture (defaults to DEPOT_JSON_PATH)",
+        )
+        parser.add_argument("--seed", type=int, default=None)
+
+        for prefix in ("", *(f"{service}-" for service in SERVICES)):
+            scope = prefix.rstrip("-") or "both services"
+            parser.add_argument(
+                f"--{prefix}latency",
+                help=(
+                    f"Latency in ms for {scope}: MS, fixed:MS, uniform:LOW:HIGH, "
+                    "normal:MEAN:STDDEV, lognormal:MEDIAN:SIGMA or exponential:MEAN"
+                ),
+            )
+            parser.add_argument(
+                f"--{prefix}error-rate",
+                type=float,
+                help=f"Share of {scope} requests answered with 503",
+            )
+            parser.add_argument(
+                f"--{prefix}timeout-rate",
+                type=float,
+                help=f"Share of {scope} requests that hang and are dropped",
+            )
+
+        parser.add_argument(
+            "--hang",
+            type=float,
+            default=30.0,
+            help="Seconds a timed-out request hangs before the connection drops",
+        )
+
+    def profile(self, options: dict, service: str) -> FaultProfile:
+        def option(name, default):
+            value = options.get(f"{service}_{name}")
+            if value is None:
+                value = options.get(name)
+            return default if value is None else value
+
+        try:
+            latency = Latency.parse(option("latency", "0"))
+        except ValueError as error:
+            raise CommandError(str(error)) from error
+
+        return FaultProfile(
+            latency=latency,
+            error_rate=option("error_rate", 0.0),
+            timeout_rate=option("timeout_rate", 0.0),
+            hang=options["hang"],
+        )
+
+    def handle(self, *args, **options):
+        profiles = {service: self.profile(options, service) for service in SERVICES}
+        depot = JsonDepotBackend(None, path=options["trips"])
+        server = StandinServer(
+            (options["host"], options["port"]), depot, profiles, options["seed"]
+        )
+
+        self.stdout.write(f"Depot and treasury stand-in listening on {server.url}")
+        for service, profile in profiles.items():
+            self.stdout.write(f"  {service}: {profile}")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+        for (route, outcome), count in sorted(server.stats.items()):
+            self.stdout.write(f"{route:>8} {outcome:<8} {count}")
@@ -0,0 +1,239 @@
+"""HTTP stand-in for the depot and treasury services, for local load tests.
+
+One threaded server answers both APIs from the trips fixture:
+
+* ``GET smart-trip-search``, ``GET trips/{id}/extra-info`` and
+  ``POST trips/extra-info/bulk`` like the depot;
+* ``POST api/invoices``, ``POST api/refund`` and ``POST api/refunds/bulk``
+  like the treasury.
+
+Paths are matched on their tail, so base URLs may carry a prefix. Every
+request first sleeps for a latency drawn from the service's distribution,
+then fails with a 503 (``error_rate``) or hangs for ``hang`` seconds and
+drops the connection (``timeout_rate``) before answering normally.
+"""
+
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from tickets.depot.backends.json import JsonDepotBackend
+
+logger = logging.getLogger(__name__)
+
+DISTRIBUTIONS = {
+    "fixed": 1,
+    "uniform": 2,
+    "normal": 2,
+    "lognormal": 2,
+    "exponential": 1,
+}
+
+
+@dataclass(frozen=True)
+class Latency:
+    """Latency distribution in milliseconds, e.g. ``lognormal:40:0.5``.
+
+    ``fixed:MS``, ``uniform:LOW:HIGH``, ``normal:MEAN:STDDEV``,
+    ``lognormal:MEDIAN:SIGMA`` and ``exponential:MEAN`` are understood;
+    a bare number means ``fixed``.
+    """
+
+    kind: str = "fixed"
+    params: tuple[float, ...] = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        kind, *params = spec.split(":")
+
+        if not params:
+            kind, params = "fixed", [kind]
+
+        if DISTRIBUTIONS.get(kind) != len(params):
+            raise ValueError(f"Invalid latency distribution: {spec!r}")
+
+        return cls(kind, tuple(float(param) for param in params))
+
+    def sample(self, rng: random.Random) -> float:
+        """One delay in seconds, never negative."""
+        first, *rest = self.params
+
+        if self.kind == "uniform":
+            delay = rng.uniform(first, rest[0])
+        elif self.kind == "normal":
+            delay = rng.gauss(first, rest[0])
+        elif self.kind == "lognormal":
+            delay = rng.lognormvariate(math.log(first), rest[0]) if first > 0 else 0
+        elif self.kind == "exponential":
+            delay = rng.expovariate(1 / first) if first > 0 else 0
+        else:
+            delay = first
+
+        return max(delay, 0) / 1000
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    latency: Latency = field(default_factory=Latency)
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    hang: float = 30.0
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        depot: JsonDepotBackend,
+        profiles: dict[str, FaultProfile] | None = None,
+        seed: int | None = None,
+    ):
+        super().__init__(address, StandinHandler)
+        self.depot = depot
+        self.profiles = profiles or {}
+        self.stats: Counter[tuple[str, str]] = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def profile(self, service: str) -> FaultProfile:
+        return self.profiles.get(service) or FaultProfile()
+
+    def roll(self, service: str) -> tuple[float, str]:
+        """Decide a request's delay and outcome: "ok", "error" or "timeout"."""
+        profile = self.profile(service)
+
+        with self._lock:
+            delay = profile.latency.sample(self._rng)
+            chance = self._rng.random()
+
+        if chance < profile.timeout_rate:
+            return delay, "timeout"
+        if chance < profile.timeout_rate + profile.error_rate:
+            return delay, "error"
+        return delay, "ok"
+
+    def record(self, route: str, outcome: str) -> None:
+        with self._lock:
+            self.stats[route, outcome] += 1
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandinServer
+
+    ROUTES = (
+        ("GET", re.compile(r"(?:^|/)smart-trip-search/?$"), "depot", "search"),
+        ("GET", re.compile(r"(?:^|/)trips/(\d+)/extra-info/?$"), "depot", "trip"),
+        ("POST", re.compile(r"(?:^|/)trips/extra-info/bulk/?$"), "depot", "bulk"),
+        ("POST", re.compile(r"(?:^|/)api/invoices/?$"), "treasury", "invoice"),
+        ("POST", re.compile(r"(?:^|/)api/refund/?$"), "treasury", "refund"),
+        ("POST", re.compile(r"(?:^|/)api/refunds/bulk/?$"), "treasury", "refunds"),
+    )
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    @classmethod
+    def resolve(cls, method: str, path: str):
+        for route_method, pattern, service, name in cls.ROUTES:
+            match = pattern.search(path)
+            if route_method == method and match:
+                return service, name, match
+        return None
+
+    def dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        route = self.resolve(method, url.path)
+
+        if route is None:
+            self.send_json(404, {"detail": "Not found."})
+            return
+
+        service, name, match = route
+
+        body = self.read_json() if method == "POST" else {}
+        delay, outcome = self.server.roll(service)
+        time.sleep(delay)
+        self.server.record(name, outcome)
+
+        if outcome == "timeout":
+            time.sleep(self.server.profile(service).hang)
+            self.close_connection = True
+            return
+
+        if outcome == "error":
+            self.send_json(503, {"detail": "Injected failure."})
+            return
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        handler = getattr(self, f"handle_{name}")
+        self.send_json(200, handler(body=body, query=query, match=match))
+
+    def read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        try:
+            return json.loads(raw) if raw else {}
+        except ValueError:
+            return {}
+
+    def send_json(self, status: int, data) -> None:
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def handle_search(self, query: dict, **kwargs) -> list[dict]:
+        return self.server.depot.list_trips(
+            query.get("origin", ""), query.get("destination", "")
+        )
+
+    def handle_trip(self, match: re.Match, **kwargs) -> dict | None:
+        return self.server.depot.get_trip(int(match.group(1)))
+
+    def handle_bulk(self, body: dict, **kwargs) -> list[dict]:
+        keys = [
+            (item.get("id"), item.get("origin", ""), item.get("destination", ""))
+            for item in body.get("trips", [])
+        ]
+        return [trip for trip in self.server.depot.get_trips(keys).values() if trip]
+
+    def handle_invoice(self, body: dict, **kwargs) -> dict:
+        invoice_id = f"INV-{uuid.uuid4().hex[:12].upper()}"
+        return {"id": invoice_id, "invoice_id": invoice_id, "status": "issued"}
+
+    def handle_refund(self, body: dict, **kwargs) -> dict:
+        refund_id = f"REF-{uuid.uuid4().hex[:12].upper()}"
+        return {
+            "id": refund_id,
+            "refund_id": refund_id,
+            "invoice_id": body.get("invoice_id"),
+        }
+
+    def handle_refunds(self, body: dict, **kwargs) -> list[dict]:
+        return [self.handle_refund(body=item) for item in body.get("refunds", [])]
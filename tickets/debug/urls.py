@@ -3,6 +3,7 @@ from rest_framework.routers import DefaultRouter
 
 from tickets.debug.views import (
     AdminStatsView,
+    BackendPoolStatsView,
     GenerateTicketPDFView,
     TicketEmailViewSet,
     WhoAmIView,
@@ -20,5 +21,6 @@ urlpatterns = [
         name="generate-pdf",
     ),
     path("admin/stats/", AdminStatsView.as_view(), name="admin-stats"),
+    path("backends/pools/", BackendPoolStatsView.as_view(), name="backend-pools"),
     path("whoami/", WhoAmIView.as_view(), name="whoami"),
 ] + router.urls
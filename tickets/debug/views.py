@@ -12,6 +12,7 @@ from tickets.core.models import Ticket
 from tickets.core.permissions import IsTicketOwner
 from tickets.core.services.ticket_pdf_service import TicketPDFService
 from tickets.core.services.trip_reminder_service import TripReminderService
+from tickets.pooling import registry
 
 pdf_service = TicketPDFService()
 
@@ -77,6 +78,13 @@ class AdminStatsView(APIView):
         )
 
 
+class BackendPoolStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        return Response(registry.stats())
+
+
 class WhoAmIView(APIView):
     permission_classes = [IsAuthenticated]
 
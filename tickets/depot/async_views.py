@@ -0,0 +1,57 @@
+"""Async trip endpoints for ASGI deployments.
+
+They mirror ``TripViewSet.list``, ``retrieve`` and ``seats``, but await the
+depot instead of blocking a worker on it, so one ASGI worker can keep
+hundreds of trip lookups in flight.
+"""
+
+from django.http import HttpRequest, JsonResponse
+from django.views.decorators.http import require_GET
+
+from tickets.depot.backends.async_service import get_async_depot_backend
+from tickets.depot.exceptions import DepotServiceError
+from tickets.depot.serializers import TripDetailSerializer, TripSerializer
+
+
+def _route(request: HttpRequest) -> tuple[str | None, str | None]:
+    return request.GET.get("origin"), request.GET.get("destination")
+
+
+@require_GET
+async def trip_list(request: HttpRequest) -> JsonResponse:
+    try:
+        trips = await get_async_depot_backend().list_trips(*_route(request))
+    except DepotServiceError as e:
+        return JsonResponse({"detail": f"Error fetching trips: {str(e)}"}, status=502)
+
+    return JsonResponse(TripSerializer(trips, many=True).data, safe=False)
+
+
+@require_GET
+async def trip_detail(request: HttpRequest, pk: int) -> JsonResponse:
+    try:
+        trip = await get_async_depot_backend().get_trip(pk, *_route(request))
+    except DepotServiceError as e:
+        return JsonResponse({"detail": f"Error fetching trip: {str(e)}"}, status=502)
+
+    if not trip:
+        return JsonResponse({"detail": "Trip not found."}, status=404)
+
+    return JsonResponse(TripSerializer(trip).data)
+
+
+@require_GET
+async def trip_seats(request: HttpRequest, pk: int) -> JsonResponse:
+    try:
+        seat_info = await get_async_depot_backend().get_seat_info(
+            pk, *_route(request)
+        )
+    except DepotServiceError as e:
+        return JsonResponse(
+            {"detail": f"Error fetching seat info: {str(e)}"}, status=502
+        )
+
+    if not seat_info:
+        return JsonResponse({"detail": "Trip not found."}, status=404)
+
+    return JsonResponse(TripDetailSerializer(seat_info).data)
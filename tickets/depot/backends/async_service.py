@@ -0,0 +1,196 @@
+import asyncio
+from collections.abc import Iterable
+from weakref import WeakKeyDictionary
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from tickets.core.models import Ticket
+from tickets.core.seat_map import load_seat_map
+from tickets.depot.backends.base import TripKey, get_depot_backend
+from tickets.depot.exceptions import DepotServiceError
+from tickets.depot.utils import seat_info_payload, trip_capacity
+
+
+class AsyncDepotServiceBackend:
+    """Non-blocking twin of ``DepotServiceBackend`` on a pooled ``httpx`` client."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        bulk_path: str | None = None,
+        max_workers: int = 50,
+    ):
+        self.client = client
+        self.bulk_path = bulk_path
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_options(cls, options: dict, **backend_options):
+        max_connections = options.get("pool_maxsize", 100)
+        client = httpx.AsyncClient(
+            base_url=options.get("base_url") or "",
+            timeout=options.get("timeout", 10),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        return cls(client, **backend_options)
+
+    async def _request(self, method: str, path: str, **kwargs) -> dict | None:
+        try:
+            response = await self.client.request(method, path, **kwargs)
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, ValueError) as exception:
+            raise DepotServiceError(method.upper(), path, exception) from exception
+
+    async def list_trips(self, origin: str, destination: str) -> list[dict]:
+        data = await self._request(
+            "get",
+            "smart-trip-search",
+            params={"origin": origin, "destination": destination},
+        )
+        return data if isinstance(data, list) else []
+
+    async def get_trip(
+        self, trip_id: int, origin: str, destination: str
+    ) -> dict | None:
+        return await self._request(
+            "get",
+            f"trips/{trip_id}/extra-info",
+            params={"origin": origin, "destination": destination},
+        )
+
+    async def get_trips(self, keys: Iterable[TripKey]) -> dict[TripKey, dict | None]:
+        keys = list(dict.fromkeys(keys))
+
+        if not keys:
+            return {}
+
+        if self.bulk_path:
+            try:
+                data = await self._request(
+                    "post",
+                    self.bulk_path,
+                    json={
+                        "trips": [
+                            {"id": trip_id, "origin": origin, "destination": dest}
+                            for trip_id, origin, dest in keys
+                        ]
+                    },
+                )
+            except DepotServiceError as error:
+                response = getattr(error.original, "response", None)
+                if getattr(response, "status_code", None) not in (404, 405):
+                    raise
+                self.bulk_path = None
+            else:
+                by_id = {
+                    trip.get("id"): trip for trip in data or [] if isinstance(trip, dict)
+                }
+                return {key: by_id.get(key[0]) for key in keys}
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def fetch(key: TripKey) -> dict | None:
+            async with semaphore:
+                return await self.get_trip(*key)
+
+        trips = await asyncio.gather(*(fetch(key) for key in keys))
+        return dict(zip(keys, trips, strict=True))
+
+    async def get_seat_info(
+        self, trip_id: int, origin: str, destination: str
+    ) -> dict | None:
+        trip = await self.get_trip(trip_id, origin, destination)
+
+        if not trip:
+            return None
+
+        # A cold map reads the holds only after the version it compares
+        # against, so a seat change committed meanwhile keeps it uncached.
+        capacity = trip_capacity(trip)
+        seat_map = await sync_to_async(load_seat_map)(
+            trip_id, capacity, Ticket.objects.seat_holds
+        )
+
+        return seat_info_payload(trip, seat_map, capacity)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class ThreadedDepotBackend:
+    """Async facade over a blocking depot backend.
+
+    Depot calls run in the executor pool; ``get_seat_info`` touches the ORM
+    and stays on the thread-sensitive executor.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def list_trips(self, origin: str, destination: str) -> list[dict]:
+        return await sync_to_async(self.backend.list_trips, thread_sensitive=False)(
+            origin, destination
+        )
+
+    async def get_trip(
+        self, trip_id: int, origin: str, destination: str
+    ) -> dict | None:
+        return await sync_to_async(self.backend.get_trip, thread_sensitive=False)(
+            trip_id, origin, destination
+        )
+
+    async def get_trips(self, keys: Iterable[TripKey]) -> dict[TripKey, dict | None]:
+        return await sync_to_async(self.backend.get_trips, thread_sensitive=False)(
+            list(keys)
+        )
+
+    async def get_seat_info(
+        self, trip_id: int, origin: str, destination: str
+    ) -> dict | None:
+        return await sync_to_async(self.backend.get_seat_info)(
+            trip_id, origin, destination
+        )
+
+
+_backends: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def get_async_depot_backend():
+    """Return the async depot backend bound to the running event loop.
+
+    ``DEPOT["async_backend"]`` names a class with a ``from_options``
+    constructor; without it the blocking backend is wrapped in threads.
+    """
+    loop = asyncio.get_running_loop()
+    backend = _backends.get(loop)
+
+    if backend is None:
+        module_settings = getattr(settings, "DEPOT", {})
+        module_string = module_settings.get("async_backend")
+
+        if module_string:
+            backend = import_string(module_string).from_options(
+                module_settings.get("options", {}),
+                **module_settings.get("backend_options", {}),
+            )
+        else:
+            backend = ThreadedDepotBackend(get_depot_backend())
+
+        _backends[loop] = backend
+
+    return backend
+
+
+@receiver(setting_changed)
+def reset_async_backends(setting, **kwargs):
+    if setting == "DEPOT":
+        _backends.clear()
@@ -1,7 +1,13 @@
+from collections.abc import Iterable
+
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.utils.module_loading import import_string
 
+from tickets.pooling import mount_pool, registry
+
+TripKey = tuple[int, str, str]
+
 
 class BaseBackend:
     def __init__(self, **kwargs):
@@ -13,11 +19,24 @@ class BaseBackend:
     def get_trip(self, trip_id: int, origin: str, destination: str) -> dict | None:
         raise NotImplementedError
 
+    def get_trips(self, keys: Iterable[TripKey]) -> dict[TripKey, dict | None]:
+        """Look up many (trip_id, origin, destination) keys at once.
+
+        Missing trips map to None. Backends override this with a batched
+        lookup; the default falls back to one ``get_trip`` call per key.
+        """
+        return {key: self.get_trip(*key) for key in dict.fromkeys(keys)}
+
     def get_seat_info(self, trip_id: int, origin: str, destination: str) -> dict | None:
         raise NotImplementedError
 
 
 def get_depot_backend() -> BaseBackend:
+    """Return the process-wide DEPOT backend, building it on first use."""
+    return registry.get("depot", build_depot_backend)
+
+
+def build_depot_backend() -> BaseBackend:
     module_settings = getattr(settings, "DEPOT", {})
     module_string = module_settings.get("backend")
     module_options = module_settings.get("options", {})
@@ -28,12 +47,23 @@ def get_depot_backend() -> BaseBackend:
     module_class = import_string(module_string)
 
     from tickets.depot.backends.client import DepotClient
+    from tickets.depot.backends.resilience import DepotResilience
 
     client = DepotClient(
         base_url=module_options.get("base_url"),
         timeout=module_options.get("timeout", 10),
+        resilience=DepotResilience.from_options(module_settings.get("resilience")),
     )
+    mount_pool(client, module_options)
+    backend_options = module_settings.get("backend_options", {})
+    backend = module_class(client=client, **backend_options)
+
+    cache_options = module_settings.get("cache")
+    if cache_options:
+        from tickets.depot.backends.cached import CachedDepotBackend
+
+        backend = CachedDepotBackend(backend, **cache_options)
 
-    return module_class(client=client)
+    return backend
 
     # return module_class(**module_options)
@@ -0,0 +1,191 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from opentelemetry import metrics
+
+from tickets.depot.backends.base import BaseBackend, TripKey
+from tickets.depot.utils import build_seat_info
+
+logger = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+cache_requests = meter.create_counter(
+    "depot.cache.requests",
+    description="Depot trip lookups served by CachedDepotBackend, by result",
+)
+
+MISSING = object()
+
+
+class CacheEntry:
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class CachedDepotBackend(BaseBackend):
+    """Per-process trip cache in front of any depot backend.
+
+    Trips are keyed by (trip_id, origin, destination) and kept for ``ttl``
+    seconds. After that, for up to ``stale_ttl`` more seconds, the old value
+    is served while one background thread refetches it. Trips the depot does
+    not know are cached for ``negative_ttl`` seconds. At most ``maxsize``
+    entries are kept, least recently used first out. Depot errors are never
+    cached.
+
+    Cached trips are shared between callers and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        backend: BaseBackend,
+        ttl: float = 60,
+        stale_ttl: float = 300,
+        negative_ttl: float = 10,
+        maxsize: int = 1024,
+        clock=time.monotonic,
+    ):
+        super().__init__()
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self.stats = {"hit": 0, "miss": 0, "stale": 0, "negative": 0}
+
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self._refreshing: set[tuple] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="depot-cache"
+        )
+
+    @property
+    def client(self):
+        return getattr(self.backend, "client", None)
+
+    def _record(self, result: str) -> None:
+        self.stats[result] += 1
+        cache_requests.add(1, {"result": result})
+
+    def _lookup(self, key: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING, False
+
+            now = self.clock()
+            if now >= entry.stale_until:
+                del self._entries[key]
+                return MISSING, False
+
+            self._entries.move_to_end(key)
+            return entry.value, now >= entry.fresh_until
+
+    def _store(self, key: tuple, value) -> None:
+        now = self.clock()
+
+        if value is None:
+            entry = CacheEntry(None, now + self.negative_ttl, now + self.negative_ttl)
+        else:
+            entry = CacheEntry(value, now + self.ttl, now + self.ttl + self.stale_ttl)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _refresh(self, key: tuple) -> None:
+        try:
+            self._store(key, self.backend.get_trip(*key))
+        except Exception:
+            logger.warning("Background refresh of trip %s failed", key, exc_info=True)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _schedule_refresh(self, key: tuple) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        self._executor.submit(self._refresh, key)
+
+    def _serve(self, key: tuple):
+        """Return the cached value for ``key`` (or MISSING) and count the outcome."""
+        value, stale = self._lookup(key)
+
+        if value is MISSING:
+            self._record("miss")
+        elif stale:
+            self._record("stale")
+            self._schedule_refresh(key)
+        else:
+            self._record("hit" if value is not None else "negative")
+
+        return value
+
+    def invalidate(self, trip_id: int | None = None) -> None:
+        with self._lock:
+            if trip_id is None:
+                self._entries.clear()
+                return
+
+            for key in [key for key in self._entries if key[0] == trip_id]:
+                del self._entries[key]
+
+    def list_trips(self, origin: str, destination: str) -> list[dict]:
+        return self.backend.list_trips(origin, destination)
+
+    def get_trip(
+        self, trip_id: int, origin: str = "", destination: str = ""
+    ) -> dict | None:
+        key = (trip_id, origin, destination)
+        value = self._serve(key)
+
+        if value is MISSING:
+            value = self.backend.get_trip(trip_id, origin, destination)
+            self._store(key, value)
+
+        return value
+
+    def get_trips(self, keys: Iterable[TripKey]) -> dict[TripKey, dict | None]:
+        trips: dict[TripKey, dict | None] = {}
+        missing: list[TripKey] = []
+
+        for key in dict.fromkeys(keys):
+            value = self._serve(key)
+
+            if value is MISSING:
+                missing.append(key)
+            else:
+                trips[key] = value
+
+        if missing:
+            fetched = self.backend.get_trips(missing)
+            for key in missing:
+                trips[key] = fetched.get(key)
+                self._store(key, trips[key])
+
+        return trips
+
+    def get_seat_info(
+        self, trip_id: int, origin: str = "", destination: str = ""
+    ) -> dict | None:
+        trip = self.get_trip(trip_id, origin, destination)
+
+        if not trip:
+            return None
+
+        return build_seat_info(trip_id, trip)
@@ -2,13 +2,23 @@ from urllib.parse import urljoin
 
 from requests import Session
 
+from tickets.depot.backends.resilience import DepotResilience
+
 
 class DepotClient(Session):
-    def __init__(self, base_url: str, api_key: str = None, timeout: int = 10, **kwargs):
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str = None,
+        timeout: int = 10,
+        resilience: DepotResilience | None = None,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self.base_url = base_url
         self.api_key = api_key
         self.timeout = timeout
+        self.resilience = resilience
 
         if self.api_key:
             self.headers.update({"Authorization": f"Bearer {self.api_key}"})
@@ -17,4 +27,13 @@ class DepotClient(Session):
         if "timeout" not in kwargs:
             kwargs["timeout"] = self.timeout
 
-        return super().request(method, urljoin(self.base_url, url), **kwargs)
+        full_url = urljoin(self.base_url, url)
+
+        if self.resilience is None:
+            return super().request(method, full_url, **kwargs)
+
+        return self.resilience.call(
+            method,
+            url,
+            lambda: super(DepotClient, self).request(method, full_url, **kwargs),
+        )
@@ -1,11 +1,17 @@
 import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable
 from pathlib import Path
 
 from django.conf import settings
 
-from tickets.depot.backends.base import BaseBackend
+from tickets.depot.backends.base import BaseBackend, TripKey
 from tickets.depot.backends.client import DepotClient
-from tickets.depot.utils import generate_seat_status
+from tickets.depot.utils import build_seat_info
 
 trips = {
     "trips": [
@@ -101,39 +107,139 @@ trips = {
 }
 
 
+logger = logging.getLogger(__name__)
+
+
+def _city(station: dict | None) -> str:
+    return ((station or {}).get("city") or "").casefold()
+
+
+class TripCatalog:
+    """Immutable snapshot of the trips file and its lookup indexes."""
+
+    __slots__ = ("trips", "by_id", "by_route", "by_origin", "by_destination", "mtime")
+
+    def __init__(self, trips: list[dict], mtime: int | None = None):
+        self.trips = trips
+        self.mtime = mtime
+        self.by_id: dict[int, dict] = {}
+        by_route: defaultdict[tuple[str, str], list] = defaultdict(list)
+        by_origin: defaultdict[str, list] = defaultdict(list)
+        by_destination: defaultdict[str, list] = defaultdict(list)
+
+        for trip in trips:
+            origin = _city(trip.get("from_station"))
+            destination = _city(trip.get("to_station"))
+            self.by_id[trip.get("id")] = trip
+            by_route[origin, destination].append(trip)
+            by_origin[origin].append(trip)
+            by_destination[destination].append(trip)
+
+        self.by_route = dict(by_route)
+        self.by_origin = dict(by_origin)
+        self.by_destination = dict(by_destination)
+
+    @classmethod
+    def from_data(cls, data: dict, mtime: int | None = None) -> "TripCatalog":
+        trips = data.get("trips", [])
+        if not isinstance(trips, list):
+            raise ValueError("Expected 'trips' to be a list")
+        return cls(trips, mtime)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "TripCatalog":
+        with path.open("rb") as file:
+            mtime = os.fstat(file.fileno()).st_mtime_ns
+            data = json.load(file)
+        return cls.from_data(data, mtime)
+
+
 class JsonDepotBackend(BaseBackend):
-    def __init__(self, client: DepotClient):
+    """Local depot stand-in serving trips from a JSON file.
+
+    ``DEPOT_JSON_PATH`` is read once into a ``TripCatalog`` indexed by id
+    and by (origin, destination) city. The file's mtime is checked at most
+    every ``reload_interval`` seconds, and a changed file is parsed off to
+    the side and swapped in as a whole. Readers never see a half-loaded
+    catalog. Without a file the built-in sample trips are served; a file
+    that is empty or broken at start-up serves no trips until it reloads.
+    """
+
+    def __init__(
+        self,
+        client: DepotClient,
+        path: str | Path | None = None,
+        reload_interval: float = 1.0,
+    ):
         super().__init__()
         self.client = client
-        self.data = self._load_json()
+        path = path or getattr(settings, "DEPOT_JSON_PATH", None)
+        self.path = Path(path) if path else None
+        self.reload_interval = reload_interval
+        self._reload_lock = threading.Lock()
+        self._checked_at = time.monotonic()
+        try:
+            self._catalog = self._load()
+        except (OSError, ValueError):
+            logger.warning("Could not load trips from %s", self.path, exc_info=True)
+            self._catalog = TripCatalog([])
 
-        self.trips = self.data.get("trips", [])
-        if not isinstance(self.trips, list):
-            raise ValueError("Expected 'trips' to be a list")
+    def _load(self) -> TripCatalog:
+        if self.path is None or not self.path.exists():
+            return TripCatalog.from_data(trips)
+        return TripCatalog.from_file(self.path)
+
+    @property
+    def catalog(self) -> TripCatalog:
+        now = time.monotonic()
+        if self.path is None or now - self._checked_at < self.reload_interval:
+            return self._catalog
+
+        # Only one thread stats and reloads; the rest keep the current snapshot.
+        if self._reload_lock.acquire(blocking=False):
+            try:
+                self._checked_at = now
+                mtime = self.path.stat().st_mtime_ns if self.path.exists() else None
+                if mtime != self._catalog.mtime:
+                    self._catalog = self._load()
+            except (OSError, ValueError):
+                logger.warning("Keeping previous trips from %s", self.path, exc_info=True)
+            finally:
+                self._reload_lock.release()
+
+        return self._catalog
 
-    def _load_json(self) -> dict:
-        return trips
+    @property
+    def trips(self) -> list[dict]:
+        return self.catalog.trips
 
     def list_trips(self, origin: str, destination: str) -> list[dict]:
-        return self.trips
+        catalog = self.catalog
+        origin, destination = (origin or "").casefold(), (destination or "").casefold()
+
+        if origin and destination:
+            return catalog.by_route.get((origin, destination), [])
+        if origin:
+            return catalog.by_origin.get(origin, [])
+        if destination:
+            return catalog.by_destination.get(destination, [])
+        return catalog.trips
 
     def get_trip(
         self, trip_id: int, origin: str = "", destination: str = ""
     ) -> dict | None:
-        trip = next((t for t in self.trips if t.get("id") == trip_id), None)
-        return trip if trip else None
+        return self.catalog.by_id.get(trip_id)
+
+    def get_trips(self, keys: Iterable[TripKey]) -> dict[TripKey, dict | None]:
+        by_id = self.catalog.by_id
+        return {key: by_id.get(key[0]) for key in keys}
 
-    def get_seat_info(self, trip_id: int) -> dict | None:
-        trip = self.get_trip(trip_id)
+    def get_seat_info(
+        self, trip_id: int, origin: str = "", destination: str = ""
+    ) -> dict | None:
+        trip = self.get_trip(trip_id, origin, destination)
 
         if not trip:
             return None
 
-        schedule = trip.get("schedule") or {}
-        bus = schedule.get("bus") or {}
-        bus_capacity = bus.get("capacity", 0)
-
-        return {
-            "trip_info": trip,
-            "seats": generate_seat_status(trip_id, bus_capacity),
-        }
+        return build_seat_info(trip_id, trip)
@@ -0,0 +1,235 @@
+import re
+import threading
+import time
+import weakref
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from opentelemetry import metrics
+from opentelemetry.metrics import Observation
+from requests import RequestException
+
+meter = metrics.get_meter(__name__)
+rejected_requests = meter.create_counter(
+    "depot.requests.rejected",
+    description="Depot calls refused locally, by reason",
+)
+hedged_requests = meter.create_counter(
+    "depot.requests.hedged",
+    description="Depot GETs that sent a second, hedged attempt",
+)
+
+ID_SEGMENT = re.compile(r"(?<![^/])\d+(?![^/])")
+
+
+class CircuitOpenError(RequestException):
+    """The endpoint's breaker is open; the call was not sent."""
+
+
+class BulkheadFullError(RequestException):
+    """Too many depot calls are already in flight."""
+
+
+class CircuitBreaker:
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+    STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN:
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probing = False
+
+            if self.state == self.HALF_OPEN:
+                # Let exactly one probe through until it reports back.
+                if self._probing:
+                    return False
+                self._probing = True
+
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release(self) -> None:
+        """The allowed call was never sent; let the next one probe instead."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+            self._probing = False
+
+
+class Bulkhead:
+    def __init__(self, max_concurrent: int = 10, timeout: float = 0.5):
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if not blocking:
+            return self._semaphore.acquire(blocking=False)
+        return self._semaphore.acquire(timeout=self.timeout)
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+
+class DepotResilience:
+    """Breaker per endpoint, one shared bulkhead and optional GET hedging.
+
+    Refused calls raise ``RequestException`` subclasses, so backends report
+    them as ``DepotServiceError`` like any other transport failure. 5xx
+    responses and transport errors count as breaker failures; 4xx do not.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        max_concurrent: int = 10,
+        bulkhead_timeout: float = 0.5,
+        hedge_after: float | None = None,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hedge_after = hedge_after
+        self.clock = clock
+        self.bulkhead = Bulkhead(max_concurrent, bulkhead_timeout)
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="depot")
+            if hedge_after
+            else None
+        )
+
+        _policies.add(self)
+
+    @classmethod
+    def from_options(cls, options: dict | None):
+        if not options:
+            return None
+        return cls(**options)
+
+    @staticmethod
+    def endpoint(method: str, url: str) -> str:
+        return f"{method.upper()} {ID_SEGMENT.sub('{id}', url)}"
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout, self.clock
+                )
+            return self.breakers[endpoint]
+
+    def snapshot(self) -> dict[str, dict]:
+        return {
+            endpoint: {"state": breaker.state, "failures": breaker.failures}
+            for endpoint, breaker in list(self.breakers.items())
+        }
+
+    def _attempt(self, send, breaker: CircuitBreaker, blocking: bool = True):
+        if not self.bulkhead.acquire(blocking):
+            # A hedge is refused while the first attempt is still out; only
+            # the first attempt holds a half-open breaker's probe.
+            if blocking:
+                breaker.release()
+            rejected_requests.add(1, {"reason": "bulkhead"})
+            raise BulkheadFullError("Too many depot requests in flight")
+
+        try:
+            response = send()
+        except RequestException:
+            breaker.record_failure()
+            raise
+        finally:
+            self.bulkhead.release()
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        return response
+
+    def call(self, method: str, url: str, send):
+        endpoint = self.endpoint(method, url)
+        breaker = self.breaker(endpoint)
+
+        if not breaker.allow():
+            rejected_requests.add(1, {"reason": "circuit_open", "endpoint": endpoint})
+            raise CircuitOpenError(f"Circuit open for {endpoint}")
+
+        if self._executor is None or method.upper() != "GET":
+            return self._attempt(send, breaker)
+
+        return self._hedged(send, breaker)
+
+    def _hedged(self, send, breaker: CircuitBreaker):
+        first = self._executor.submit(self._attempt, send, breaker)
+        done, _ = wait([first], timeout=self.hedge_after)
+
+        if done:
+            return first.result()
+
+        # The hedge only goes out if the bulkhead has room right now.
+        try:
+            second = self._executor.submit(self._attempt, send, breaker, False)
+        except RuntimeError:
+            return first.result()
+
+        hedged_requests.add(1)
+        pending = {first, second}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+
+        return first.result()
+
+
+_policies: "weakref.WeakSet[DepotResilience]" = weakref.WeakSet()
+
+
+def _observe_breakers(options):
+    for policy in list(_policies):
+        for endpoint, breaker in list(policy.breakers.items()):
+            yield Observation(
+                CircuitBreaker.STATE_VALUES[breaker.state], {"endpoint": endpoint}
+            )
+
+
+meter.create_observable_gauge(
+    "depot.circuit.state",
+    callbacks=[_observe_breakers],
+    description="Depot breaker state per endpoint: 0 closed, 1 half-open, 2 open",
+)
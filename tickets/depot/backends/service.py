@@ -1,17 +1,42 @@
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
-from tickets.depot.backends.base import BaseBackend
+from tickets.depot.backends.base import BaseBackend, TripKey
 from tickets.depot.backends.client import DepotClient
+from tickets.depot.backends.singleflight import SingleFlight
 from tickets.depot.exceptions import DepotServiceError
-from tickets.depot.utils import generate_seat_status
+from tickets.depot.utils import build_seat_info
 
 
 class DepotServiceBackend(BaseBackend):
-    def __init__(self, client: DepotClient):
+    def __init__(
+        self,
+        client: DepotClient,
+        bulk_path: str | None = None,
+        max_workers: int = 8,
+    ):
         super().__init__()
         self.client = client
+        self.bulk_path = bulk_path
+        self.max_workers = max_workers
+        self.flights = SingleFlight()
 
     def _request(self, method: str, path: str, **kwargs) -> dict | None:
+        """Send a depot call; identical concurrent GETs share one request.
+
+        Coalesced callers receive the same decoded object and must not
+        mutate it.
+        """
+        if method.lower() != "get":
+            return self._send(method, path, **kwargs)
+
+        params = kwargs.get("params") or {}
+        key = (path, tuple(sorted(params.items())))
+        return self.flights.do(key, lambda: self._send(method, path, **kwargs))
+
+    def _send(self, method: str, path: str, **kwargs) -> dict | None:
         try:
             response = self.client.request(method, path, **kwargs)
             response.raise_for_status()
@@ -34,21 +59,52 @@ class DepotServiceBackend(BaseBackend):
             params={"origin": origin, "destination": destination},
         )
 
-    def get_seat_info(self, trip_id: int, origin: str, destination: str) -> dict | None:
-        trip = self._request(
-            "get",
-            f"trips/{trip_id}/extra-info",
-            params={"origin": origin, "destination": destination},
+    def get_trips(self, keys: Iterable[TripKey]) -> dict[TripKey, dict | None]:
+        """Fetch many trips through the bulk endpoint, or a bounded fan-out.
+
+        Without ``bulk_path`` (or once the depot answers it with 404/405) each
+        key gets its own ``extra-info`` request, at most ``max_workers`` at
+        a time over the shared pooled session.
+        """
+        keys = list(dict.fromkeys(keys))
+
+        if not keys:
+            return {}
+
+        if self.bulk_path:
+            try:
+                return self._get_trips_bulk(keys)
+            except DepotServiceError as error:
+                status_code = getattr(
+                    getattr(error.original, "response", None), "status_code", None
+                )
+                if status_code not in (404, 405):
+                    raise
+                self.bulk_path = None
+
+        workers = min(self.max_workers, len(keys))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            trips = executor.map(lambda key: self.get_trip(*key), keys)
+            return dict(zip(keys, trips, strict=True))
+
+    def _get_trips_bulk(self, keys: list[TripKey]) -> dict[TripKey, dict | None]:
+        data = self._request(
+            "post",
+            self.bulk_path,
+            json={
+                "trips": [
+                    {"id": trip_id, "origin": origin, "destination": destination}
+                    for trip_id, origin, destination in keys
+                ]
+            },
         )
+        by_id = {trip.get("id"): trip for trip in data or [] if isinstance(trip, dict)}
+        return {key: by_id.get(key[0]) for key in keys}
+
+    def get_seat_info(self, trip_id: int, origin: str, destination: str) -> dict | None:
+        trip = self.get_trip(trip_id, origin, destination)
 
         if not trip:
             return None
 
-        schedule = trip.get("schedule") or {}
-        bus = schedule.get("bus") or {}
-        bus_capacity = bus.get("capacity", 0)
-
-        return {
-            "trip_info": trip,
-            "seats": generate_seat_status(trip_id, bus_capacity),
-        }
+        return build_seat_info(trip_id, trip)
@@ -0,0 +1,62 @@
+import threading
+from collections.abc import Callable, Hashable
+
+from opentelemetry import metrics
+
+meter = metrics.get_meter(__name__)
+coalesced_requests = meter.create_counter(
+    "depot.requests.coalesced",
+    description="Depot calls that waited on an identical in-flight request",
+)
+
+
+class Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Share one in-flight call between threads asking for the same key.
+
+    The first caller for a key runs ``fn``; callers arriving before it
+    finishes wait and get the same result, or the same exception. Nothing is
+    kept once the call returns, so this only merges concurrent work.
+    """
+
+    def __init__(self, name: str = "depot"):
+        self.name = name
+        self.stats = {"leader": 0, "coalesced": 0}
+        self._flights: dict[Hashable, Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], object]):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Flight()
+                self.stats["leader"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            coalesced_requests.add(1, {"backend": self.name})
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
@@ -0,0 +1,89 @@
+"""Flat projection of depot trip payloads.
+
+``TripSerializer`` declares the nested depot shape for the API schema, but
+every caller only wants the flat dict. ``TripView`` reads that dict straight
+from the depot payload, with the same coercion the DRF fields apply, without
+building a tree of nested serializers per trip.
+"""
+
+
+def _int(value):
+    return None if value is None else int(value)
+
+
+def _float(value):
+    return None if value is None else float(value)
+
+
+def _str(value):
+    return None if value is None else str(value)
+
+
+def _iso(value):
+    if value in (None, ""):
+        return None
+    if isinstance(value, str):
+        return value
+    return value.isoformat()
+
+
+class TripView:
+    __slots__ = (
+        "id",
+        "trip_nr",
+        "date",
+        "status",
+        "price",
+        "origin",
+        "destination",
+        "start_time",
+        "end_time",
+        "bus_capacity",
+        "bus_model",
+        "bus_plate_number",
+        "driver_name",
+        "driver_phone",
+        "route_name",
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_depot(cls, raw: dict) -> "TripView":
+        from_station = raw.get("from_station") or {}
+        to_station = raw.get("to_station") or {}
+        schedule = raw.get("schedule") or {}
+        bus = schedule.get("bus") or {}
+        driver = bus.get("driver") or {}
+        route = schedule.get("route") or {}
+
+        view = cls.__new__(cls)
+        view.id = _int(raw.get("id"))
+        view.trip_nr = _str(raw.get("trip_nr"))
+        view.date = _iso(raw.get("date"))
+        view.status = _str(raw.get("status"))
+        view.price = _float(raw.get("price"))
+        view.origin = _str(from_station.get("city", ""))
+        view.destination = _str(to_station.get("city", ""))
+        view.start_time = _iso(raw.get("departure_time"))
+        view.end_time = _iso(raw.get("arrival_time"))
+        view.bus_capacity = _int(bus.get("capacity", 0))
+        view.bus_model = _str(bus.get("model", ""))
+        view.bus_plate_number = _str(bus.get("plate_number", ""))
+        view.driver_name = _str(driver.get("name", ""))
+        view.driver_phone = _str(driver.get("phone_number", ""))
+        view.route_name = _str(route.get("name", ""))
+        return view
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def project_trip(raw: dict) -> dict:
+    return TripView.from_depot(raw).to_dict()
+
+
+def project_trips(raws: list[dict]) -> list[dict]:
+    return [TripView.from_depot(raw).to_dict() for raw in raws]
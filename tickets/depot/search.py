@@ -0,0 +1,183 @@
+"""Shared cache for depot trip searches.
+
+Results are keyed by the normalized (origin, destination) pair and the
+current date, so a cached search never outlives the day it was made for.
+Every search bumps a per-pair counter in the current time bucket;
+``warm_trip_searches`` refreshes the pairs with the most recent traffic and
+bookings before they expire.
+"""
+
+import contextlib
+import logging
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from tickets.depot.exceptions import DepotServiceError
+
+logger = logging.getLogger(__name__)
+
+TRAFFIC_KEY = "trip-search:traffic"
+
+
+def _cache():
+    return caches[settings.TRIP_SEARCH_CACHE]
+
+
+def normalize_city(city: str | None) -> str:
+    return " ".join((city or "").split()).casefold()
+
+
+def _search_key(origin: str, destination: str, day: date) -> str:
+    return (
+        f"trip-search:{day.isoformat()}:"
+        f"{normalize_city(origin)}:{normalize_city(destination)}"
+    )
+
+
+def _bucket_seconds() -> int:
+    return max(
+        settings.TRIP_SEARCH_TRAFFIC_WINDOW // settings.TRIP_SEARCH_TRAFFIC_BUCKETS, 1
+    )
+
+
+def _traffic_buckets() -> list[int]:
+    """The buckets covering the traffic window, oldest first."""
+    current = int(time.time()) // _bucket_seconds()
+    return list(range(current - settings.TRIP_SEARCH_TRAFFIC_BUCKETS + 1, current + 1))
+
+
+def _traffic_key(bucket: int, *parts) -> str:
+    return ":".join([TRAFFIC_KEY, str(bucket), *map(str, parts)])
+
+
+def record_search(origin: str | None, destination: str | None) -> None:
+    """Count a search towards the warmer's popular pairs (best effort).
+
+    Each pair has its own counter per time bucket, bumped with an atomic
+    ``incr``. Bucket keys get a fixed TTL when created and are never
+    rewritten, so old traffic ages out. A bucket tracks at most
+    ``TRIP_SEARCH_TRAFFIC_PAIRS`` pairs. It keeps the spelling a pair was
+    first searched with, so the warmer asks the depot the way users do.
+    """
+    key = (normalize_city(origin), normalize_city(destination))
+    if not all(key):
+        return
+
+    cache = _cache()
+    bucket = _traffic_buckets()[-1]
+    timeout = settings.TRIP_SEARCH_TRAFFIC_WINDOW + _bucket_seconds()
+    counter = _traffic_key(bucket, "count", *key)
+
+    if not cache.add(counter, 1, timeout=timeout):
+        # The bucket may have expired between the two calls.
+        with contextlib.suppress(ValueError):
+            cache.incr(counter)
+        return
+
+    slots = _traffic_key(bucket, "pairs")
+    cache.add(slots, 0, timeout=timeout)
+    slot = cache.incr(slots)
+
+    if slot > settings.TRIP_SEARCH_TRAFFIC_PAIRS:
+        cache.delete(counter)
+        return
+
+    route = (origin.strip(), destination.strip())
+    cache.set(_traffic_key(bucket, "pair", slot), (key, route), timeout=timeout)
+
+
+def _traffic() -> dict[tuple[str, str], tuple[int, tuple[str, str]]]:
+    """Searches per pair over the traffic window, with the latest spelling."""
+    cache = _cache()
+    buckets = _traffic_buckets()
+    tracked = cache.get_many([_traffic_key(bucket, "pairs") for bucket in buckets])
+
+    slots = []
+    for bucket in buckets:
+        count = tracked.get(_traffic_key(bucket, "pairs"), 0)
+        count = min(count, settings.TRIP_SEARCH_TRAFFIC_PAIRS)
+        slots += [_traffic_key(bucket, "pair", slot) for slot in range(1, count + 1)]
+
+    # Counters are per bucket, so look up the pair's in the slot's bucket.
+    counters = {}
+    for slot, (key, route) in cache.get_many(slots).items():
+        bucket = slot.removeprefix(f"{TRAFFIC_KEY}:").split(":")[0]
+        counters[_traffic_key(bucket, "count", *key)] = key, route
+
+    traffic = {}
+    for counter, count in cache.get_many(list(counters)).items():
+        key, route = counters[counter]
+        total, _route = traffic.get(key, (0, None))
+        traffic[key] = total + count, route
+
+    return traffic
+
+
+def store_search(origin: str, destination: str, trips: list[dict]) -> None:
+    _cache().set(
+        _search_key(origin, destination, timezone.localdate()),
+        (time.time(), trips),
+        timeout=settings.TRIP_SEARCH_TIMEOUT,
+    )
+
+
+def search_trips(
+    backend, origin: str | None, destination: str | None
+) -> tuple[list[dict], int | None]:
+    """Return ``(trips, age)``; ``age`` is None when the depot was just asked.
+
+    Depot errors propagate and are never cached.
+    """
+    record_search(origin, destination)
+
+    if not settings.TRIP_SEARCH_TIMEOUT:
+        return backend.list_trips(origin, destination), None
+
+    cached = _cache().get(_search_key(origin, destination, timezone.localdate()))
+    if cached is not None:
+        fetched_at, trips = cached
+        return trips, max(int(time.time() - fetched_at), 0)
+
+    trips = backend.list_trips(origin, destination)
+    store_search(origin, destination, trips)
+    return trips, None
+
+
+def popular_pairs(limit: int) -> list[tuple[str, str]]:
+    """Top ``limit`` pairs from recent searches, topped up from ticket history."""
+    from tickets.core.models import Ticket
+
+    ranked = sorted(_traffic().items(), key=lambda item: item[1][0], reverse=True)
+    pairs = {key: route for key, (_count, route) in ranked[:limit]}
+
+    if len(pairs) < limit:
+        since = timezone.now() - timedelta(days=settings.TRIP_SEARCH_HISTORY_DAYS)
+        for route in Ticket.objects.popular_routes(since, limit):
+            pairs.setdefault(tuple(map(normalize_city, route)), route)
+
+    return list(pairs.values())[:limit]
+
+
+def warm_trip_searches(backend, limit: int) -> int:
+    warmed = 0
+
+    for origin, destination in popular_pairs(limit):
+        try:
+            trips = backend.list_trips(origin, destination)
+        except DepotServiceError:
+            logger.warning(
+                "Could not warm trip search %s -> %s",
+                origin,
+                destination,
+                exc_info=True,
+            )
+            continue
+
+        store_search(origin, destination, trips)
+        warmed += 1
+
+    return warmed
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from tickets.depot.projections import project_trip
+
 
 class DriverSerializer(serializers.Serializer):
     id = serializers.IntegerField()
@@ -54,32 +56,8 @@ class TripSerializer(serializers.Serializer):
     schedule = ScheduleSerializer()
 
     def to_representation(self, instance):
-        data = super().to_representation(instance)
-
-        from_station = data.get("from_station", {})
-        to_station = data.get("to_station", {})
-
-        bus = data.get("schedule", {}).get("bus", {})
-        driver = bus.get("driver", {})
-        route = data.get("schedule", {}).get("route", {})
-
-        return {
-            "id": data.get("id"),
-            "trip_nr": data.get("trip_nr"),
-            "date": data.get("date"),
-            "status": data.get("status"),
-            "price": data.get("price"),
-            "origin": from_station.get("city", ""),
-            "destination": to_station.get("city", ""),
-            "start_time": data.get("departure_time"),
-            "end_time": data.get("arrival_time"),
-            "bus_capacity": bus.get("capacity", 0),
-            "bus_model": bus.get("model", ""),
-            "bus_plate_number": bus.get("plate_number", ""),
-            "driver_name": driver.get("name", ""),
-            "driver_phone": driver.get("phone_number", ""),
-            "route_name": route.get("name", ""),
-        }
+        # The nested fields document the depot payload; output is the flat view.
+        return project_trip(instance)
 
 
 class TripDetailSerializer(serializers.Serializer):
@@ -88,3 +66,7 @@ class TripDetailSerializer(serializers.Serializer):
         child=serializers.CharField(),
         help_text="Dictionary of seat numbers to status, e.g. {'1': 'available', '2': 'reserved'}",
     )
+    version = serializers.IntegerField(
+        required=False,
+        help_text="Seat map version, increases on every seat change of the trip",
+    )
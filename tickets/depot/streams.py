@@ -0,0 +1,131 @@
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.renderers import BaseRenderer
+
+from tickets.core.models import Ticket
+from tickets.core.seat_map import (
+    SeatMap,
+    aget_seat_map,
+    aseat_changes,
+    seat_changes,
+)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets ``text/event-stream`` through content negotiation.
+
+    Successful stream responses bypass the renderer; error payloads are sent
+    as a single ``error`` event.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return format_event("error", data).encode(self.charset)
+
+
+def format_event(event: str, data, event_id: int | None = None) -> str:
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines += [f"event: {event}", f"data: {json.dumps(data)}"]
+    return "\n".join(lines) + "\n\n"
+
+
+def _seat_status(changes: dict[int, bool]) -> dict[str, str]:
+    return {
+        str(seat): "reserved" if taken else "available"
+        for seat, taken in sorted(changes.items())
+    }
+
+
+def _seats_event(version: int, changes: dict[int, bool]) -> str:
+    return format_event(
+        "seats", {"version": version, "seats": _seat_status(changes)}, version
+    )
+
+
+def _opening(
+    capacity: int, seat_map: SeatMap, missed: dict[int, bool] | None
+) -> Iterator[str]:
+    yield f"retry: {settings.SEAT_STREAM_RETRY}\n\n"
+
+    if missed is None:
+        yield format_event(
+            "snapshot",
+            {"version": seat_map.version, "seats": seat_map.to_status(capacity)},
+            seat_map.version,
+        )
+    elif missed:
+        yield _seats_event(seat_map.version, missed)
+
+
+def seat_events(
+    trip_id: int, capacity: int, last_version: int | None = None
+) -> Iterator[str]:
+    """Yield one batch of SSE frames for a trip's seat map, then end.
+
+    This is the WSGI variant and it is not push: holding the connection
+    would pin a worker thread per viewer. The batch is the full map, or only
+    the missed seats when the client resumes from a version still covered by
+    the change log. ``EventSource`` reconnects after ``SEAT_STREAM_RETRY``
+    milliseconds with ``Last-Event-ID``, so clients poll at that rate.
+    """
+    seat_map = Ticket.objects.seat_map(trip_id, capacity)
+
+    missed = None
+    if last_version is not None:
+        missed = seat_changes(trip_id, last_version, seat_map.version)
+
+    yield from _opening(capacity, seat_map, missed)
+
+
+async def aseat_events(
+    trip_id: int,
+    capacity: int,
+    last_version: int | None = None,
+    *,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for a trip's seat map while the connection is open.
+
+    The ASGI variant. It opens like ``seat_events``, then polls the cached
+    map and pushes only the seats that changed, with heartbeat comments in
+    between. Waiting never blocks the event loop. The stream ends after
+    ``SEAT_STREAM_MAX_AGE`` seconds and clients resume with ``Last-Event-ID``.
+    """
+    load = sync_to_async(Ticket.objects.seat_map)
+    seat_map = await aget_seat_map(trip_id) or await load(trip_id, capacity)
+
+    missed = None
+    if last_version is not None:
+        missed = await aseat_changes(trip_id, last_version, seat_map.version)
+
+    for frame in _opening(capacity, seat_map, missed):
+        yield frame
+
+    started = last_sent = clock()
+
+    while clock() - started < settings.SEAT_STREAM_MAX_AGE:
+        await sleep(settings.SEAT_STREAM_POLL_INTERVAL)
+        # A missing map was invalidated or went stale; only then touch the DB.
+        current = await aget_seat_map(trip_id) or await load(trip_id, capacity)
+
+        if current.version != seat_map.version:
+            changes = seat_map.diff(current)
+            seat_map = current
+
+            if changes:
+                yield _seats_event(current.version, changes)
+                last_sent = clock()
+                continue
+
+        if clock() - last_sent >= settings.SEAT_STREAM_HEARTBEAT:
+            yield ": heartbeat\n\n"
+            last_sent = clock()
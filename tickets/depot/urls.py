@@ -1,5 +1,7 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from tickets.depot import async_views
 from tickets.depot.views import TripViewSet
 
 app_name = "tickets-depot"
@@ -7,4 +9,14 @@ app_name = "tickets-depot"
 router = DefaultRouter()
 router.register(r"trips", TripViewSet, basename="trip")
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path("async/trips/", async_views.trip_list, name="async-trip-list"),
+    path(
+        "async/trips/<int:pk>/", async_views.trip_detail, name="async-trip-detail"
+    ),
+    path(
+        "async/trips/<int:pk>/seats/",
+        async_views.trip_seats,
+        name="async-trip-seats",
+    ),
+]
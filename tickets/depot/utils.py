@@ -1,10 +1,27 @@
 from tickets.core.models import Ticket
+from tickets.core.seat_map import SeatMap
 
 
 def generate_seat_status(trip_id: int, capacity: int) -> dict:
-    taken = set(Ticket.objects.taken_seats(trip_id))
+    return Ticket.objects.seat_map(trip_id, capacity).to_status(capacity)
 
-    def seat_state(seat: int) -> str:
-        return "reserved" if seat in taken else "available"
 
-    return {str(seat): seat_state(seat) for seat in range(1, capacity + 1)}
+def trip_capacity(trip: dict) -> int:
+    schedule = trip.get("schedule") or {}
+    bus = schedule.get("bus") or {}
+    return bus.get("capacity", 0)
+
+
+def seat_info_payload(trip: dict, seat_map: SeatMap, capacity: int) -> dict:
+    return {
+        "trip_info": trip,
+        "seats": seat_map.to_status(capacity),
+        "version": seat_map.version,
+    }
+
+
+def build_seat_info(trip_id: int, trip: dict) -> dict:
+    bus_capacity = trip_capacity(trip)
+    seat_map = Ticket.objects.seat_map(trip_id, bus_capacity)
+
+    return seat_info_payload(trip, seat_map, bus_capacity)
@@ -1,10 +1,13 @@
 import logging
 
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 
@@ -12,7 +15,9 @@ from tickets.core.exceptions import TicketAlreadyCancelledError, TicketNotFoundE
 from tickets.core.models import Ticket
 from tickets.depot.backends.base import get_depot_backend
 from tickets.depot.exceptions import DepotServiceError
+from tickets.depot.search import search_trips
 from tickets.depot.serializers import TripDetailSerializer, TripSerializer
+from tickets.depot.streams import EventStreamRenderer, aseat_events, seat_events
 
 logger = logging.getLogger(__name__)
 
@@ -50,14 +55,15 @@ class TripViewSet(
         destination = request.query_params.get("destination")
 
         try:
-            trips = self.get_backend().list_trips(origin, destination)
+            trips, age = search_trips(self.get_backend(), origin, destination)
         except DepotServiceError as e:
             return Response(
                 {"detail": f"Error fetching trips: {str(e)}"},
                 status=status.HTTP_502_BAD_GATEWAY,
             )
         serializer = TripSerializer(trips, many=True)
-        return Response(serializer.data)
+        headers = {"X-Cache": "MISS" if age is None else "HIT", "Age": str(age or 0)}
+        return Response(serializer.data, headers=headers)
 
     @extend_schema(
         parameters=[
@@ -136,6 +142,78 @@ class TripViewSet(
         serializer = TripDetailSerializer(seat_info)
         return Response(serializer.data)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "origin",
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                default="Ialoveni",
+                description="Origin city",
+            ),
+            OpenApiParameter(
+                "destination",
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                default="Hincesti",
+                description="Destination city",
+            ),
+            OpenApiParameter(
+                "version",
+                OpenApiTypes.INT,
+                OpenApiParameter.QUERY,
+                description="Resume after this seat map version (or Last-Event-ID)",
+            ),
+        ],
+        description=(
+            "Seat map changes as server-sent events. Under ASGI the connection "
+            "stays open and changed seats are pushed; under WSGI one batch is "
+            "sent and EventSource polls by reconnecting with Last-Event-ID."
+        ),
+        responses={(200, "text/event-stream"): OpenApiTypes.STR},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="seats/stream",
+        renderer_classes=[EventStreamRenderer, JSONRenderer],
+    )
+    def seats_stream(self, request: Request, pk=None):
+        origin = request.query_params.get("origin")
+        destination = request.query_params.get("destination")
+        last_version = request.headers.get("Last-Event-ID") or request.query_params.get(
+            "version"
+        )
+
+        try:
+            seat_info = self.get_backend().get_seat_info(int(pk), origin, destination)
+        except DepotServiceError as e:
+            return Response(
+                {"detail": f"Error fetching seat info: {str(e)}"},
+                status=status.HTTP_502_BAD_GATEWAY,
+            )
+
+        if not seat_info:
+            return Response(
+                {"detail": "Trip not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        # Only ASGI can hold the connection open without pinning a worker;
+        # under WSGI the client polls by reconnecting.
+        is_asgi = isinstance(request._request, ASGIRequest)
+        events = aseat_events if is_asgi else seat_events
+        response = StreamingHttpResponse(
+            events(
+                int(pk),
+                len(seat_info["seats"]),
+                int(last_version) if str(last_version).isdigit() else None,
+            ),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
     @action(detail=True, methods=["post"], url_path="cancel-tickets")
     def cancel_tickets(self, request, pk=None):
         try:
@@ -0,0 +1,113 @@
+import os
+import threading
+from collections.abc import Callable
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+POOL_OPTIONS = ("pool_connections", "pool_maxsize", "pool_block", "max_retries")
+
+
+def mount_pool(session: Session, options: dict) -> Session:
+    """Mount an ``HTTPAdapter`` sized from backend ``options`` on ``session``.
+
+    Only the pool keys present in ``options`` are passed, everything else
+    keeps the ``requests`` defaults.
+    """
+    adapter = HTTPAdapter(
+        **{key: options[key] for key in POOL_OPTIONS if key in options}
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def pool_stats(session: Session) -> list[dict]:
+    """Per-host counters of the urllib3 pools behind a session's adapters."""
+    stats = []
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+
+    for adapter in adapters.values():
+        pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+        if pools is None:
+            continue
+
+        # RecentlyUsedContainer refuses plain iteration, keys() takes its lock.
+        for key in pools.keys():  # noqa: SIM118
+            pool = pools.get(key)
+            if pool is None:
+                continue
+
+            stats.append(
+                {
+                    "host": f"{pool.scheme}://{pool.host}:{pool.port}",
+                    "maxsize": pool.pool.maxsize if pool.pool else 0,
+                    "idle": pool.pool.qsize() if pool.pool else 0,
+                    "connections_opened": pool.num_connections,
+                    "requests": pool.num_requests,
+                }
+            )
+
+    return stats
+
+
+class BackendRegistry:
+    """Holds one configured backend per name for the life of the process.
+
+    The registry is emptied in a forked child, so worker processes never
+    share sockets with their parent, and whenever the backing setting is
+    overridden (``override_settings`` / the pytest ``settings`` fixture).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._backends: dict[str, object] = {}
+
+    def _after_fork(self) -> None:
+        # The parent's sockets and lock state are not ours to close or reuse.
+        self._lock = threading.Lock()
+        self._backends = {}
+
+    def get(self, name: str, factory: Callable[[], object]):
+        backend = self._backends.get(name)
+        if backend is not None:
+            return backend
+
+        with self._lock:
+            backend = self._backends.get(name)
+            if backend is None:
+                backend = self._backends[name] = factory()
+
+        return backend
+
+    def reset(self, name: str | None = None) -> None:
+        with self._lock:
+            names = [name] if name else list(self._backends)
+            for key in names:
+                backend = self._backends.pop(key, None)
+                client = getattr(backend, "client", None)
+                if isinstance(client, Session):
+                    client.close()
+
+    def stats(self) -> dict[str, list[dict]]:
+        stats = {}
+
+        for name, backend in list(self._backends.items()):
+            client = getattr(backend, "client", None)
+            stats[name] = pool_stats(client) if isinstance(client, Session) else []
+
+        return stats
+
+
+registry = BackendRegistry()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=registry._after_fork)
+
+
+@receiver(setting_changed)
+def reset_backend_registry(setting, **kwargs):
+    if setting in ("DEPOT", "TREASURY"):
+        registry.reset(setting.lower())
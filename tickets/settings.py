@@ -1,6 +1,7 @@
 from pathlib import Path
 
 import environ
+from django.core.exceptions import ImproperlyConfigured
 from django.urls.base import reverse_lazy
 
 env = environ.Env(
@@ -200,6 +201,90 @@ DATABASES = {
     },
 }
 
+# Cache. Every web and worker process reads and writes the seat map, so it
+# needs a cache they share (redis://, memcache://). locmem is per process and
+# is only the default while DEBUG is on.
+CACHES = {
+    "default": env.cache_url(
+        "CACHE_URL", default="locmemcache://" if DEBUG else environ.Env.NOTSET
+    ),
+}
+
+SEAT_MAP_CACHE = "default"
+if not DEBUG and CACHES[SEAT_MAP_CACHE]["BACKEND"] in (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+):
+    raise ImproperlyConfigured(
+        "SEAT_MAP_CACHE must be shared by all processes; set CACHE_URL to a "
+        "redis:// or memcache:// URL."
+    )
+SEAT_MAP_TIMEOUT = env.int("SEAT_MAP_TIMEOUT", default=300)
+
+SEAT_STREAM_POLL_INTERVAL = env.float("SEAT_STREAM_POLL_INTERVAL", default=1.0)
+SEAT_STREAM_HEARTBEAT = env.int("SEAT_STREAM_HEARTBEAT", default=15)
+SEAT_STREAM_MAX_AGE = env.int("SEAT_STREAM_MAX_AGE", default=300)
+SEAT_STREAM_RETRY = env.int("SEAT_STREAM_RETRY", default=3000)
+
+# Trip search results, 0 disables the cache and the warmer
+TRIP_SEARCH_CACHE = "default"
+TRIP_SEARCH_TIMEOUT = env.int("TRIP_SEARCH_TIMEOUT", default=120)
+TRIP_SEARCH_TRAFFIC_WINDOW = env.int("TRIP_SEARCH_TRAFFIC_WINDOW", default=3600)
+TRIP_SEARCH_TRAFFIC_BUCKETS = env.int("TRIP_SEARCH_TRAFFIC_BUCKETS", default=6)
+TRIP_SEARCH_TRAFFIC_PAIRS = env.int("TRIP_SEARCH_TRAFFIC_PAIRS", default=1000)
+TRIP_SEARCH_HISTORY_DAYS = env.int("TRIP_SEARCH_HISTORY_DAYS", default=30)
+TRIP_SEARCH_WARM_TOP = env.int("TRIP_SEARCH_WARM_TOP", default=20)
+TRIP_SEARCH_WARM_INTERVAL = env.int("TRIP_SEARCH_WARM_INTERVAL", default=60)
+
+# Celery
+REDIS_URL = env("REDIS_URL", default="redis://localhost:6379/0")
+CELERY_BROKER_URL = env("CELERY_BROKER_URL", default=REDIS_URL)
+CELERY_RESULT_BACKEND = env("CELERY_RESULT_BACKEND", default=REDIS_URL)
+CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+
+RESERVATION_SWEEP_INTERVAL = env.int("RESERVATION_SWEEP_INTERVAL", default=30)
+RESERVATION_SWEEP_BATCH_SIZE = env.int("RESERVATION_SWEEP_BATCH_SIZE", default=500)
+RESERVATION_SWEEP_MAX_BATCHES = env.int("RESERVATION_SWEEP_MAX_BATCHES", default=20)
+
+REFUND_CHUNK_SIZE = env.int("REFUND_CHUNK_SIZE", default=50)
+
+# Optional Redis seat-hold tier, off unless a URL is configured
+SEAT_HOLD_REDIS_URL = env("SEAT_HOLD_REDIS_URL", default=None)
+SEAT_HOLD_FLUSH_INTERVAL = env.float("SEAT_HOLD_FLUSH_INTERVAL", default=1.0)
+SEAT_HOLD_BATCH_SIZE = env.int("SEAT_HOLD_BATCH_SIZE", default=200)
+SEAT_HOLD_MAX_BATCHES = env.int("SEAT_HOLD_MAX_BATCHES", default=10)
+# Longest a persist_seat_holds run may own the pending list
+SEAT_HOLD_FLUSH_LEASE = env.int("SEAT_HOLD_FLUSH_LEASE", default=60)
+
+# Treasury invoices requested from the payment outbox, off the request path
+PAYMENT_OUTBOX_INTERVAL = env.float("PAYMENT_OUTBOX_INTERVAL", default=2.0)
+PAYMENT_OUTBOX_BATCH_SIZE = env.int("PAYMENT_OUTBOX_BATCH_SIZE", default=100)
+PAYMENT_OUTBOX_MAX_BATCHES = env.int("PAYMENT_OUTBOX_MAX_BATCHES", default=10)
+PAYMENT_OUTBOX_CONCURRENCY = env.int("PAYMENT_OUTBOX_CONCURRENCY", default=8)
+PAYMENT_OUTBOX_MAX_ATTEMPTS = env.int("PAYMENT_OUTBOX_MAX_ATTEMPTS", default=8)
+PAYMENT_OUTBOX_BACKOFF = env.float("PAYMENT_OUTBOX_BACKOFF", default=5.0)
+PAYMENT_OUTBOX_BACKOFF_MAX = env.float("PAYMENT_OUTBOX_BACKOFF_MAX", default=600.0)
+PAYMENT_OUTBOX_LEASE = env.int("PAYMENT_OUTBOX_LEASE", default=60)
+
+CELERY_BEAT_SCHEDULE = {
+    "expire-reservations": {
+        "task": "tickets.core.tasks.expire_reservations",
+        "schedule": RESERVATION_SWEEP_INTERVAL,
+    },
+    "persist-seat-holds": {
+        "task": "tickets.core.tasks.persist_seat_holds",
+        "schedule": SEAT_HOLD_FLUSH_INTERVAL,
+    },
+    "dispatch-payments": {
+        "task": "tickets.core.tasks.dispatch_payments",
+        "schedule": PAYMENT_OUTBOX_INTERVAL,
+    },
+    "warm-trip-searches": {
+        "task": "tickets.core.tasks.warm_trip_searches",
+        "schedule": TRIP_SEARCH_WARM_INTERVAL,
+    },
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -237,19 +322,45 @@ LOGIN_REDIRECT_URL = reverse_lazy("ui:home")
 
 DEPOT_API_URL = env("DEPOT_API_URL", default="http://depot-service:8000/api")
 DEPOT_API_TIMEOUT = env("TREASURY_API_TIMEOUT", default=10)
+DEPOT_POOL_MAXSIZE = env.int("DEPOT_POOL_MAXSIZE", default=20)
+DEPOT_CACHE_TTL = env.int("DEPOT_CACHE_TTL", default=60)
+DEPOT_CACHE = {
+    "ttl": DEPOT_CACHE_TTL,
+    "stale_ttl": env.int("DEPOT_CACHE_STALE_TTL", default=300),
+    "negative_ttl": env.int("DEPOT_CACHE_NEGATIVE_TTL", default=10),
+    "maxsize": env.int("DEPOT_CACHE_MAXSIZE", default=1024),
+}
+
+DEPOT_JSON_PATH = env("DEPOT_JSON_PATH", default=str(BASE_DIR / "trips.json"))
 
 DEPOT = {
     "backend": "tickets.depot.backends.json.JsonDepotBackend",
     # "backend": "tickets.depot.backends.service.DepotServiceBackend",
+    # "async_backend": "tickets.depot.backends.async_service.AsyncDepotServiceBackend",
     "options": {
         "base_url": DEPOT_API_URL,
         "timeout": DEPOT_API_TIMEOUT,
+        "pool_maxsize": DEPOT_POOL_MAXSIZE,
+    },
+    # Extra DepotServiceBackend arguments for batched trip lookups:
+    # "backend_options": {"bulk_path": "trips/extra-info/bulk", "max_workers": 8},
+    # Set DEPOT_CACHE_TTL=0 to talk to the depot on every lookup.
+    "cache": DEPOT_CACHE if DEPOT_CACHE_TTL else None,
+    "resilience": {
+        "failure_threshold": env.int("DEPOT_BREAKER_FAILURES", default=5),
+        "reset_timeout": env.float("DEPOT_BREAKER_RESET", default=30),
+        "max_concurrent": env.int("DEPOT_MAX_CONCURRENT", default=10),
+        "bulkhead_timeout": env.float("DEPOT_BULKHEAD_TIMEOUT", default=0.5),
+        "hedge_after": env.float("DEPOT_HEDGE_AFTER", default=0) or None,
     },
 }
 
 TREASURY_API_URL = env("TREASURY_API_URL", default="http://treasury-api:8001/api")
 TREASURY_API_KEY = env("TREASURY_API_KEY", default="treasury-key")
 TREASURY_API_TIMEOUT = env("TREASURY_API_TIMEOUT", default=10)
+TREASURY_POOL_MAXSIZE = env.int("TREASURY_POOL_MAXSIZE", default=10)
+# Treasury calls per second across all processes, 0 disables the limiter
+TREASURY_RATE_LIMIT = env.float("TREASURY_RATE_LIMIT", default=0)
 
 TREASURY = {
     "backend": "tickets.treasury.backends.service.TreasuryServiceBackend",
@@ -257,5 +368,20 @@ TREASURY = {
         "base_url": TREASURY_API_URL,
         # "api_key": TREASURY_API_KEY,
         "timeout": TREASURY_API_TIMEOUT,
+        "pool_maxsize": TREASURY_POOL_MAXSIZE,
+    },
+    "backend_options": {
+        # e.g. "api/refunds/bulk"; unset refunds fan out over api/refund
+        "bulk_refund_path": env("TREASURY_BULK_REFUND_PATH", default=None),
+        "max_workers": env.int("TREASURY_REFUND_CONCURRENCY", default=8),
     },
+    # Token bucket shared through Redis; callers queue up to max_wait seconds.
+    "rate_limit": {
+        "redis_url": env("TREASURY_RATE_LIMIT_REDIS_URL", default=REDIS_URL),
+        "rate": TREASURY_RATE_LIMIT,
+        "burst": env.int("TREASURY_RATE_LIMIT_BURST", default=10),
+        "max_wait": env.float("TREASURY_RATE_LIMIT_MAX_WAIT", default=5),
+    }
+    if TREASURY_RATE_LIMIT
+    else None,
 }
@@ -1,22 +1,57 @@
+from collections.abc import Iterable
+
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.utils.module_loading import import_string
 
+from tickets.pooling import mount_pool, registry
+
 
 class BaseBackend:
     def __init__(self, **kwargs):
         pass
 
     def pay_ticket(
-        self, user_data: dict, ticket_data: dict, trip_data: dict
+        self,
+        user_data: dict,
+        ticket_data: dict,
+        trip_data: dict,
+        idempotency_key: str | None = None,
     ) -> dict | None:
         raise NotImplementedError
 
     def refund_ticket(self, invoice_data: dict) -> dict | None:
         raise NotImplementedError
 
+    def refund_tickets(self, invoices: Iterable[dict]) -> dict[str, dict | Exception]:
+        """Refund many invoices, keyed by ``invoice_id`` in the result.
+
+        Each value is the treasury's response, or the ``TreasuryServiceError``
+        that invoice failed with; one failure does not stop the others.
+        Backends override this with a batched call; the default refunds one
+        invoice at a time.
+        """
+        from tickets.treasury.exceptions import TreasuryServiceError
+
+        results: dict[str, dict | Exception] = {}
+
+        for invoice_data in invoices:
+            try:
+                results[invoice_data["invoice_id"]] = (
+                    self.refund_ticket(invoice_data) or {}
+                )
+            except TreasuryServiceError as error:
+                results[invoice_data["invoice_id"]] = error
+
+        return results
+
 
 def get_treasury_backend() -> BaseBackend:
+    """Return the process-wide TREASURY backend, building it on first use."""
+    return registry.get("treasury", build_treasury_backend)
+
+
+def build_treasury_backend() -> BaseBackend:
     module_settings = getattr(settings, "TREASURY", {})
     module_string = module_settings.get("backend")
     module_options = module_settings.get("options", {})
@@ -26,13 +61,19 @@ def get_treasury_backend() -> BaseBackend:
 
     module_class = import_string(module_string)
     from tickets.treasury.backends.client import TreasuryClient
+    from tickets.treasury.backends.ratelimit import TreasuryRateLimiter
 
     client = TreasuryClient(
         base_url=module_options.get("base_url"),
         # api_key=module_options.get("api_key"), # to do - keep add authorization
         timeout=module_options.get("timeout", 10),
     )
+    mount_pool(client, module_options)
+    client.rate_limiter = TreasuryRateLimiter.from_options(
+        module_settings.get("rate_limit")
+    )
+    backend_options = module_settings.get("backend_options", {})
 
-    return module_class(client=client)
+    return module_class(client=client, **backend_options)
 
     # return module_class(**module_options)
@@ -9,6 +9,8 @@ class TreasuryClient(Session):
         self.base_url = base_url
         self.api_key = api_key
         self.timeout = timeout
+        # A TreasuryRateLimiter every request waits on, set from settings.
+        self.rate_limiter = None
 
         if self.api_key:
             self.headers.update({"Authorization": f"Bearer {self.api_key}"})
@@ -17,4 +19,7 @@ class TreasuryClient(Session):
         if "timeout" not in kwargs:
             kwargs["timeout"] = self.timeout
 
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
         return super().request(method, urljoin(self.base_url, url), **kwargs)
@@ -0,0 +1,147 @@
+"""Token bucket shared through Redis for calls to the rate-limited treasury.
+
+Every process draws from one bucket holding up to ``burst`` tokens, refilled
+at ``rate`` per second. A caller that finds the bucket empty takes a token
+on credit and sleeps until it would have been refilled, so waiting callers
+are served in order. A caller whose turn is more than ``max_wait`` seconds
+away gets ``RateLimitedError`` instead, and nothing is taken.
+"""
+
+import logging
+import threading
+import time
+import weakref
+
+import redis
+from opentelemetry import metrics
+from opentelemetry.metrics import Observation
+from requests import RequestException
+
+logger = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+wait_time = meter.create_histogram(
+    "treasury.ratelimit.wait",
+    unit="ms",
+    description="Time treasury calls waited for a rate-limit token",
+)
+rejected_requests = meter.create_counter(
+    "treasury.ratelimit.rejected",
+    description="Treasury calls refused because their turn was past the deadline",
+)
+
+# Returns {wait_ms, queue_depth}; wait_ms is -1 when the caller was refused.
+# TIME keeps every process on the Redis clock.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local clock = redis.call("TIME")
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+
+local state = redis.call("HMGET", KEYS[1], "tokens", "updated")
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - updated) * rate / 1000)
+
+local wait = 0
+if tokens < 1 then
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+if wait > max_wait then
+    return {-1, math.ceil(-tokens)}
+end
+
+tokens = tokens - 1
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(burst * 1000 / rate) + max_wait)
+return {wait, math.max(0, math.ceil(-tokens))}
+"""
+
+
+class RateLimitedError(RequestException):
+    """No treasury token would free up before the caller's deadline."""
+
+
+class TreasuryRateLimiter:
+    def __init__(
+        self,
+        redis_url: str,
+        rate: float,
+        burst: int = 10,
+        max_wait: float = 5,
+        key: str = "treasury:rate-limit",
+        sleep=time.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.key = key
+        self.sleep = sleep
+        self.client = redis.Redis.from_url(redis_url)
+        self.script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+        self.depth = 0
+        self.stats = {"immediate": 0, "queued": 0, "rejected": 0, "unlimited": 0}
+        self._lock = threading.Lock()
+
+        _limiters.add(self)
+
+    @classmethod
+    def from_options(cls, options: dict | None):
+        if not options:
+            return None
+        return cls(**options)
+
+    def _record(self, result: str) -> None:
+        with self._lock:
+            self.stats[result] += 1
+
+    def acquire(self, max_wait: float | None = None) -> float:
+        """Wait for a token; returns the seconds spent queued.
+
+        Raises ``RateLimitedError`` when the wait would exceed ``max_wait``
+        (the limiter's own by default). If Redis is unreachable the call goes
+        through unlimited rather than failing.
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+
+        try:
+            wait_ms, self.depth = self.script(
+                keys=[self.key],
+                args=[self.rate, self.burst, int(max_wait * 1000)],
+            )
+        except redis.RedisError:
+            logger.warning("Treasury rate limiter unavailable", exc_info=True)
+            self._record("unlimited")
+            return 0.0
+
+        if wait_ms < 0:
+            self._record("rejected")
+            rejected_requests.add(1)
+            raise RateLimitedError(
+                f"Treasury rate limit: {self.depth} call(s) ahead, deadline {max_wait}s"
+            )
+
+        wait_time.record(wait_ms)
+        if not wait_ms:
+            self._record("immediate")
+            return 0.0
+
+        self._record("queued")
+        self.sleep(wait_ms / 1000)
+        return wait_ms / 1000
+
+
+_limiters: "weakref.WeakSet[TreasuryRateLimiter]" = weakref.WeakSet()
+
+
+def _observe_depth(options):
+    for limiter in list(_limiters):
+        yield Observation(limiter.depth, {"key": limiter.key})
+
+
+meter.create_observable_gauge(
+    "treasury.ratelimit.queue_depth",
+    callbacks=[_observe_depth],
+    description="Callers holding a treasury token on credit, as last seen",
+)
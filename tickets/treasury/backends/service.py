@@ -1,3 +1,6 @@
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
 from tickets.treasury.backends.base import BaseBackend
@@ -7,9 +10,16 @@ from tickets.treasury.formatter import TicketFormatterDict
 
 
 class TreasuryServiceBackend(BaseBackend):
-    def __init__(self, client: TreasuryClient):
+    def __init__(
+        self,
+        client: TreasuryClient,
+        bulk_refund_path: str | None = None,
+        max_workers: int = 8,
+    ):
         super().__init__()
         self.client = client
+        self.bulk_refund_path = bulk_refund_path
+        self.max_workers = max_workers
 
     def _request(self, method: str, path: str, **kwargs) -> dict | None:
         try:
@@ -20,15 +30,74 @@ class TreasuryServiceBackend(BaseBackend):
             raise TreasuryServiceError(method.upper(), path, exception) from exception
 
     def pay_ticket(
-        self, user_data: dict, ticket_data: dict, trip_data: dict
+        self,
+        user_data: dict,
+        ticket_data: dict,
+        trip_data: dict,
+        idempotency_key: str | None = None,
     ) -> dict | None:
         data = TicketFormatterDict(user_data, ticket_data, trip_data).to_dict()
+        kwargs = {}
+
+        if idempotency_key:
+            kwargs["headers"] = {"Idempotency-Key": idempotency_key}
 
         return self._request(
             "post",
             "api/invoices",
             json=data,
+            **kwargs,
         )
 
     def refund_ticket(self, invoice_data: dict) -> dict | None:
         return self._request("post", "api/refund", json=invoice_data)
+
+    def refund_tickets(self, invoices: Iterable[dict]) -> dict[str, dict | Exception]:
+        """Refund through the bulk endpoint, or a bounded fan-out.
+
+        Without ``bulk_refund_path`` (or once the treasury answers it with
+        404/405) each invoice gets its own ``api/refund`` call, at most
+        ``max_workers`` in flight over the shared pooled session.
+        """
+        invoices = list({item["invoice_id"]: item for item in invoices}.values())
+
+        if not invoices:
+            return {}
+
+        if self.bulk_refund_path:
+            try:
+                return self._refund_bulk(invoices)
+            except TreasuryServiceError as error:
+                status_code = getattr(
+                    getattr(error.original, "response", None), "status_code", None
+                )
+                if status_code not in (404, 405):
+                    raise
+                self.bulk_refund_path = None
+
+        def refund(invoice_data: dict) -> dict | Exception:
+            try:
+                return self.refund_ticket(invoice_data) or {}
+            except TreasuryServiceError as error:
+                return error
+
+        workers = min(self.max_workers, len(invoices))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(refund, invoices)
+            return {
+                item["invoice_id"]: result
+                for item, result in zip(invoices, results, strict=True)
+            }
+
+    def _refund_bulk(self, invoices: list[dict]) -> dict[str, dict | Exception]:
+        data = self._request("post", self.bulk_refund_path, json={"refunds": invoices})
+        by_invoice = {
+            item.get("invoice_id"): item
+            for item in data or []
+            if isinstance(item, dict) and not item.get("error")
+        }
+        return {
+            item["invoice_id"]: by_invoice.get(item["invoice_id"])
+            or TreasuryServiceError("POST", self.bulk_refund_path)
+            for item in invoices
+        }